@@ -1,15 +1,15 @@
 import datetime
-import json
 import random
 from datetime import timedelta
+from itertools import cycle
 
 import factory
-from sqlalchemy import create_engine, func, select
+from sqlalchemy import create_engine, func, select, update
 from sqlalchemy.orm import scoped_session, sessionmaker
 
 from src.bot import services  # noqa: prevent circular imports error
 from src.core.db import models
-from src.core.db.models import Report, Shift, Task
+from src.core.db.models import Report, Shift, ShiftTask, Task, User
 from src.core.services.authentication_service import AuthenticationService
 from src.core.services.shift_service import FINAL_MESSAGE
 from src.core.settings import settings
@@ -78,17 +78,19 @@ class ShiftFactory(BaseFactory):
         starting_seq_num = 1
         return starting_seq_num  # noqa: R504
 
-    @factory.lazy_attribute
-    def tasks(self):
+    @factory.post_generation
+    def shift_tasks(self, create, extracted, **kwargs):
+        if not create:
+            return
         task_ids = session.execute(select(Task.id).order_by(func.random()))
         task_ids = task_ids.scalars().all()
-        task = {}
-        count = 1
-        for task_id in task_ids:
-            uuid_str = str(task_id)
-            task[count] = uuid_str
-            count += 1
-        return json.dumps(task)
+        shift_length = (self.finished_at - self.started_at).days + 1
+        shift_dates = [self.started_at + timedelta(days=day) for day in range(shift_length)]
+        session.add_all(
+            ShiftTask(shift_id=self.id, task_date=task_date, task_id=task_id)
+            for task_date, task_id in zip(shift_dates, cycle(task_ids))
+        )
+        session.commit()
 
 
 class RequestFactory(BaseFactory):
@@ -125,6 +127,13 @@ class MemberFactory(BaseFactory):
     status = factory.Iterator([status for status in models.Member.Status])
     numbers_lombaryers = factory.Faker("random_int", min=0, max=92)
 
+    @factory.post_generation
+    def user_shifts_count(self, create, extracted, **kwargs):
+        if not create:
+            return
+        session.execute(update(User).where(User.id == self.user_id).values(shifts_count=User.shifts_count + 1))
+        session.commit()
+
     @factory.post_generation
     def add_several_reports(self, created, count, **kwargs):
         start_date = session.execute(select(Shift.started_at).where(Shift.id == self.shift_id))
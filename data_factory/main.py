@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import sys
 from uuid import UUID
@@ -17,6 +18,7 @@ from data_factory.factories import (
     UserFactory,
     session,
 )
+from run_repair_shift_counters import repair_shift_counters
 from src.core.db.models import Member, Request, Shift, User
 
 
@@ -108,6 +110,9 @@ def generate_fake_data() -> None:
         logger.info("Создание администратора")
         create_administrator()
 
+    logger.info("Пересчёт счётчиков смен...")
+    asyncio.run(repair_shift_counters())
+
     logger.info("Создание тестовых данных завершено!")
 
 
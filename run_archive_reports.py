@@ -0,0 +1,17 @@
+import asyncio
+
+from src.bot.api_services import get_reports_archive_service_callback
+from src.core.db.db import get_session
+
+
+async def archive_reports() -> None:
+    reports_archive_service = await get_reports_archive_service_callback(get_session())
+    for shift in await reports_archive_service.archive_finished_shifts():
+        print(
+            f"Смена №{shift.shift_sequence_number}: файлов {shift.files_count}, "
+            f"освобождено {shift.bytes_reclaimed} байт"
+        )
+
+
+if __name__ == '__main__':
+    asyncio.run(archive_reports())
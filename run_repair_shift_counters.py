@@ -0,0 +1,18 @@
+import asyncio
+
+from src.bot.api_services import get_shift_service_callback
+from src.core.db.db import get_session
+
+
+async def repair_shift_counters() -> None:
+    shift_service = await get_shift_service_callback(get_session())
+    for shift in await shift_service.repair_counters():
+        print(
+            f"Смена №{shift.sequence_number}: участников {shift.members_count}, "
+            f"активных {shift.active_members_count}, заявок на рассмотрении {shift.pending_requests_count}, "
+            f"отчетов на проверке {shift.reviewing_reports_count}"
+        )
+
+
+if __name__ == '__main__':
+    asyncio.run(repair_shift_counters())
@@ -1,9 +1,11 @@
 from typing import Optional
+from uuid import UUID
 
 from pydantic import Field, validator
 
 from src.api.request_models.request_base import RequestBase
 from src.core.db.models import Report
+from src.core.settings import settings
 
 
 class ChangeStatusRequest(RequestBase):
@@ -21,3 +23,10 @@ class ChangeStatusRequest(RequestBase):
 class ReportUpdateRequest(RequestBase):
     status: Optional[Report.Status]
     report_url: Optional[str]
+
+
+class ReportsClaimRequest(RequestBase):
+    """Модель запроса отчетов из очереди проверки."""
+
+    shift_id: Optional[UUID] = None
+    limit: int = Field(10, ge=1, le=settings.REPORTS_CLAIM_LIMIT_MAX)
@@ -1,7 +1,14 @@
 from typing import Optional
+from uuid import UUID
+
+from pydantic import Field
 
 from src.api.request_models.request_base import RequestBase
 
 
 class RequestDeclineRequest(RequestBase):
     message: Optional[str] = None
+
+
+class RequestsApproveRequest(RequestBase):
+    request_ids: list[UUID] = Field(min_items=1)
@@ -0,0 +1,23 @@
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from src.core.db.models import JobRun
+
+
+class JobRunResponse(BaseModel):
+    """Запуск ежедневной задачи бота. Длительность указана в секундах."""
+
+    id: UUID
+    job_name: str
+    scheduled_at: datetime
+    status: JobRun.Status
+    started_at: datetime | None
+    finished_at: datetime | None
+    duration: float | None
+    rows_affected: int | None
+    error: str | None
+
+    class Config:
+        orm_mode = True
@@ -42,3 +42,6 @@ class ShiftDtoResponse(BaseModel):
 
 class ShiftWithTotalUsersResponse(ShiftResponse):
     total_users: int
+    active_users: int
+    pending_requests: int
+    reviewing_reports: int
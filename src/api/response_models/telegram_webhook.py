@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+
+
+class UpdateQueueStatsResponse(BaseModel):
+    """Метрики очереди обновлений бота. Время указано в секундах."""
+
+    size: int
+    maxsize: int
+    received: int
+    duplicates: int
+    rejected: int
+    oldest_update_age: float
+    average_lag: float
+    max_lag: float
+
+    class Config:
+        orm_mode = True
+
+
+class HandlerLatencyStatsResponse(BaseModel):
+    """Перцентили времени обработки обновлений бота. Время указано в секундах."""
+
+    processed: int
+    in_progress: int
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+    class Config:
+        orm_mode = True
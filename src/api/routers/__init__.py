@@ -2,11 +2,14 @@ from src.api.routers.administrator import router as administrator_router  # noqa
 from src.api.routers.administrator_invitation import (  # noqa
     router as administrator_invitation_router,
 )
+from src.api.routers.admin_events import router as admin_events_router  # noqa
 from src.api.routers.analytics import router as analytics_router  # noqa
 from src.api.routers.healthcheck import router as healthcheck_router  # noqa
+from src.api.routers.job_run import router as job_run_router  # noqa
 from src.api.routers.report import router as report_router  # noqa
 from src.api.routers.request import router as request_router  # noqa
 from src.api.routers.shift import router as shift_router  # noqa
 from src.api.routers.task import router as task_router  # noqa
 from src.api.routers.telegram_webhook import router as telegram  # noqa
 from src.api.routers.user import router as user_router  # noqa
+from src.api.routers.user_reports import router as user_reports_router  # noqa
@@ -0,0 +1,44 @@
+from http import HTTPStatus
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi_restful.cbv import cbv
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db.db import get_session
+from src.core.services.authentication_service import AuthenticationService
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+
+@cbv(router)
+class AdminEventsCBV:
+    authentication_service: AuthenticationService = Depends()
+    token: HTTPAuthorizationCredentials = Depends(HTTPBearer())
+    session: AsyncSession = Depends(get_session)
+
+    @router.get(
+        "/",
+        response_class=StreamingResponse,
+        status_code=HTTPStatus.OK,
+        summary="Поток событий для администраторов (server-sent events).",
+        response_description="События в формате text/event-stream",
+    )
+    async def stream_events(self, request: Request) -> StreamingResponse:
+        """
+        Поток событий об изменениях, по которым клиент догружает изменённые объекты вместо повторной загрузки списков.
+
+        - **report_submitted**: участник отправил отчет (report_id, shift_id)
+        - **report_reviewed**: отчет проверен (report_id, shift_id, status)
+        - **request_created**: подана или повторно подана заявка на участие (shift_id, user_id)
+
+        Если клиент не успевает читать события, поток закрывается: после переподключения нужно заново загрузить списки.
+        """
+        await self.authentication_service.check_administrator_by_token(self.token)
+        # соединение с БД не удерживается всё время трансляции событий
+        await self.session.close()
+        headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        return StreamingResponse(
+            request.app.state.admin_events.stream(), media_type="text/event-stream", headers=headers
+        )
@@ -149,7 +149,7 @@ class AdministratorCBV:
         Аргументы:
             id (UUID): id администратора.
         """
-        await self.authentication_service.get_current_active_administrator(token.credentials)
+        await self.authentication_service.get_authorized_administrator(token.credentials)
         return await self.administrator_service.get_by_id(administrator_id)
 
     @router.patch(
@@ -172,7 +172,7 @@ class AdministratorCBV:
             name (str): имя администратора
             surname (str): фамилия администратора
         """
-        await self.authentication_service.get_current_active_administrator(token.credentials)
+        await self.authentication_service.get_authorized_administrator(token.credentials)
         return await self.administrator_service.update_administrator(administrator_id, schema)
 
     @router.patch(
@@ -0,0 +1,40 @@
+from http import HTTPStatus
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from fastapi_restful.cbv import cbv
+
+from src.api.response_models.job_run import JobRunResponse
+from src.core.services.authentication_service import AuthenticationService
+from src.core.services.job_run_service import JobRunService
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@cbv(router)
+class JobRunCBV:
+    authentication_service: AuthenticationService = Depends()
+    token: HTTPAuthorizationCredentials = Depends(HTTPBearer())
+    job_run_service: JobRunService = Depends()
+
+    @router.get(
+        "/runs",
+        response_model=list[JobRunResponse],
+        status_code=HTTPStatus.OK,
+        summary="Получить последние запуски ежедневных задач бота",
+        response_description="Запуски задач со статусом, длительностью и количеством обработанных записей",
+    )
+    async def get_recent_job_runs(self, limit: int = Query(default=50, ge=1, le=500)) -> Any:
+        """
+        Возвращает последние запуски ежедневных задач бота, начиная с самых поздних.
+
+        - **job_name**: название задачи
+        - **scheduled_at**: запланированное время запуска
+        - **status**: статус запуска
+        - **duration**: длительность выполнения в секундах
+        - **rows_affected**: количество обработанных записей
+        - **error**: ошибка, с которой завершилась задача
+        """
+        await self.authentication_service.check_administrator_by_token(self.token)
+        return await self.job_run_service.get_recent_runs(limit)
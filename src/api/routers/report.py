@@ -6,6 +6,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from fastapi_restful.cbv import cbv
 from pydantic.schema import UUID
 
+from src.api.request_models.report import ReportsClaimRequest
 from src.api.response_models.error import generate_error_responses
 from src.api.response_models.report import ReportResponse, ReportSummaryResponse
 from src.core.db.models import Report
@@ -62,7 +63,7 @@ class ReportsCBV:
         request: Request,
     ) -> ReportResponse:
         """Отчет участника проверен и принят."""
-        administrator = await self.authentication_service.get_current_active_administrator(self.token.credentials)
+        administrator = await self.authentication_service.get_authorized_administrator(self.token.credentials)
         return await self.report_service.approve_report(report_id, administrator.id, request.app.state.bot_instance)
 
     @router.patch(
@@ -78,9 +79,35 @@ class ReportsCBV:
         request: Request,
     ) -> ReportResponse:
         """Отчет участника проверен и отклонен."""
-        administrator = await self.authentication_service.get_current_active_administrator(self.token.credentials)
+        administrator = await self.authentication_service.get_authorized_administrator(self.token.credentials)
         return await self.report_service.decline_report(report_id, administrator.id, request.app.state.bot_instance)
 
+    @router.post(
+        "/claim",
+        response_model=list[ReportSummaryResponse],
+        status_code=HTTPStatus.OK,
+        summary="Взять на проверку следующие отчеты из очереди.",
+        responses=generate_error_responses(HTTPStatus.BAD_REQUEST),
+    )
+    async def claim_reports(
+        self,
+        claim_data: ReportsClaimRequest,
+    ) -> Any:
+        """
+        Закрепляет за администратором до **limit** отчетов на проверке в порядке их отправки и возвращает их.
+
+        Отчеты, закреплённые за другими администраторами, не выдаются. Повторный запрос продлевает закрепление
+        уже выданных администратору отчетов. Закрепление снимается после проверки отчета или автоматически через
+        REPORT_REVIEW_LEASE_TIME, после чего отчет снова попадает в очередь.
+
+        - **shift_id**: брать отчеты только указанной смены
+        - **limit**: максимальное количество отчетов
+        """
+        administrator = await self.authentication_service.get_authorized_administrator(self.token.credentials)
+        return await self.report_service.claim_reports_for_review(
+            administrator.id, claim_data.limit, claim_data.shift_id
+        )
+
     @router.get(
         "/",
         response_model=list[ReportSummaryResponse],
@@ -6,7 +6,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from fastapi_restful.cbv import cbv
 from pydantic.schema import UUID
 
-from src.api.request_models.request import RequestDeclineRequest
+from src.api.request_models.request import RequestDeclineRequest, RequestsApproveRequest
 from src.api.response_models.error import generate_error_responses
 from src.api.response_models.request import RequestResponse
 from src.core.db import DTO_models, models
@@ -38,6 +38,28 @@ class RequestCBV:
         await self.authentication_service.check_administrator_by_token(self.token)
         return await self.request_service.approve_request(request_id, request.app.state.bot_instance)
 
+    @router.post(
+        "/approve",
+        response_model=list[RequestResponse],
+        status_code=HTTPStatus.OK,
+        summary="Одобрить несколько заявок на участие.",
+        responses=generate_error_responses(HTTPStatus.BAD_REQUEST),
+    )
+    async def approve_requests(
+        self,
+        approve_requests_data: RequestsApproveRequest,
+        request: Request,
+    ) -> list[DTO_models.RequestDTO]:
+        """Одобрить заявки на участие в акции.
+
+        Уже рассмотренные и несуществующие заявки пропускаются, в ответе возвращаются только одобренные заявки.
+        Уведомления участникам отправляются в фоне.
+        """
+        await self.authentication_service.check_administrator_by_token(self.token)
+        return await self.request_service.approve_requests(
+            approve_requests_data.request_ids, request.app.state.bot_instance
+        )
+
     @router.patch(
         "/{request_id}/decline",
         response_model=RequestResponse,
@@ -199,6 +199,9 @@ class ShiftCBV:
         - **started_at**: дата начала смены
         - **finished_at**: дата окончания смены
         - **total_users**: количество участников смены
+        - **active_users**: количество активных (не исключённых) участников смены
+        - **pending_requests**: количество заявок на участие, ожидающих рассмотрения
+        - **reviewing_reports**: количество отчетов, ожидающих проверки
         """
         await self.authentication_service.check_administrator_by_token(self.token)
         return await self.shift_service.list_all_shifts(status, sort)
@@ -1,10 +1,20 @@
+import json
+from http import HTTPStatus
 from typing import Iterator
 
-from fastapi import APIRouter, Request, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from fastapi.responses import StreamingResponse
-from telegram import Update
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
+from src.api.response_models.error import generate_error_responses
+from src.api.response_models.telegram_webhook import (
+    HandlerLatencyStatsResponse,
+    UpdateQueueStatsResponse,
+)
+from src.bot.application import HandlerLatencyStats
+from src.bot.update_queue import UpdateQueueStats
 from src.core.exceptions import UnauthorizedError
+from src.core.services.authentication_service import AuthenticationService
 from src.core.settings import settings
 
 router = APIRouter(prefix="/telegram", tags=["Telegram template forms and webhook"])
@@ -44,19 +54,64 @@ def user_register_form_webhook() -> StreamingResponse:
     return StreamingResponse(get_register_form(), media_type="text/html", headers=headers)
 
 
+@router.get(
+    "/webhook/stats",
+    response_model=UpdateQueueStatsResponse,
+    summary="Получить метрики очереди обновлений бота",
+    response_description="Глубина очереди, количество принятых/повторных/отклонённых обновлений и время ожидания",
+    responses=generate_error_responses(HTTPStatus.FORBIDDEN),
+)
+async def get_update_queue_stats(
+    request: Request,
+    token: HTTPAuthorizationCredentials = Depends(HTTPBearer()),
+    authentication_service: AuthenticationService = Depends(),
+) -> UpdateQueueStats:
+    """Метрики очереди обновлений telegram для мониторинга."""
+    await authentication_service.check_administrator_by_token(token)
+    return request.app.state.bot_instance.update_queue.get_stats()
+
+
+@router.get(
+    "/handlers/stats",
+    response_model=HandlerLatencyStatsResponse,
+    summary="Получить время обработки обновлений бота",
+    response_description="Количество обработанных обновлений и перцентили времени их обработки",
+    responses=generate_error_responses(HTTPStatus.FORBIDDEN),
+)
+async def get_handler_latency_stats(
+    request: Request,
+    token: HTTPAuthorizationCredentials = Depends(HTTPBearer()),
+    authentication_service: AuthenticationService = Depends(),
+) -> HandlerLatencyStats:
+    """Перцентили времени обработки обновлений telegram для мониторинга."""
+    await authentication_service.check_administrator_by_token(token)
+    return request.app.state.bot_instance.get_latency_stats()
+
+
 if settings.BOT_WEBHOOK_MODE:
 
     @router.post(
         "/webhook",
+        response_class=Response,
         summary="Получить обновления telegram",
         response_description="Обновления получены",
+        responses=generate_error_responses(HTTPStatus.SERVICE_UNAVAILABLE),
     )
-    async def get_telegram_bot_updates(request: Request) -> dict:
-        """Получение обновлений telegram в режиме работы бота webhook."""
+    async def get_telegram_bot_updates(request: Request) -> Response:
+        """Получение обновлений telegram в режиме работы бота webhook.
+
+        Обновление только ставится в очередь, ответ возвращается сразу.
+        Повторные доставки одного и того же update_id отбрасываются.
+        Если очередь переполнена, возвращается 503 и telegram доставит обновление повторно.
+        Процесс, не являющийся ведущим, передаёт обновление ведущему через базу данных.
+        """
         secret_token = request.headers.get('X-Telegram-Bot-Api-Secret-Token')
         if secret_token != settings.SECRET_KEY:
             raise UnauthorizedError
+        data = json.loads(await request.body())
+        if not request.app.state.bot_leader.is_leader:
+            await request.app.state.bot_leader.forward_update(data)
+            return Response(status_code=status.HTTP_200_OK)
         bot_instance = request.app.state.bot_instance
-        request_json_data = await request.json()
-        await bot_instance.update_queue.put(Update.de_json(data=request_json_data, bot=bot_instance.bot))
-        return request_json_data
+        bot_instance.update_queue.ingest(data, bot_instance.bot)
+        return Response(status_code=status.HTTP_200_OK)
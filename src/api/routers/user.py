@@ -2,7 +2,7 @@ from http import HTTPStatus
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from fastapi_restful.cbv import cbv
 
@@ -12,6 +12,7 @@ from src.api.response_models.user import UserDetailResponse, UserWithStatusRespo
 from src.core.db.models import User
 from src.core.services.authentication_service import AuthenticationService
 from src.core.services.user_service import UserService
+from src.core.settings import settings
 
 router = APIRouter(prefix="/users", tags=["Users"])
 
@@ -29,15 +30,26 @@ class UserCBV:
         status_code=HTTPStatus.OK,
         summary="Получить список пользователей со статусом",
         response_description="Информация о пользователях с фильтрацией по статусу и возможностью сортировки",
+        responses=generate_error_responses(HTTPStatus.BAD_REQUEST),
     )
     async def get_all_users(
         self,
+        response: Response,
         status: Optional[User.Status] = None,
         field_sort: Optional[UserFieldSortRequest] = None,
         direction_sort: Optional[UserDescAscSortRequest] = None,
+        search: Optional[str] = Query(default=None, max_length=100),
+        cursor: Optional[str] = None,
+        limit: Optional[int] = Query(default=None, ge=1, le=settings.USERS_PAGE_SIZE_MAX),
     ) -> list[UserWithStatusResponse]:
         """
-        Получить список пользователей с фильтрацией по статусу.
+        Получить список пользователей с фильтрацией по статусу и поиском.
+
+        Поиск (search) ведётся по подстроке в имени, фамилии, телефоне и городе.
+        Если не переданы ни limit, ни cursor, возвращается весь список. Иначе возвращается страница
+        размером limit (по умолчанию USERS_PAGE_SIZE); если есть следующая страница, курсор для её
+        получения передаётся в заголовке X-Next-Cursor. Его нужно передать в параметре cursor вместе
+        с теми же параметрами фильтрации и сортировки.
 
         - **id**: id пользователя
         - **name**: имя пользователя
@@ -50,7 +62,12 @@ class UserCBV:
         - **is_in_active_shift**: флаг, является ли пользователь участником текущей активной смены
         """
         await self.authentication_service.check_administrator_by_token(self.token)
-        return await self.user_service.list_all_users(status, field_sort, direction_sort)
+        users, next_cursor = await self.user_service.list_all_users(
+            status, field_sort, direction_sort, search, cursor, limit
+        )
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
+        return users
 
     @router.get(
         "/{user_id}",
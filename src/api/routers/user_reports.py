@@ -0,0 +1,51 @@
+import mimetypes
+import re
+from http import HTTPStatus
+
+from fastapi import APIRouter, Header, Response
+
+from src.core import exceptions
+from src.core.reports_archive import locate_report_photo, read_bundle_range
+
+router = APIRouter(prefix="/static/user_reports", tags=["User reports archive"])
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+CACHE_HEADERS = {"Cache-Control": "public, max-age=31536000, immutable", "Accept-Ranges": "bytes"}
+
+
+def parse_range(range_header: str, size: int) -> tuple[int, int]:
+    """Разобрать заголовок Range. Возвращает начало и конец (включительно) запрошенного диапазона."""
+    match = RANGE_PATTERN.match(range_header.strip())
+    if not match or match.groups() == ("", ""):
+        raise exceptions.ReportPhotoRangeNotSatisfiableError
+    start, end = match.groups()
+    if not start:
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start, end = int(start), min(int(end), size - 1) if end else size - 1
+    if start > end or start >= size:
+        raise exceptions.ReportPhotoRangeNotSatisfiableError
+    return start, end
+
+
+@router.get(
+    "/{file_path:path}",
+    response_class=Response,
+    summary="Получить фотоотчёт из архива завершённой смены",
+    response_description="Содержимое фотографии или её фрагмент (при наличии заголовка Range)",
+)
+def get_archived_report_photo(file_path: str, range: str | None = Header(default=None)) -> Response:
+    """Отдать фотоотчёт, упакованный в архив смены.
+
+    Nginx отдаёт неупакованные фотографии сам и обращается сюда только если файла нет на диске,
+    поэтому ссылки /static/user_reports/... продолжают работать после архивации смены.
+    """
+    bundle_path, offset, size = locate_report_photo(file_path)
+    media_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+    if range is None:
+        content = read_bundle_range(bundle_path, offset, size)
+        return Response(content, media_type=media_type, headers=CACHE_HEADERS)
+    start, end = parse_range(range, size)
+    content = read_bundle_range(bundle_path, offset + start, end - start + 1)
+    headers = {**CACHE_HEADERS, "Content-Range": f"bytes {start}-{end}/{size}"}
+    return Response(content, status_code=HTTPStatus.PARTIAL_CONTENT, media_type=media_type, headers=headers)
@@ -4,12 +4,16 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.api import routers
-from src.bot.main import start_bot
+from src.bot.leader import BotLeader
+from src.bot.main import init_bot
 from src.core import exceptions
+from src.core.admin_events import AdminEventBroadcaster
+from src.core.cpu_executor import cpu_executor
 from src.core.exception_handlers import (
     application_error_handler,
     internal_exception_handler,
 )
+from src.core.middlewares import QueryStatsMiddleware, ReadYourWritesMiddleware
 from src.core.settings import settings
 from src.core.utils import setup_logging
 
@@ -27,18 +31,24 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor"],
     )
+    app.add_middleware(ReadYourWritesMiddleware)
+    app.add_middleware(QueryStatsMiddleware)
 
     app.include_router(routers.administrator_router)
     app.include_router(routers.administrator_invitation_router)
+    app.include_router(routers.admin_events_router)
     app.include_router(routers.analytics_router)
     app.include_router(routers.healthcheck_router)
+    app.include_router(routers.job_run_router)
     app.include_router(routers.report_router)
     app.include_router(routers.request_router)
     app.include_router(routers.shift_router)
     app.include_router(routers.task_router)
     app.include_router(routers.telegram)
     app.include_router(routers.user_router)
+    app.include_router(routers.user_reports_router)
 
     app.add_exception_handler(HTTPStatus.INTERNAL_SERVER_ERROR, internal_exception_handler)
     app.add_exception_handler(exceptions.ApplicationError, application_error_handler)
@@ -47,20 +57,22 @@ def create_app() -> FastAPI:
     async def on_startup():
         """Действия при запуске сервера."""
         setup_logging()
-        bot_instance = await start_bot()
+        bot_instance = await init_bot()
         # storing bot_instance to extra state of FastAPI app instance
         # refer to https://www.starlette.io/applications/#storing-state-on-the-app-instance
         app.state.bot_instance = bot_instance
+        # получение обновлений и задачи бота запускаются только в одном (ведущем) процессе
+        app.state.bot_leader = BotLeader(bot_instance)
+        app.state.bot_leader.start()
+        app.state.admin_events = AdminEventBroadcaster()
+        app.state.admin_events.start()
 
     @app.on_event("shutdown")
     async def on_shutdown():
         """Действия после остановки сервера."""
-        bot_instance = app.state.bot_instance
-        # manually stopping bot updater when running in polling mode
-        # see https://github.com/python-telegram-bot/python-telegram-bot/blob/master/telegram/ext/_application.py#L523
-        if not settings.BOT_WEBHOOK_MODE:
-            await bot_instance.updater.stop()
-        await bot_instance.stop()
-        await bot_instance.shutdown()
+        await app.state.admin_events.stop()
+        await app.state.bot_leader.stop()
+        await app.state.bot_instance.shutdown()
+        cpu_executor.shutdown()
 
     return app
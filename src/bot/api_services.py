@@ -1,16 +1,21 @@
 from typing import Optional
 
 from src.core.db.repository import (
+    JobRunRepository,
     MemberRepository,
     ReportRepository,
     RequestRepository,
     ShiftRepository,
+    TaskDeliveryManifestRepository,
     TaskRepository,
     UserRepository,
 )
+from src.core.services.job_run_service import JobRunService
 from src.core.services.member_service import MemberService
 from src.core.services.report_service import ReportService
+from src.core.services.reports_archive_service import ReportsArchiveService
 from src.core.services.shift_service import ShiftService
+from src.core.services.task_delivery_service import TaskDeliveryService
 from src.core.services.task_service import TaskService
 from src.core.services.user_service import UserService
 
@@ -58,3 +63,25 @@ async def get_shift_service_callback(sessions):
             shift_repository, task_service, report_repository, user_repository, request_repository
         )
         return shift_service
+
+
+async def get_reports_archive_service_callback(sessions):
+    async for session in sessions:  # noqa R503
+        shift_repository = ShiftRepository(session)
+        reports_archive_service = ReportsArchiveService(shift_repository)
+        return reports_archive_service
+
+
+async def get_task_delivery_service_callback(sessions):
+    async for session in sessions:  # noqa R503
+        task_service = TaskService(TaskRepository(session))
+        task_delivery_service = TaskDeliveryService(
+            TaskDeliveryManifestRepository(session), ReportRepository(session), ShiftRepository(session), task_service
+        )
+        return task_delivery_service
+
+
+async def get_job_run_service_callback(sessions):
+    async for session in sessions:  # noqa R503
+        job_run_service = JobRunService(JobRunRepository(session))
+        return job_run_service
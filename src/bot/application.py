@@ -0,0 +1,98 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from telegram import Update
+from telegram.ext import Application
+
+from src.core.db.query_stats import track_queries
+
+LATENCY_SAMPLES = 1000
+
+
+@dataclass
+class HandlerLatencyStats:
+    processed: int
+    in_progress: int
+    p50: float
+    p90: float
+    p99: float
+    max: float
+
+
+def _percentile(sorted_values: list[float], percent: int) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, round(percent / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+class BotApplication(Application):
+    """Приложение бота с конкурентной обработкой обновлений.
+
+    Обновления разных чатов обрабатываются параллельно (не более max_concurrent_updates одновременно),
+    а обновления одного чата — строго по очереди, в порядке поступления.
+
+    Очередь обновлений по-прежнему читается последовательно: слот обработки занимается до запуска задачи,
+    поэтому при занятых слотах чтение очереди приостанавливается и её ограничение продолжает работать.
+    Обновление чата, предыдущее обновление которого ещё не обработано, ждёт его без слота обработки
+    (иначе один чат с пачкой обновлений занял бы все слоты), число таких ожидающих обновлений
+    ограничено max_waiting_updates.
+    """
+
+    def __init__(self, max_concurrent_updates: int, max_waiting_updates: int, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.__slots = asyncio.BoundedSemaphore(max_concurrent_updates)
+        self.__waiting = asyncio.BoundedSemaphore(max_waiting_updates)
+        self.__chat_tails: dict[int, asyncio.Future] = {}
+        self.__latencies: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.__processed = 0
+        self.__in_progress = 0
+
+    async def process_update(self, update: object) -> None:
+        chat_id = update.effective_chat.id if isinstance(update, Update) and update.effective_chat else None
+        previous = self.__chat_tails.get(chat_id)
+        await (self.__slots if previous is None else self.__waiting).acquire()
+        done = asyncio.get_running_loop().create_future()
+        if chat_id is not None:
+            self.__chat_tails[chat_id] = done
+        self.create_task(self.__process_in_chat_order(update, chat_id, previous, done), update=update)
+
+    async def __process_in_chat_order(
+        self, update: object, chat_id: int | None, previous: asyncio.Future | None, done: asyncio.Future
+    ) -> None:
+        try:
+            if previous is not None:
+                try:
+                    await previous
+                finally:
+                    self.__waiting.release()
+                await self.__slots.acquire()
+            started_at = time.monotonic()
+            self.__in_progress += 1
+            try:
+                with track_queries() as query_stats:
+                    await super().process_update(update)
+                query_stats.log(f"telegram update {getattr(update, 'update_id', None)}")
+            finally:
+                self.__in_progress -= 1
+                self.__processed += 1
+                self.__latencies.append(time.monotonic() - started_at)
+                self.__slots.release()
+        finally:
+            done.set_result(None)
+            if self.__chat_tails.get(chat_id) is done:
+                del self.__chat_tails[chat_id]
+
+    def get_latency_stats(self) -> HandlerLatencyStats:
+        """Перцентили времени обработки последних обновлений (в секундах)."""
+        latencies = sorted(self.__latencies)
+        return HandlerLatencyStats(
+            processed=self.__processed,
+            in_progress=self.__in_progress,
+            p50=_percentile(latencies, 50),
+            p90=_percentile(latencies, 90),
+            p99=_percentile(latencies, 99),
+            max=latencies[-1] if latencies else 0.0,
+        )
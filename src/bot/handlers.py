@@ -51,7 +51,7 @@ async def start(update: Update, context: CallbackContext) -> None:
     session = get_session()
     user_service = await get_user_service_callback(session)
     user = await user_service.get_user_by_telegram_id(update.effective_chat.id)
-    context.user_data["user"] = user
+    context.user_data["user"] = UserWebhookTelegram.from_orm(user).dict() if user else None
     if user and user.telegram_blocked:
         await user_service.unset_telegram_blocked(user)
     await context.bot.send_message(chat_id=update.effective_chat.id, text=start_text)
@@ -100,9 +100,7 @@ async def update_user_data(
         text = "Исправить неверно внесенные данные"
     else:
         text = "Подать заявку на участие в смене"
-        user = context.user_data.get("user")
-        web_hook = UserWebhookTelegram.from_orm(user)
-        query = urllib.parse.urlencode(web_hook.dict())
+        query = urllib.parse.urlencode(context.user_data.get("user"))
     await update.message.reply_text(
         "Нажмите на кнопку ниже, чтобы перейти на форму регистрации.",
         reply_markup=ReplyKeyboardMarkup.from_button(
@@ -1,91 +1,243 @@
 import asyncio
-from datetime import date
-from urllib.parse import urljoin
+import random
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from typing import Any, Awaitable, Callable
 
-from telegram.ext import CallbackContext
+import pytz
+from telegram.ext import Application, CallbackContext, JobQueue
 
 from src.bot.api_services import (
+    get_job_run_service_callback,
     get_member_service_callback,
     get_report_service_callback,
+    get_reports_archive_service_callback,
     get_shift_service_callback,
+    get_task_delivery_service_callback,
 )
 from src.bot.services import BotService
 from src.bot.ui import DAILY_TASK_BUTTONS
 from src.core.db.db import get_session
-from src.core.db.models import Report
+from src.core.db.query_stats import track_queries
 from src.core.settings import settings
+from src.core.utils import get_current_task_date
 
 
-async def send_no_report_reminder_job(context: CallbackContext) -> None:
-    """Отправить напоминание об отчёте."""
+async def _send_with_jitter(send: Awaitable) -> None:
+    """Отправить сообщение со случайной задержкой в пределах SEND_NEW_TASK_JITTER_SECONDS."""
+    await asyncio.sleep(random.uniform(0, settings.SEND_NEW_TASK_JITTER_SECONDS))
+    await send
+
+
+@dataclass
+class DurableJob:
+    """Ежедневная задача, запуски которой записываются в базу данных."""
+
+    callback: Callable[[CallbackContext], Awaitable[int | None]]
+    run_time: time
+
+    @property
+    def time_zone(self) -> tzinfo:
+        return self.run_time.tzinfo or pytz.timezone(settings.TIME_ZONE)
+
+    def get_scheduled_at(self, day: date) -> datetime:
+        """Запланированное время запуска задачи в указанный день."""
+        return self.time_zone.localize(datetime.combine(day, self.run_time.replace(tzinfo=None)))
+
+    def get_nearest_scheduled_at(self, moment: datetime) -> datetime:
+        """Запланированное время запуска, ближайшее к moment."""
+        day = moment.astimezone(self.time_zone).date()
+        scheduled_times = (self.get_scheduled_at(day + timedelta(days=offset)) for offset in (-1, 0, 1))
+        return min(scheduled_times, key=lambda scheduled_at: abs(scheduled_at - moment))
+
+    def get_next_scheduled_at(self, moment: datetime) -> datetime:
+        """Первое запланированное время запуска после moment."""
+        day = moment.astimezone(self.time_zone).date()
+        return next(
+            scheduled_at
+            for scheduled_at in (self.get_scheduled_at(day + timedelta(days=offset)) for offset in (0, 1, 2))
+            if scheduled_at > moment
+        )
+
+
+# Реестр ежедневных задач, запуски которых записываются в базу данных (по имени задачи в job_queue)
+durable_jobs: dict[str, DurableJob] = {}
+
+
+def run_durable_daily(
+    job_queue: JobQueue,
+    callback: Callable[[CallbackContext], Awaitable[int | None]],
+    run_time: time,
+    data: Any = None,
+    name: str | None = None,
+) -> None:
+    """Запланировать ежедневную задачу, запуски которой записываются в базу данных.
+
+    Задача может вернуть количество обработанных записей, оно сохраняется вместе со статусом
+    и временем выполнения.
+    """
+    name = name or callback.__name__
+    durable_jobs[name] = DurableJob(callback, run_time)
+    job_queue.run_daily(_run_durable_job, run_time, data=data, name=name)
+
+
+async def _run_durable_job(context: CallbackContext, scheduled_at: datetime | None = None) -> None:
+    """Выполнить запуск ежедневной задачи, запланированный на scheduled_at.
+
+    При срабатывании по расписанию запланированным считается ближайшее к текущему время запуска задачи.
+    Перед выполнением задача занимает запись о запуске: если запуск уже выполнен или выполняется, задача
+    не запускается повторно. Одновременно создаётся запись о следующем запуске в статусе PENDING: если в это
+    время приложение будет остановлено, запуск будет выполнен при следующем старте (см. catch_up_missed_jobs).
+    """
+    durable = durable_jobs[context.job.name]
+    if scheduled_at is None:
+        scheduled_at = durable.get_nearest_scheduled_at(datetime.now(timezone.utc))
+    job_run_service = await get_job_run_service_callback(get_session())
+    job_run_id = await job_run_service.claim_run(
+        context.job.name, scheduled_at, durable.get_next_scheduled_at(scheduled_at)
+    )
+    if job_run_id is None:
+        return
+    try:
+        with track_queries() as query_stats:
+            rows_affected = await durable.callback(context)
+    except Exception as error:
+        await job_run_service.fail_run(job_run_id, error)
+        raise
+    finally:
+        query_stats.log(f"job {context.job.name}")
+    await job_run_service.complete_run(job_run_id, rows_affected)
+
+
+def catch_up_missed_jobs(application: Application) -> None:
+    """Запустить в фоне выполнение пропущенных запусков ежедневных задач."""
+    application.create_task(_catch_up_missed_jobs(application))
+
+
+async def _catch_up_missed_jobs(application: Application) -> None:
+    """Выполнить пропущенные запуски ежедневных задач по очереди, в порядке запланированного времени.
+
+    Пропущенным считается запуск за последние сутки, запись о котором осталась в статусе PENDING
+    (приложение было остановлено в запланированное время) или FAILED, либо находится в статусе RUNNING
+    дольше JOB_RUN_LEASE_TIME (выполнение было прервано). Запуски, о которых нет записей, не выполняются,
+    поэтому при первом развёртывании, пока истории запусков нет, ничего не догоняется.
+    Для всех задач реестра создаются записи о следующих запусках.
+    """
+    now = datetime.now(timezone.utc)
+    job_run_service = await get_job_run_service_callback(get_session())
+    missed_runs = await job_run_service.get_missed_runs(list(durable_jobs), now - timedelta(days=1))
+    await job_run_service.plan_runs(
+        {name: durable.get_next_scheduled_at(now) for name, durable in durable_jobs.items()}
+    )
+    for job_run in missed_runs:
+        job = application.job_queue.get_jobs_by_name(job_run.job_name)[0]
+        context = application.context_types.context.from_job(job, application)
+        try:
+            await _run_durable_job(context, job_run.scheduled_at.astimezone())
+        except Exception as error:
+            await application.process_error(None, error, job=job)
+
+
+async def send_no_report_reminder_job(context: CallbackContext) -> int:
+    """Отправить напоминание об отчёте участникам одной волны рассылки.
+
+    Волна - участники из городов одного часового пояса (передаётся в context.job.data).
+    Возвращает количество отправленных напоминаний.
+    """
+    time_zone = context.job.data
     shift_session = get_session()
     shift_service = await get_shift_service_callback(shift_session)
     started_shift = await shift_service.get_started_shift_or_none()
     if not started_shift:
-        return
+        return 0
     member_session_generator = get_session()
     member_service = await get_member_service_callback(member_session_generator)
     bot_service = BotService(context)
-    members = await member_service.get_members_with_no_reports(started_shift.id)
-    send_message_tasks = [
-        bot_service.send_message(
-            member.user,
-            (
-                f"{member.user.name} {member.user.surname}, мы потеряли тебя! "
-                f"Задание все еще ждет тебя. "
-                f"Напоминаем, что за каждое выполненное задание ты получаешь виртуальные "
-                f"\"ломбарьерчики\", которые можешь обменять на призы и подарки!"
-            ),
+    reminded = 0
+    async for members in member_service.get_members_with_no_reports(started_shift.id, time_zone):
+        await asyncio.gather(
+            *(
+                bot_service.send_message(
+                    member,
+                    (
+                        f"{member.name} {member.surname}, мы потеряли тебя! "
+                        f"Задание все еще ждет тебя. "
+                        f"Напоминаем, что за каждое выполненное задание ты получаешь виртуальные "
+                        f"\"ломбарьерчики\", которые можешь обменять на призы и подарки!"
+                    ),
+                )
+                for member in members
+            )
         )
-        for member in members
-    ]
-    context.application.create_task(asyncio.gather(*send_message_tasks))
+        reminded += len(members)
+    return reminded
+
+
+async def build_task_delivery_manifest_job(context: CallbackContext) -> int:
+    """Готовит манифест рассылки задания на следующий день для участников одной волны рассылки."""
+    time_zone = context.job.data
+    session = get_session()
+    task_delivery_service = await get_task_delivery_service_callback(session)
+    next_task_date = get_current_task_date(time_zone) + timedelta(days=1)
+    return await task_delivery_service.build_manifest(next_task_date, time_zone)
 
 
-async def send_daily_task_job(context: CallbackContext) -> None:
-    """Автоматически запускает смену и рассылает задания."""
+async def send_daily_task_job(context: CallbackContext) -> int:
+    """Автоматически запускает смену и рассылает задания участникам одной волны рассылки.
+
+    Волна - участники из городов одного часового пояса (передаётся в context.job.data).
+    Сообщения берутся из манифеста, подготовленного накануне, перед рассылкой он только дополняется
+    участниками, появившимися после его подготовки. Доставленные сообщения отмечаются в манифесте, поэтому
+    повторный запуск после сбоя отправляет задание только тем, кому оно ещё не отправлено.
+    Возвращает количество разосланных заданий.
+    """
+    time_zone = context.job.data
+    current_task_date = get_current_task_date(time_zone)
     shift_session = get_session()
     shift_service = await get_shift_service_callback(shift_session)
-    await shift_service.start_prepared_shift()
+    report_session = get_session()
+    report_service = await get_report_service_callback(report_session)
+    await shift_service.start_prepared_shift(current_task_date)
+    # отчеты прошлого дня пропускаются и после последнего дня смены, когда задания уже не рассылаются
+    await report_service.skip_waiting_reports(time_zone, current_task_date)
     started_shift = await shift_service.get_started_shift_or_none()
     if not started_shift:
-        return
+        return 0
+    if not started_shift.started_at <= current_task_date <= started_shift.finished_at:
+        return 0
     member_session = get_session()
     member_service = await get_member_service_callback(member_session)
-    report_session = get_session()
-    report_service = await get_report_service_callback(report_session)
+    task_delivery_session = get_session()
+    task_delivery_service = await get_task_delivery_service_callback(task_delivery_session)
     bot_service = BotService(context)
+    delivered = 0
 
-    await report_service.set_status_to_waiting_reports(Report.Status.SKIPPED)
-    await member_service.exclude_lagging_members(started_shift, context.application)
-    task, members = await report_service.get_today_task_and_active_members(started_shift, date.today().day)
-    await report_service.create_daily_reports(members, task)
-    task_photo = urljoin(settings.APPLICATION_URL, task.url)
-    send_message_tasks = [
-        bot_service.send_photo(
-            member.user,
-            task_photo,
-            (
-                f"Привет, {member.user.name}!\n"
-                f"Вчерашнее задание не было выполнено! Сегодня можешь отправить отчет только по новому заданию. "
-                f"Сегодня твоим заданием будет {task.title}. "
-                f"Не забудь сделать фотографию, как ты выполняешь задание, и отправить на проверку."
+    await member_service.exclude_lagging_members(started_shift, context.application, time_zone)
+    await task_delivery_service.build_manifest(current_task_date, time_zone)
+    await task_delivery_service.create_daily_reports(current_task_date, time_zone)
+    async for deliveries in task_delivery_service.get_deliveries(current_task_date, time_zone):
+        await asyncio.gather(
+            *(
+                _send_with_jitter(
+                    bot_service.send_photo(delivery, delivery.photo_url, delivery.text, DAILY_TASK_BUTTONS)
+                )
+                for delivery in deliveries
             )
-            if await report_service.is_previous_report_not_submitted(member.id)
-            else (
-                f"Привет, {member.user.name}!\n"
-                f"Сегодня твоим заданием будет {task.title}. "
-                f"Не забудь сделать фотографию, как ты выполняешь задание, и отправить на проверку."
-            ),
-            DAILY_TASK_BUTTONS,
         )
-        for member in members
-    ]
-    context.application.create_task(asyncio.gather(*send_message_tasks))
+        delivered += len(deliveries)
+    return delivered
 
 
 async def finish_shift_automatically_job(context: CallbackContext) -> None:
-    """Автоматически закрывает смену в дату, указанную в finished_at."""
+    """Автоматически закрывает смену после даты, указанной в finished_at, в часовом поясе context.job.data."""
     session = get_session()
     shift_service = await get_shift_service_callback(session)
-    await shift_service.finish_shift_automatically(context.application)
+    await shift_service.finish_shift_automatically(context.application, context.job.data)
+
+
+async def archive_finished_shifts_job(context: CallbackContext) -> int:
+    """Упаковывает фотоотчёты завершённых смен в архивы. Возвращает количество упакованных смен."""
+    session = get_session()
+    reports_archive_service = await get_reports_archive_service_callback(session)
+    archived = await reports_archive_service.archive_finished_shifts()
+    return len(archived)
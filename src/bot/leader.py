@@ -0,0 +1,117 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncConnection
+from telegram.ext import Application
+
+from src.bot.main import start_bot, stop_bot
+from src.bot.persistence import DatabasePersistence
+from src.core.db.db import engine, get_session
+from src.core.db.repository import BotForwardedUpdateRepository
+from src.core.db.repository.bot_forwarded_update_repository import BOT_UPDATES_CHANNEL
+from src.core.settings import settings
+
+
+@asynccontextmanager
+async def _get_repository() -> AsyncIterator[BotForwardedUpdateRepository]:
+    async for session in get_session():
+        yield BotForwardedUpdateRepository(session)
+
+
+class BotLeader:
+    """Выбор ведущего процесса приложения через advisory lock Postgres.
+
+    Ведущим становится процесс, получивший блокировку BOT_LEADER_LOCK_ID. Только он получает обновления
+    telegram (polling или webhook) и выполняет задачи job_queue. Остальные процессы обслуживают HTTP-запросы,
+    а пришедшие к ним через webhook обновления сохраняют в базу и уведомляют ведущего через NOTIFY.
+
+    Блокировка принадлежит соединению с базой, которое ведущий держит открытым. Если ведущий процесс
+    завершится или потеряет соединение, блокировку в течение BOT_LEADER_CHECK_INTERVAL получит другой процесс.
+    """
+
+    def __init__(self, bot_instance: Application, webhook_mode: bool = settings.BOT_WEBHOOK_MODE) -> None:
+        self.__bot_instance = bot_instance
+        self.__webhook_mode = webhook_mode
+        self.__connection: AsyncConnection | None = None
+        self.__task: asyncio.Task | None = None
+        self.__updates_forwarded = asyncio.Event()
+
+    @property
+    def is_leader(self) -> bool:
+        return self.__connection is not None
+
+    def start(self) -> None:
+        """Запустить фоновую задачу выбора ведущего процесса."""
+        self.__task = asyncio.create_task(self.__run())
+
+    async def stop(self) -> None:
+        """Остановить выбор ведущего и, если процесс был ведущим, освободить блокировку."""
+        if self.__task is not None:
+            self.__task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.__task
+        if self.is_leader:
+            await self.__resign()
+
+    async def forward_update(self, data: dict) -> None:
+        """Передать ведущему процессу обновление, полученное через webhook."""
+        async with _get_repository() as repository:
+            await repository.forward(data["update_id"], data)
+
+    async def __run(self) -> None:
+        while True:
+            try:
+                if self.is_leader:
+                    await self.__connection.execute(select(1))
+                    await self.__process_forwarded_updates()
+                else:
+                    await self.__try_to_lead()
+            except Exception:
+                logging.exception("Ошибка при выборе ведущего процесса бота")
+                if self.is_leader:
+                    await self.__resign()
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self.__updates_forwarded.wait(), settings.BOT_LEADER_CHECK_INTERVAL)
+            self.__updates_forwarded.clear()
+
+    async def __try_to_lead(self) -> None:
+        connection = await engine.connect()
+        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        if not await connection.scalar(select(func.pg_try_advisory_lock(settings.BOT_LEADER_LOCK_ID))):
+            await connection.close()
+            return
+        self.__connection = connection
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.add_listener(BOT_UPDATES_CHANNEL, self.__on_update_forwarded)
+        logging.info("Процесс стал ведущим: запускаются получение обновлений и задачи бота")
+        await start_bot(self.__bot_instance, self.__webhook_mode)
+        await self.__process_forwarded_updates()
+
+    async def __resign(self) -> None:
+        connection, self.__connection = self.__connection, None
+        with suppress(Exception):
+            await stop_bot(self.__bot_instance, self.__webhook_mode)
+        # пока процесс не ведущий, данные бота может изменить новый ведущий
+        if isinstance(self.__bot_instance.persistence, DatabasePersistence):
+            self.__bot_instance.persistence.clear_cache()
+        # соединение закрывается, а не возвращается в пул, вместе с ним освобождается блокировка
+        with suppress(Exception):
+            await connection.invalidate()
+        logging.info("Процесс перестал быть ведущим: получение обновлений и задачи бота остановлены")
+
+    def __on_update_forwarded(self, *args) -> None:
+        self.__updates_forwarded.set()
+
+    async def __process_forwarded_updates(self) -> None:
+        """Поставить в очередь бота обновления, переданные другими процессами, пока в ней есть место."""
+        update_queue = self.__bot_instance.update_queue
+        while free_slots := update_queue.maxsize - update_queue.qsize():
+            async with _get_repository() as repository:
+                updates = await repository.pop_updates(free_slots)
+            for data in updates:
+                update_queue.ingest(data, self.__bot_instance.bot)
+            if len(updates) < free_slots:
+                return
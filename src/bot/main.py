@@ -11,11 +11,11 @@ from telegram.ext import (
     CommandHandler,
     Defaults,
     MessageHandler,
-    PicklePersistence,
     filters,
 )
 from telegram.ext.filters import PHOTO, TEXT, StatusUpdate
 
+from src.bot.application import BotApplication
 from src.bot.handlers import (
     button_handler,
     chat_member_handler,
@@ -26,11 +26,18 @@ from src.bot.handlers import (
     web_app_data,
 )
 from src.bot.jobs import (
+    archive_finished_shifts_job,
+    build_task_delivery_manifest_job,
+    catch_up_missed_jobs,
     finish_shift_automatically_job,
+    run_durable_daily,
     send_daily_task_job,
     send_no_report_reminder_job,
 )
+from src.bot.persistence import DatabasePersistence
+from src.bot.update_queue import UpdateQueue
 from src.core.settings import settings
+from src.core.utils import get_delivery_time_zones
 
 HANDLED_MESSAGE_TYPES = filters.PHOTO | filters.TEXT | filters.StatusUpdate.WEB_APP_DATA
 
@@ -38,15 +45,23 @@ HANDLED_MESSAGE_TYPES = filters.PHOTO | filters.TEXT | filters.StatusUpdate.WEB_
 def create_bot() -> Application:
     """Создать бота."""
     Path(settings.USER_REPORTS_DIR).mkdir(parents=True, exist_ok=True)
-    bot_persistence = PicklePersistence(filepath=settings.BOT_PERSISTENCE_FILE)
+    bot_persistence = DatabasePersistence()
     defaults = Defaults(
         tzinfo=pytz.timezone(settings.TIME_ZONE),
     )
     bot_instance = (
         ApplicationBuilder()
+        .application_class(
+            BotApplication,
+            {
+                "max_concurrent_updates": settings.BOT_CONCURRENT_UPDATES,
+                "max_waiting_updates": settings.BOT_UPDATE_QUEUE_SIZE,
+            },
+        )
         .defaults(defaults)
         .token(settings.BOT_TOKEN)
         .rate_limiter(AIORateLimiter())
+        .update_queue(UpdateQueue(settings.BOT_UPDATE_QUEUE_SIZE, settings.BOT_UPDATE_DEDUPE_WINDOW))
         .persistence(persistence=bot_persistence)
         .build()
     )
@@ -58,27 +73,64 @@ def create_bot() -> Application:
     bot_instance.add_handler(MessageHandler(StatusUpdate.WEB_APP_DATA, web_app_data))
     bot_instance.add_handler(MessageHandler(~HANDLED_MESSAGE_TYPES, incorrect_report_type_handler))
     bot_instance.add_handler(CallbackQueryHandler(inline_button_handler))
-    bot_instance.job_queue.run_daily(
+    delivery_time_zones = get_delivery_time_zones()
+    # смена закрывается, когда закончился её последний день в самом западном часовом поясе
+    run_durable_daily(
+        bot_instance.job_queue,
         finish_shift_automatically_job,
-        time(hour=settings.SEND_NEW_TASK_HOUR - 1),
-    )
-    bot_instance.job_queue.run_daily(
-        send_daily_task_job,
-        time(hour=settings.SEND_NEW_TASK_HOUR),
+        time(hour=settings.SEND_NEW_TASK_HOUR - 1, tzinfo=pytz.timezone(delivery_time_zones[-1])),
+        data=delivery_time_zones[-1],
     )
-    bot_instance.job_queue.run_daily(
-        send_no_report_reminder_job,
-        time(hour=settings.SEND_NO_REPORT_REMINDER_HOUR),
+    for time_zone in delivery_time_zones:
+        run_durable_daily(
+            bot_instance.job_queue,
+            build_task_delivery_manifest_job,
+            time(hour=settings.BUILD_TASK_MANIFEST_HOUR, tzinfo=pytz.timezone(time_zone)),
+            data=time_zone,
+            name=f"build_task_delivery_manifest_job:{time_zone}",
+        )
+        run_durable_daily(
+            bot_instance.job_queue,
+            send_daily_task_job,
+            time(hour=settings.SEND_NEW_TASK_HOUR, tzinfo=pytz.timezone(time_zone)),
+            data=time_zone,
+            name=f"send_daily_task_job:{time_zone}",
+        )
+        run_durable_daily(
+            bot_instance.job_queue,
+            send_no_report_reminder_job,
+            time(hour=settings.SEND_NO_REPORT_REMINDER_HOUR, tzinfo=pytz.timezone(time_zone)),
+            data=time_zone,
+            name=f"send_no_report_reminder_job:{time_zone}",
+        )
+    run_durable_daily(
+        bot_instance.job_queue,
+        archive_finished_shifts_job,
+        time(hour=settings.ARCHIVE_FINISHED_SHIFTS_HOUR),
     )
     return bot_instance
 
 
-async def start_bot(webhook_mode: bool = settings.BOT_WEBHOOK_MODE) -> Application:
-    """Запустить бота."""
+async def init_bot(webhook_mode: bool = settings.BOT_WEBHOOK_MODE) -> Application:
+    """Создать и инициализировать бота.
+
+    Получение обновлений и задачи job_queue не запускаются: этим занимается только ведущий процесс,
+    см. BotLeader. Инициализированный бот может отправлять сообщения из любого процесса.
+    """
     bot_instance = create_bot()
     await bot_instance.initialize()
     if webhook_mode:
         bot_instance.updater = None
+    return bot_instance
+
+
+async def start_bot(bot_instance: Application, webhook_mode: bool = settings.BOT_WEBHOOK_MODE) -> None:
+    """Запустить получение обновлений и задачи job_queue.
+
+    Запуски ежедневных задач, пропущенные во время остановки приложения, выполняются сразу,
+    по очереди в порядке запланированного времени.
+    """
+    if webhook_mode:
         await bot_instance.bot.set_webhook(
             url=settings.telegram_webhook_url,
             secret_token=settings.SECRET_KEY,
@@ -86,4 +138,14 @@ async def start_bot(webhook_mode: bool = settings.BOT_WEBHOOK_MODE) -> Applicati
     else:
         await bot_instance.updater.start_polling()
     await bot_instance.start()
-    return bot_instance
+    catch_up_missed_jobs(bot_instance)
+
+
+async def stop_bot(bot_instance: Application, webhook_mode: bool = settings.BOT_WEBHOOK_MODE) -> None:
+    """Остановить получение обновлений и задачи job_queue."""
+    # manually stopping bot updater when running in polling mode
+    # see https://github.com/python-telegram-bot/python-telegram-bot/blob/master/telegram/ext/_application.py#L523
+    if not webhook_mode and bot_instance.updater.running:
+        await bot_instance.updater.stop()
+    if bot_instance.running:
+        await bot_instance.stop()
@@ -0,0 +1,137 @@
+import json
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from telegram.ext import BasePersistence, PersistenceInput
+
+from src.core.db.db import get_session
+from src.core.db.models import BotPersistenceData
+from src.core.db.repository import BotPersistenceRepository
+
+BOT_DATA_OWNER_ID = 0
+DataType = BotPersistenceData.DataType
+
+
+@asynccontextmanager
+async def _get_repository() -> AsyncIterator[BotPersistenceRepository]:
+    async for session in get_session():
+        yield BotPersistenceRepository(session)
+
+
+def _serialize(data: dict) -> dict[str, str]:
+    """Снимок данных для сравнения: ключ -> значение в JSON."""
+    return {str(key): json.dumps(value, sort_keys=True, ensure_ascii=False) for key, value in data.items()}
+
+
+def _conversation_key_prefix(name: str) -> str:
+    return json.dumps([name])[:-1] + ","
+
+
+class DatabasePersistence(BasePersistence):
+    """Хранение данных бота в базе данных.
+
+    - user_data и chat_data загружаются из базы лениво, при первом обращении к пользователю (чату),
+      поэтому время запуска бота не зависит от количества пользователей.
+    - При сохранении в базу записываются только изменившиеся ключи и удаляются удалённые.
+    - Когда процесс перестаёт быть ведущим, загруженные данные сбрасываются (clear_cache): пока процесс
+      не ведущий, данные может изменить другой процесс, поэтому они заново загружаются при следующем обращении.
+    - Ключи словарей сохраняются как строки, значения должны сериализоваться в JSON.
+    """
+
+    def __init__(self, update_interval: float = 60) -> None:
+        super().__init__(store_data=PersistenceInput(callback_data=False), update_interval=update_interval)
+        self.__saved: dict[tuple[DataType, int], dict[str, str]] = {}
+
+    async def __load(self, data_type: DataType, owner_id: int, data: dict) -> None:
+        async with _get_repository() as repository:
+            stored = await repository.get_data(data_type, owner_id)
+        data.clear()
+        data.update(stored)
+        self.__saved[(data_type, owner_id)] = _serialize(stored)
+
+    async def __save(self, data_type: DataType, owner_id: int, data: dict) -> None:
+        current = _serialize(data)
+        saved = self.__saved.get((data_type, owner_id))
+        if saved is None:
+            # Данные не загружались из базы: удалять ключи, о которых ничего не известно, нельзя
+            changed_keys, deleted_keys = current.keys(), set()
+        else:
+            changed_keys = {key for key, value in current.items() if saved.get(key) != value}
+            deleted_keys = saved.keys() - current.keys()
+        if not changed_keys and not deleted_keys:
+            return
+        changed = {str(key): value for key, value in data.items() if str(key) in changed_keys}
+        async with _get_repository() as repository:
+            await repository.save_data(data_type, owner_id, changed, deleted_keys)
+        if saved is not None:
+            self.__saved[(data_type, owner_id)] = current
+
+    async def __drop(self, data_type: DataType, owner_id: int) -> None:
+        async with _get_repository() as repository:
+            await repository.delete_data(data_type, owner_id)
+        self.__saved[(data_type, owner_id)] = {}
+
+    def clear_cache(self) -> None:
+        """Забыть загруженные данные: при следующем обращении они будут заново прочитаны из базы."""
+        self.__saved.clear()
+
+    async def get_user_data(self) -> dict[int, dict]:
+        return {}
+
+    async def get_chat_data(self) -> dict[int, dict]:
+        return {}
+
+    async def get_bot_data(self) -> dict:
+        bot_data = {}
+        await self.__load(DataType.BOT, BOT_DATA_OWNER_ID, bot_data)
+        return bot_data
+
+    async def get_callback_data(self) -> None:
+        return None
+
+    async def get_conversations(self, name: str) -> dict[tuple, object]:
+        prefix = _conversation_key_prefix(name)
+        async with _get_repository() as repository:
+            stored = await repository.get_data_by_key_prefix(DataType.CONVERSATION, BOT_DATA_OWNER_ID, prefix)
+        return {tuple(json.loads(key)[1]): state for key, state in stored.items()}
+
+    async def update_user_data(self, user_id: int, data: dict) -> None:
+        await self.__save(DataType.USER, user_id, data)
+
+    async def update_chat_data(self, chat_id: int, data: dict) -> None:
+        await self.__save(DataType.CHAT, chat_id, data)
+
+    async def update_bot_data(self, data: dict) -> None:
+        await self.__save(DataType.BOT, BOT_DATA_OWNER_ID, data)
+
+    async def update_callback_data(self, data: Any) -> None:
+        pass
+
+    async def update_conversation(self, name: str, key: tuple, new_state: object | None) -> None:
+        db_key = json.dumps([name, list(key)])
+        async with _get_repository() as repository:
+            if new_state is None:
+                await repository.save_data(DataType.CONVERSATION, BOT_DATA_OWNER_ID, {}, [db_key])
+            else:
+                await repository.save_data(DataType.CONVERSATION, BOT_DATA_OWNER_ID, {db_key: new_state})
+
+    async def refresh_user_data(self, user_id: int, user_data: dict) -> None:
+        if (DataType.USER, user_id) not in self.__saved:
+            await self.__load(DataType.USER, user_id, user_data)
+
+    async def refresh_chat_data(self, chat_id: int, chat_data: dict) -> None:
+        if (DataType.CHAT, chat_id) not in self.__saved:
+            await self.__load(DataType.CHAT, chat_id, chat_data)
+
+    async def refresh_bot_data(self, bot_data: dict) -> None:
+        if (DataType.BOT, BOT_DATA_OWNER_ID) not in self.__saved:
+            await self.__load(DataType.BOT, BOT_DATA_OWNER_ID, bot_data)
+
+    async def drop_user_data(self, user_id: int) -> None:
+        await self.__drop(DataType.USER, user_id)
+
+    async def drop_chat_data(self, chat_id: int) -> None:
+        await self.__drop(DataType.CHAT, chat_id)
+
+    async def flush(self) -> None:
+        """Изменения записываются в базу сразу при сохранении, дополнительных действий не требуется."""
@@ -1,8 +1,10 @@
 import asyncio
 import functools
 import logging
-from datetime import date, datetime
+from datetime import datetime
+from typing import Sequence
 
+from sqlalchemy import Row
 from telegram import ReplyKeyboardMarkup
 from telegram.error import NetworkError, RetryAfter, TelegramError, TimedOut
 from telegram.ext import Application
@@ -15,6 +17,7 @@ from src.core.utils import (
     get_current_task_date,
     get_lombaryers_for_quantity,
     get_message_with_numbers_attempts,
+    get_user_time_zone,
 )
 
 FORMAT_PHOTO_DATE = "%d.%m.%Y"
@@ -75,14 +78,32 @@ class BotService:
         """Уведомление участника о решении по заявке в telegram.
 
         - Заявка принята.
+
+        Задания рассылаются в FORMATTED_TASK_TIME по местному времени часового пояса участника,
+        first_task_date - дата первого задания в этом часовом поясе.
         """
         text = (
             f"Привет, {user.name} {user.surname}! Поздравляем, ты в проекте! "
-            f"{first_task_date} в {settings.FORMATTED_TASK_TIME} часов утра "
+            f"{first_task_date} в {settings.FORMATTED_TASK_TIME} часов утра по местному времени "
             "тебе поступит первое задание."
         )
         await self.send_message(user, text)
 
+    async def notify_approved_requests(self, users_with_first_task_date: Sequence[tuple[Row, str]]) -> None:
+        """Уведомляет участников о принятых заявках и дате первого задания.
+
+        Сообщения отправляются в фоне порциями по MAILING_CHUNK_SIZE: следующая порция отправляется
+        после отправки предыдущей.
+        """
+        self.__bot_application.create_task(self.__notify_approved_requests_in_chunks(users_with_first_task_date))
+
+    async def __notify_approved_requests_in_chunks(self, users_with_first_task_date: Sequence[tuple[Row, str]]) -> None:
+        for chunk_start in range(0, len(users_with_first_task_date), settings.MAILING_CHUNK_SIZE):
+            chunk = users_with_first_task_date[chunk_start : chunk_start + settings.MAILING_CHUNK_SIZE]
+            await asyncio.gather(
+                *(self.notify_approved_request(user, first_task_date) for user, first_task_date in chunk)
+            )
+
     async def notify_declined_request(
         self, user: models.User, decline_request_data: RequestDeclineRequest | None
     ) -> None:
@@ -109,7 +130,7 @@ class BotService:
         """
         photo_date = datetime.strftime(report.uploaded_at, FORMAT_PHOTO_DATE)
         text = f"Твой отчет от {photo_date} принят! Тебе начислен 1 \"ломбарьерчик\". "
-        if date.today() < shift.finished_at:
+        if get_current_task_date(get_user_time_zone(user.city)) < shift.finished_at:
             text = text + f"Следующее задание придет в {settings.FORMATTED_TASK_TIME} часов утра."
         await self.send_message(user, text)
 
@@ -122,12 +143,13 @@ class BotService:
             f"К сожалению, мы не можем принять твой фотоотчет от {report.uploaded_at:%d.%m.%Y}! "
             "Возможно на фотографии не видно, что именно ты выполняешь задание. "
         )
-        if date.today() < shift.finished_at and report.task_date == get_current_task_date():
+        current_task_date = get_current_task_date(get_user_time_zone(user.city))
+        if current_task_date < shift.finished_at and report.task_date == current_task_date:
             count_attempts = settings.NUMBER_ATTEMPTS_SUBMIT_REPORT - report.number_attempt
             text += get_message_with_numbers_attempts(count_attempts)
         await self.send_message(user, text)
 
-    async def notify_excluded_members(self, members: list[models.Member]) -> None:
+    async def notify_excluded_members(self, members: Sequence[Row]) -> None:
         """Уведомляет участников об исключении из смены."""
         text = (
             "К сожалению, мы заблокировали Ваше участие в смене из-за неактивности - "
@@ -136,27 +158,36 @@ class BotService:
             "Если Вы считаете, что произошла ошибка - обращайтесь "
             f"за помощью на электронную почту {settings.ORGANIZATIONS_EMAIL}."
         )
-        send_message_tasks = [self.send_message(member.user, text) for member in members]
+        send_message_tasks = [self.send_message(member, text) for member in members]
         self.__bot_application.create_task(asyncio.gather(*send_message_tasks))
 
-    async def notify_that_shift_is_finished(self, shift: models.Shift) -> None:
-        """Уведомляет активных участников об окончании смены."""
-        send_message_tasks = [
-            self.send_message(
-                member.user,
-                shift.final_message.format(
-                    name=member.user.name,
-                    surname=member.user.surname,
-                    numbers_lombaryers=member.numbers_lombaryers,
-                    lombaryers_case=get_lombaryers_for_quantity(member.numbers_lombaryers),
-                ),
+    async def notify_that_shift_is_finished(self, final_message: str, members: Sequence[Row]) -> None:
+        """Уведомляет участников об окончании смены.
+
+        Строки участников содержат telegram_id, name, surname, numbers_lombaryers и telegram_blocked.
+        Сообщения отправляются сразу, метод завершается после их отправки: при рассылке порциями
+        следующая порция читается только после отправки предыдущей.
+        """
+        await asyncio.gather(
+            *(
+                self.send_message(
+                    member,
+                    final_message.format(
+                        name=member.name,
+                        surname=member.surname,
+                        numbers_lombaryers=member.numbers_lombaryers,
+                        lombaryers_case=get_lombaryers_for_quantity(member.numbers_lombaryers),
+                    ),
+                )
+                for member in members
             )
-            for member in shift.members
-        ]
-        self.__bot_application.create_task(asyncio.gather(*send_message_tasks))
+        )
+
+    async def notify_that_shift_is_cancelled(self, users: Sequence[Row], final_message: str) -> None:
+        """Уведомляет пользователей об отмене смены.
 
-    async def notify_that_shift_is_cancelled(self, users: list[models.User], final_message: str) -> None:
-        """Уведомляет пользователей об отмене смены."""
+        Строки пользователей содержат telegram_id, name, surname и telegram_blocked.
+        """
         send_message_tasks = [self.send_message(user, final_message) for user in users]
         self.__bot_application.create_task(asyncio.gather(*send_message_tasks))
 
@@ -0,0 +1,93 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from telegram import Bot, Update
+
+from src.core import exceptions
+
+LAG_SAMPLES = 1000
+
+
+@dataclass
+class UpdateQueueStats:
+    size: int
+    maxsize: int
+    received: int
+    duplicates: int
+    rejected: int
+    oldest_update_age: float
+    average_lag: float
+    max_lag: float
+
+
+class UpdateQueue(asyncio.Queue):
+    """Ограниченная очередь обновлений telegram.
+
+    - Повторно доставленные telegram обновления (с уже принятым update_id) отбрасываются.
+    - При переполнении очереди обновление не принимается, telegram доставит его повторно позже.
+    - Для каждого обновления фиксируется время ожидания в очереди (lag).
+    """
+
+    def __init__(self, maxsize: int, dedupe_window: int) -> None:
+        super().__init__(maxsize)
+        self.__dedupe_window = dedupe_window
+        self.__seen_ids: set[int] = set()
+        self.__seen_order: deque[int] = deque()
+        self.__lags: deque[float] = deque(maxlen=LAG_SAMPLES)
+        self.__received = 0
+        self.__duplicates = 0
+        self.__rejected = 0
+
+    def _init(self, maxsize: int) -> None:
+        self._queue = deque()
+
+    def _put(self, item: Any) -> None:
+        self._queue.append((time.monotonic(), item))
+
+    def _get(self) -> Any:
+        enqueued_at, item = self._queue.popleft()
+        self.__lags.append(time.monotonic() - enqueued_at)
+        return item
+
+    def __remember(self, update_id: int) -> None:
+        self.__seen_ids.add(update_id)
+        self.__seen_order.append(update_id)
+        if len(self.__seen_order) > self.__dedupe_window:
+            self.__seen_ids.discard(self.__seen_order.popleft())
+
+    def ingest(self, data: dict, bot: Bot) -> None:
+        """Принять обновление, полученное через webhook, не дожидаясь его обработки.
+
+        Аргументы:
+            data (dict) - тело запроса от telegram
+            bot (Bot) - экземпляр бота для десериализации обновления
+        """
+        self.__received += 1
+        update_id = data.get("update_id")
+        if update_id in self.__seen_ids:
+            self.__duplicates += 1
+            return
+        try:
+            self.put_nowait(Update.de_json(data=data, bot=bot))
+        except asyncio.QueueFull:
+            self.__rejected += 1
+            raise exceptions.BotUpdateQueueFullError
+        if update_id is not None:
+            self.__remember(update_id)
+
+    def get_stats(self) -> UpdateQueueStats:
+        """Текущая глубина очереди, счётчики и время ожидания обновлений (в секундах)."""
+        oldest_update_age = time.monotonic() - self._queue[0][0] if self._queue else 0.0
+        return UpdateQueueStats(
+            size=self.qsize(),
+            maxsize=self.maxsize,
+            received=self.__received,
+            duplicates=self.__duplicates,
+            rejected=self.__rejected,
+            oldest_update_age=oldest_update_age,
+            average_lag=sum(self.__lags) / len(self.__lags) if self.__lags else 0.0,
+            max_lag=max(self.__lags, default=0.0),
+        )
@@ -0,0 +1,122 @@
+import asyncio
+import enum
+import json
+import logging
+from contextlib import contextmanager, suppress
+from typing import Any, AsyncIterator, Iterator
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.core.administrator_cache import ADMINISTRATOR_CHANGES_CHANNEL, administrator_cache
+from src.core.db.db import engine
+from src.core.settings import settings
+
+ADMIN_EVENTS_CHANNEL = "admin_events"
+
+
+class AdminEvent(str, enum.Enum):
+    """События, о которых сообщается администраторам."""
+
+    REPORT_SUBMITTED = "report_submitted"
+    REPORT_REVIEWED = "report_reviewed"
+    REQUEST_CREATED = "request_created"
+    REQUEST_REVIEWED = "request_reviewed"
+
+
+def make_payload(event: AdminEvent, **data: Any) -> str:
+    """Текст уведомления NOTIFY о событии: JSON с названием события и id изменённых объектов."""
+    return json.dumps({"event": event.value, **data}, default=str)
+
+
+class AdminEventBroadcaster:
+    """Рассылка событий для администраторов подписчикам процесса (потокам server-sent events).
+
+    События публикуются сервисами через NOTIFY в канал ADMIN_EVENTS_CHANNEL в той же транзакции, что и изменение
+    данных, поэтому доходят только после commit и из любого процесса (API или бота). Каждый процесс API держит
+    одно соединение с LISTEN на этот канал и передаёт полученные события своим подписчикам.
+
+    Через это же соединение процесс получает уведомления об изменении администраторов и сбрасывает их записи
+    в кэше авторизации.
+    """
+
+    def __init__(self) -> None:
+        self.__subscribers: set[asyncio.Queue[str | None]] = set()
+        self.__connection: AsyncConnection | None = None
+        self.__task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Запустить фоновую задачу, поддерживающую соединение для получения событий."""
+        self.__task = asyncio.create_task(self.__run())
+
+    async def stop(self) -> None:
+        if self.__task is not None:
+            self.__task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self.__task
+        await self.__close_connection()
+
+    @contextmanager
+    def subscribe(self) -> Iterator[asyncio.Queue[str | None]]:
+        """Подписаться на события. None в очереди означает, что подписчик отстал и отключён."""
+        queue = asyncio.Queue(maxsize=settings.ADMIN_EVENTS_QUEUE_SIZE)
+        self.__subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            self.__subscribers.discard(queue)
+
+    async def stream(self) -> AsyncIterator[str]:
+        """Поток событий в формате server-sent events с комментариями keep-alive при отсутствии событий."""
+        with self.subscribe() as queue:
+            while True:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), settings.ADMIN_EVENTS_KEEPALIVE_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if payload is None:
+                    return
+                data = json.loads(payload)
+                yield f"event: {data.pop('event')}\ndata: {json.dumps(data)}\n\n"
+
+    async def __run(self) -> None:
+        while True:
+            try:
+                if self.__connection is None:
+                    await self.__listen()
+                else:
+                    await self.__connection.execute(select(1))
+            except Exception:
+                logging.exception("Ошибка соединения для получения событий администраторов")
+                await self.__close_connection()
+            await asyncio.sleep(settings.ADMIN_EVENTS_CHECK_INTERVAL)
+
+    async def __listen(self) -> None:
+        connection = await engine.connect()
+        self.__connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.add_listener(ADMIN_EVENTS_CHANNEL, self.__on_notification)
+        await raw_connection.driver_connection.add_listener(
+            ADMINISTRATOR_CHANGES_CHANNEL, administrator_cache.on_administrator_changed
+        )
+        # пока соединения не было, уведомления об изменении администраторов могли быть пропущены
+        administrator_cache.clear()
+
+    async def __close_connection(self) -> None:
+        connection, self.__connection = self.__connection, None
+        if connection is not None:
+            # соединение с LISTEN не возвращается в пул
+            with suppress(Exception):
+                await connection.invalidate()
+
+    def __on_notification(self, connection, pid, channel, payload: str) -> None:
+        for queue in list(self.__subscribers):
+            try:
+                queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                # подписчик не успевает читать события: поток закрывается, клиент переподключится
+                # и заново загрузит списки
+                self.__subscribers.discard(queue)
+                queue.get_nowait()
+                queue.put_nowait(None)
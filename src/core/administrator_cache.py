@@ -0,0 +1,66 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from uuid import UUID
+
+from src.core.db.models import Administrator
+from src.core.settings import settings
+
+ADMINISTRATOR_CHANGES_CHANNEL = "administrator_changes"
+
+
+@dataclass(frozen=True)
+class AuthorizedAdministrator:
+    """Данные администратора, необходимые для проверки доступа."""
+
+    id: UUID
+    email: str
+    role: Administrator.Role
+    status: Administrator.Status
+
+
+class AdministratorCache:
+    """LRU-кэш администраторов по JWT-токену с ограниченным временем жизни записей.
+
+    Запись живёт не дольше ADMINISTRATOR_AUTH_CACHE_TTL секунд и не дольше срока действия токена.
+    Записи администратора удаляются при изменении его статуса, роли или пароля: в процессе, где произошло
+    изменение, сразу, в остальных процессах API — по уведомлению из канала ADMINISTRATOR_CHANGES_CHANNEL.
+    """
+
+    def __init__(self, max_size: int, ttl: int) -> None:
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__entries: OrderedDict[str, tuple[float, AuthorizedAdministrator]] = OrderedDict()
+
+    def get(self, token: str) -> AuthorizedAdministrator | None:
+        entry = self.__entries.get(token)
+        if entry is None:
+            return None
+        expires_at, administrator = entry
+        if expires_at <= time.time():
+            del self.__entries[token]
+            return None
+        self.__entries.move_to_end(token)
+        return administrator
+
+    def put(self, token: str, administrator: AuthorizedAdministrator, token_expires_at: float) -> None:
+        """Сохранить администратора для токена, token_expires_at — срок действия токена (timestamp)."""
+        self.__entries[token] = (min(time.time() + self.__ttl, token_expires_at), administrator)
+        self.__entries.move_to_end(token)
+        while len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+
+    def invalidate(self, email: str) -> None:
+        """Удалить все записи администратора с указанным email."""
+        for token in [token for token, (_, admin) in self.__entries.items() if admin.email == email]:
+            del self.__entries[token]
+
+    def clear(self) -> None:
+        self.__entries.clear()
+
+    def on_administrator_changed(self, connection, pid, channel, email: str) -> None:
+        """Обработчик уведомления LISTEN об изменении администратора."""
+        self.invalidate(email)
+
+
+administrator_cache = AdministratorCache(settings.ADMINISTRATOR_AUTH_CACHE_SIZE, settings.ADMINISTRATOR_AUTH_CACHE_TTL)
@@ -0,0 +1,102 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, TypeVar
+
+from loguru import logger
+
+from src.core.settings import settings
+
+T = TypeVar("T")
+
+
+@dataclass
+class CpuExecutorStats:
+    """Статистика пула для CPU-ёмких задач. Время указано в секундах."""
+
+    submitted: int = 0
+    completed: int = 0
+    total_wait_time: float = 0.0
+    total_run_time: float = 0.0
+    max_wait_time: float = 0.0
+
+    @property
+    def in_flight(self) -> int:
+        """Задачи, переданные в пул и ещё не завершённые."""
+        return self.submitted - self.completed
+
+
+def _timed_call(func: Callable[..., T], args: tuple) -> tuple[float, float, T]:
+    """Выполнить функцию в исполнителе пула, вернуть время начала, длительность и результат.
+
+    Время начала берётся по wall clock, так как исполнителем может быть другой процесс.
+    """
+    started_at = time.time()
+    result = func(*args)
+    return started_at, time.time() - started_at, result
+
+
+class CpuExecutor:
+    """Общий пул для CPU-ёмких задач: хэширования паролей bcrypt, построения excel-отчётов и т.п.
+
+    Такие задачи, выполняемые прямо в цикле событий, останавливают обработку всех запросов API и обновлений бота.
+    Вид пула (потоки или процессы) и число исполнителей задаются настройками CPU_EXECUTOR_*.
+    Для пула процессов функция и аргументы должны сериализоваться pickle (функции уровня модуля или класса).
+
+    По каждой задаче в лог пишутся время ожидания свободного исполнителя, время выполнения и глубина очереди;
+    если задача ждала дольше CPU_EXECUTOR_WAIT_WARNING_THRESHOLD, пишется предупреждение.
+    """
+
+    def __init__(self, kind: str, max_workers: int) -> None:
+        self.__kind = kind
+        self.__max_workers = max_workers
+        self.__executor: Executor | None = None
+        self.stats = CpuExecutorStats()
+
+    @property
+    def queue_depth(self) -> int:
+        """Задачи, ожидающие свободного исполнителя."""
+        return max(self.stats.in_flight - self.__max_workers, 0)
+
+    def __get_executor(self) -> Executor:
+        # пул создаётся при первой задаче, чтобы процессы, которым он не нужен, не запускали исполнителей
+        if self.__executor is None:
+            executor_class = ProcessPoolExecutor if self.__kind == "process" else ThreadPoolExecutor
+            self.__executor = executor_class(max_workers=self.__max_workers)
+        return self.__executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Выполнить func(*args) в пуле и дождаться результата, не блокируя цикл событий."""
+        submitted_at = time.time()
+        queue_depth = self.queue_depth
+        self.stats.submitted += 1
+        try:
+            started_at, run_time, result = await asyncio.get_running_loop().run_in_executor(
+                self.__get_executor(), _timed_call, func, args
+            )
+        finally:
+            self.stats.completed += 1
+        wait_time = max(started_at - submitted_at, 0.0)
+        self.stats.total_wait_time += wait_time
+        self.stats.total_run_time += run_time
+        self.stats.max_wait_time = max(self.stats.max_wait_time, wait_time)
+        self.__log(func.__qualname__, wait_time, run_time, queue_depth)
+        return result
+
+    def __log(self, task: str, wait_time: float, run_time: float, queue_depth: int) -> None:
+        level = "WARNING" if wait_time > settings.CPU_EXECUTOR_WAIT_WARNING_THRESHOLD else "DEBUG"
+        logger.bind(task=task, wait_time=wait_time, run_time=run_time, queue_depth=queue_depth).log(
+            level,
+            f"{task}: ожидание в пуле {wait_time * 1000:.1f} мс, выполнение {run_time * 1000:.1f} мс, "
+            f"задач в очереди {queue_depth}",
+        )
+
+    def shutdown(self) -> None:
+        """Остановить пул, дождавшись выполнения переданных задач."""
+        if self.__executor is not None:
+            self.__executor.shutdown()
+            self.__executor = None
+
+
+cpu_executor = CpuExecutor(settings.CPU_EXECUTOR_KIND, settings.CPU_EXECUTOR_MAX_WORKERS)
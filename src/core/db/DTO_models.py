@@ -82,6 +82,15 @@ class RequestDTO:
         )
 
 
+@dataclass
+class ShiftReportsArchiveDto:
+    shift_sequence_number: int
+    files_count: int
+    bytes_before: int
+    bytes_after: int
+    bytes_reclaimed: int
+
+
 @dataclass
 class ShiftByUserWithReportSummaryDto:
     id: UUID
@@ -94,3 +103,4 @@ class ShiftByUserWithReportSummaryDto:
     total_declined: int
     total_skipped: int
     is_excluded: bool
+    reports: list[dict]
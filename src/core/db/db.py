@@ -1,12 +1,39 @@
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator
+
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
+from src.core.db.query_stats import instrument_engine
 from src.core.settings import settings
 
-engine = create_async_engine(settings.database_url, future=True, echo=True)
+engine = create_async_engine(settings.database_url, future=True, echo=settings.DB_ECHO)
+instrument_engine(engine)
+replica_engine = (
+    create_async_engine(settings.replica_database_url, future=True, echo=settings.DB_ECHO)
+    if settings.replica_database_url
+    else None
+)
+if replica_engine is not None:
+    instrument_engine(replica_engine)
+# клиент недавно изменял данные: читаем с основной БД, чтобы он увидел свои изменения
+read_from_primary: ContextVar[bool] = ContextVar("read_from_primary", default=False)
 
 
 async def get_session() -> AsyncSession:
     async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
     async with async_session() as session:
         yield session
+
+
+def is_replica_available() -> bool:
+    """Можно ли в текущем контексте читать с реплики БД."""
+    return replica_engine is not None and not read_from_primary.get()
+
+
+@asynccontextmanager
+async def get_replica_session() -> AsyncIterator[AsyncSession]:
+    async_session = sessionmaker(replica_engine, class_=AsyncSession, expire_on_commit=False)
+    async with async_session() as session:
+        yield session
@@ -0,0 +1,41 @@
+"""Add bot_persistence_data table
+
+Revision ID: 8f3b1c2d4e5a
+Revises: d237eef85461
+Create Date: 2023-06-05 18:42:10.512347
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '8f3b1c2d4e5a'
+down_revision = 'd237eef85461'
+branch_labels = None
+depends_on = None
+
+BOT_PERSISTENCE_DATA_TYPE_ENUM_POSTGRES = postgresql.ENUM(
+    'user', 'chat', 'bot', 'conversation', name='bot_persistence_data_type'
+)
+BOT_PERSISTENCE_DATA_TYPE_ENUM = sa.Enum('user', 'chat', 'bot', 'conversation', name='bot_persistence_data_type')
+BOT_PERSISTENCE_DATA_TYPE_ENUM.with_variant(BOT_PERSISTENCE_DATA_TYPE_ENUM_POSTGRES, 'postgresql')
+
+
+def upgrade():
+    op.create_table('bot_persistence_data',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('data_type', BOT_PERSISTENCE_DATA_TYPE_ENUM, nullable=False),
+    sa.Column('owner_id', sa.BigInteger(), nullable=False),
+    sa.Column('key', sa.String(length=255), nullable=False),
+    sa.Column('value', sa.JSON(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('data_type', 'owner_id', 'key', name='_bot_persistence_key_uc')
+    )
+
+
+def downgrade():
+    op.drop_table('bot_persistence_data')
+    BOT_PERSISTENCE_DATA_TYPE_ENUM.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,46 @@
+"""Add task_delivery_manifests table
+
+Revision ID: 3a9e7d51c0b2
+Revises: 8f3b1c2d4e5a
+Create Date: 2023-06-09 21:15:37.208431
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '3a9e7d51c0b2'
+down_revision = '8f3b1c2d4e5a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('task_delivery_manifests',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('shift_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('member_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('task_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('task_date', sa.DATE(), nullable=False),
+    sa.Column('time_zone', sa.String(length=50), nullable=False),
+    sa.Column('telegram_id', sa.BigInteger(), nullable=False),
+    sa.Column('photo_url', sa.String(length=4096), nullable=False),
+    sa.Column('text', sa.String(length=1024), nullable=False),
+    sa.Column('missed_text', sa.String(length=1024), nullable=False),
+    sa.ForeignKeyConstraint(['shift_id'], ['shifts.id'], ),
+    sa.ForeignKeyConstraint(['member_id'], ['members.id'], ),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('member_id', 'task_date', name='_manifest_member_task_date_uc')
+    )
+    op.create_index(
+        'ix_task_delivery_manifests_task_date_time_zone', 'task_delivery_manifests', ['task_date', 'time_zone']
+    )
+
+
+def downgrade():
+    op.drop_index('ix_task_delivery_manifests_task_date_time_zone', table_name='task_delivery_manifests')
+    op.drop_table('task_delivery_manifests')
@@ -0,0 +1,47 @@
+"""Add consecutive_skips field to Member model
+
+Revision ID: c41f9a6b2e87
+Revises: 3a9e7d51c0b2
+Create Date: 2023-06-14 10:27:44.931205
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c41f9a6b2e87'
+down_revision = '3a9e7d51c0b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('members', sa.Column('consecutive_skips', sa.Integer(), nullable=False, server_default='0'))
+    op.create_index('ix_members_shift_id_consecutive_skips', 'members', ['shift_id', 'consecutive_skips'])
+    # Пропущенные подряд задания: пропущенные отчёты после последнего отчёта в другом статусе
+    op.execute(
+        """
+        UPDATE members SET consecutive_skips = streaks.skips
+        FROM (
+            SELECT reports.member_id, count(*) AS skips
+            FROM reports
+            WHERE reports.status = 'skipped'
+              AND reports.task_date > COALESCE(
+                  (
+                      SELECT max(last_report.task_date)
+                      FROM reports AS last_report
+                      WHERE last_report.member_id = reports.member_id
+                        AND last_report.status NOT IN ('skipped', 'waiting')
+                  ),
+                  '-infinity'::date
+              )
+            GROUP BY reports.member_id
+        ) AS streaks
+        WHERE members.id = streaks.member_id
+        """
+    )
+
+
+def downgrade():
+    op.drop_index('ix_members_shift_id_consecutive_skips', table_name='members')
+    op.drop_column('members', 'consecutive_skips')
@@ -0,0 +1,32 @@
+"""Add bot_forwarded_updates table
+
+Revision ID: 5d2e8a4f7b16
+Revises: c41f9a6b2e87
+Create Date: 2023-06-16 12:08:51.204716
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '5d2e8a4f7b16'
+down_revision = 'c41f9a6b2e87'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('bot_forwarded_updates',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('update_id', sa.BigInteger(), nullable=False),
+    sa.Column('data', sa.JSON(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('update_id')
+    )
+
+
+def downgrade():
+    op.drop_table('bot_forwarded_updates')
@@ -0,0 +1,44 @@
+"""Add job_runs table
+
+Revision ID: 9b7c3e1a5f20
+Revises: 5d2e8a4f7b16
+Create Date: 2023-06-19 09:41:26.730185
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '9b7c3e1a5f20'
+down_revision = '5d2e8a4f7b16'
+branch_labels = None
+depends_on = None
+
+JOB_RUN_STATUS_ENUM_POSTGRES = postgresql.ENUM('pending', 'running', 'succeeded', 'failed', name='job_run_status')
+JOB_RUN_STATUS_ENUM = sa.Enum('pending', 'running', 'succeeded', 'failed', name='job_run_status')
+JOB_RUN_STATUS_ENUM.with_variant(JOB_RUN_STATUS_ENUM_POSTGRES, 'postgresql')
+
+
+def upgrade():
+    op.create_table('job_runs',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('job_name', sa.String(length=100), nullable=False),
+    sa.Column('scheduled_at', sa.TIMESTAMP(), nullable=False),
+    sa.Column('status', JOB_RUN_STATUS_ENUM, nullable=False),
+    sa.Column('started_at', sa.TIMESTAMP(), nullable=True),
+    sa.Column('finished_at', sa.TIMESTAMP(), nullable=True),
+    sa.Column('rows_affected', sa.Integer(), nullable=True),
+    sa.Column('error', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('job_name', 'scheduled_at', name='_job_run_uc')
+    )
+    op.create_index('ix_job_runs_scheduled_at', 'job_runs', ['scheduled_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_job_runs_scheduled_at', table_name='job_runs')
+    op.drop_table('job_runs')
+    JOB_RUN_STATUS_ENUM.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,58 @@
+"""Replace shifts.tasks with shift_tasks table
+
+Revision ID: 0e6f2b9d8a43
+Revises: 9b7c3e1a5f20
+Create Date: 2023-06-21 15:32:08.915274
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '0e6f2b9d8a43'
+down_revision = '9b7c3e1a5f20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('shift_tasks',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('shift_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('task_date', sa.DATE(), nullable=False),
+    sa.Column('task_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.ForeignKeyConstraint(['shift_id'], ['shifts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('shift_id', 'task_date', name='_shift_task_date_uc')
+    )
+    # задание на каждый день смены берётся из словаря "день месяца -> id задания"
+    op.execute(
+        "INSERT INTO shift_tasks (id, shift_id, task_date, task_id) "
+        "SELECT gen_random_uuid(), shifts.id, days.task_date::date, "
+        "(shifts.tasks ->> extract(day FROM days.task_date)::int::text)::uuid "
+        "FROM shifts, generate_series(shifts.started_at, shifts.finished_at, interval '1 day') AS days(task_date) "
+        "WHERE shifts.tasks ->> extract(day FROM days.task_date)::int::text IS NOT NULL"
+    )
+    op.drop_column('shifts', 'tasks')
+
+
+def downgrade():
+    op.add_column('shifts', sa.Column('tasks', sa.JSON(), nullable=True))
+    op.execute(
+        "UPDATE shifts SET tasks = schedule.tasks "
+        "FROM ("
+        "SELECT shift_id, json_object_agg(day, task_id) AS tasks FROM ("
+        "SELECT DISTINCT ON (shift_id, extract(day FROM task_date)) "
+        "shift_id, extract(day FROM task_date)::int::text AS day, task_id "
+        "FROM shift_tasks ORDER BY shift_id, extract(day FROM task_date), task_date"
+        ") AS days GROUP BY shift_id"
+        ") AS schedule "
+        "WHERE shifts.id = schedule.shift_id"
+    )
+    op.execute("UPDATE shifts SET tasks = '{}' WHERE tasks IS NULL")
+    op.alter_column('shifts', 'tasks', nullable=False)
+    op.drop_table('shift_tasks')
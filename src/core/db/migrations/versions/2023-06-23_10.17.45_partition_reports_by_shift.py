@@ -0,0 +1,91 @@
+"""Partition reports table by shift
+
+Revision ID: 3c8a1f6e2d94
+Revises: 0e6f2b9d8a43
+Create Date: 2023-06-23 10:17:45.204617
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '3c8a1f6e2d94'
+down_revision = '0e6f2b9d8a43'
+branch_labels = None
+depends_on = None
+
+REPORT_STATUS_ENUM = postgresql.ENUM(
+    'reviewing', 'approved', 'declined', 'waiting', 'skipped', 'not_participate',
+    name='report_status',
+    create_type=False,
+)
+
+REPORT_COLUMNS = (
+    "id, created_at, updated_at, shift_id, task_id, member_id, updated_by, "
+    "uploaded_at, reviewed_at, task_date, status, report_url, number_attempt"
+)
+
+
+def create_reports_table(primary_key, report_url_key, **kwargs):
+    op.create_table('reports',
+    sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.Column('shift_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('task_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('member_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('updated_by', postgresql.UUID(as_uuid=True), nullable=True),
+    sa.Column('uploaded_at', sa.TIMESTAMP(), nullable=True),
+    sa.Column('reviewed_at', sa.TIMESTAMP(), nullable=True),
+    sa.Column('task_date', sa.DATE(), nullable=False),
+    sa.Column('status', REPORT_STATUS_ENUM, nullable=False),
+    sa.Column('report_url', sa.VARCHAR(length=4096), nullable=True),
+    sa.Column('number_attempt', sa.Integer(), nullable=False, server_default='0'),
+    sa.PrimaryKeyConstraint(*primary_key, name='user_tasks_pkey'),
+
+    sa.UniqueConstraint('shift_id', 'task_date', 'member_id', name='_member_task_uc'),
+    sa.UniqueConstraint(*report_url_key, name='user_tasks_report_url_key'),
+
+    sa.ForeignKeyConstraint(['shift_id'], ['shifts.id'], name='user_tasks_shift_id_fkey'),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], name='user_tasks_task_id_fkey'),
+    sa.ForeignKeyConstraint(['member_id'], ['members.id'], name='user_tasks_member_id_fkey'),
+    sa.ForeignKeyConstraint(['updated_by'], ['administrators.id'], name='reports_updated_by_fkey'),
+    **kwargs
+    )
+
+
+def rename_old_reports_table(old_table_name):
+    """Переименовать таблицу отчётов, освободив имена индексов её ограничений для новой таблицы."""
+    op.rename_table('reports', old_table_name)
+    op.drop_constraint('user_tasks_pkey', old_table_name, type_='primary')
+    op.drop_constraint('_member_task_uc', old_table_name, type_='unique')
+    op.drop_constraint('user_tasks_report_url_key', old_table_name, type_='unique')
+
+
+def upgrade():
+    rename_old_reports_table('reports_unpartitioned')
+    create_reports_table(
+        primary_key=('id', 'shift_id'),
+        report_url_key=('report_url', 'shift_id'),
+        postgresql_partition_by='LIST (shift_id)',
+    )
+    # по секции на каждую существующую смену, секция по умолчанию для отчётов смен без своей секции
+    op.execute(
+        "DO $$ DECLARE shift_id uuid; BEGIN "
+        "FOR shift_id IN SELECT id FROM shifts LOOP "
+        "EXECUTE format('CREATE TABLE %I PARTITION OF reports FOR VALUES IN (%L)', "
+        "'reports_' || replace(shift_id::text, '-', ''), shift_id); "
+        "END LOOP; END $$"
+    )
+    op.execute("CREATE TABLE reports_default PARTITION OF reports DEFAULT")
+    op.execute(f"INSERT INTO reports ({REPORT_COLUMNS}) SELECT {REPORT_COLUMNS} FROM reports_unpartitioned")
+    op.drop_table('reports_unpartitioned')
+
+
+def downgrade():
+    rename_old_reports_table('reports_partitioned')
+    create_reports_table(primary_key=('id',), report_url_key=('report_url',))
+    op.execute(f"INSERT INTO reports ({REPORT_COLUMNS}) SELECT {REPORT_COLUMNS} FROM reports_partitioned")
+    # удаляются и все присоединённые секции; отсоединённые (архивные) секции остаются отдельными таблицами
+    op.drop_table('reports_partitioned')
@@ -0,0 +1,45 @@
+"""Add users.shifts_count and users list indexes
+
+Revision ID: 7f4d2a9c1b35
+Revises: 3c8a1f6e2d94
+Create Date: 2023-06-26 11:04:39.518342
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '7f4d2a9c1b35'
+down_revision = '3c8a1f6e2d94'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('users', sa.Column('shifts_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        "UPDATE users SET shifts_count = members.shifts_count "
+        "FROM (SELECT user_id, count(*) AS shifts_count FROM members GROUP BY user_id) AS members "
+        "WHERE users.id = members.user_id"
+    )
+    op.create_index('ix_users_name_id', 'users', ['name', 'id'], unique=False)
+    op.create_index('ix_users_surname_id', 'users', ['surname', 'id'], unique=False)
+    op.create_index('ix_users_date_of_birth_id', 'users', ['date_of_birth', 'id'], unique=False)
+    op.create_index('ix_users_created_at_id', 'users', ['created_at', 'id'], unique=False)
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        'ix_users_search_text_trgm',
+        'users',
+        [sa.text("(name || ' ' || surname || ' ' || phone_number || ' ' || city) gin_trgm_ops")],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade():
+    op.drop_index('ix_users_search_text_trgm', table_name='users')
+    op.drop_index('ix_users_created_at_id', table_name='users')
+    op.drop_index('ix_users_date_of_birth_id', table_name='users')
+    op.drop_index('ix_users_surname_id', table_name='users')
+    op.drop_index('ix_users_name_id', table_name='users')
+    op.drop_column('users', 'shifts_count')
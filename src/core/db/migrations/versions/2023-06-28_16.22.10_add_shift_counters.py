@@ -0,0 +1,37 @@
+"""Add counter columns to shifts
+
+Revision ID: a5e93c7b0d18
+Revises: 7f4d2a9c1b35
+Create Date: 2023-06-28 16:22:10.347981
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'a5e93c7b0d18'
+down_revision = '7f4d2a9c1b35'
+branch_labels = None
+depends_on = None
+
+SHIFT_COUNTERS = ('members_count', 'active_members_count', 'pending_requests_count', 'reviewing_reports_count')
+
+
+def upgrade():
+    for counter in SHIFT_COUNTERS:
+        op.add_column('shifts', sa.Column(counter, sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        "UPDATE shifts SET "
+        "members_count = (SELECT count(*) FROM members WHERE members.shift_id = shifts.id), "
+        "active_members_count = "
+        "(SELECT count(*) FROM members WHERE members.shift_id = shifts.id AND members.status = 'active'), "
+        "pending_requests_count = "
+        "(SELECT count(*) FROM requests WHERE requests.shift_id = shifts.id AND requests.status = 'pending'), "
+        "reviewing_reports_count = "
+        "(SELECT count(*) FROM reports WHERE reports.shift_id = shifts.id AND reports.status = 'reviewing')"
+    )
+
+
+def downgrade():
+    for counter in reversed(SHIFT_COUNTERS):
+        op.drop_column('shifts', counter)
@@ -0,0 +1,29 @@
+"""Add members.reviewing_reports_count
+
+Revision ID: d2c71f5e8a94
+Revises: a5e93c7b0d18
+Create Date: 2023-06-30 12:41:26.730215
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'd2c71f5e8a94'
+down_revision = 'a5e93c7b0d18'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('members', sa.Column('reviewing_reports_count', sa.Integer(), server_default='0', nullable=False))
+    op.execute(
+        "UPDATE members SET reviewing_reports_count = reports.reviewing_reports_count "
+        "FROM (SELECT member_id, count(*) AS reviewing_reports_count FROM reports "
+        "WHERE status = 'reviewing' GROUP BY member_id) AS reports "
+        "WHERE members.id = reports.member_id"
+    )
+
+
+def downgrade():
+    op.drop_column('members', 'reviewing_reports_count')
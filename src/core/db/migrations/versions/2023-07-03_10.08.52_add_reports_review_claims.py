@@ -0,0 +1,36 @@
+"""Add review queue claims to reports
+
+Revision ID: 6b0e4d2f9c71
+Revises: d2c71f5e8a94
+Create Date: 2023-07-03 10:08:52.461907
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '6b0e4d2f9c71'
+down_revision = 'd2c71f5e8a94'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('reports', sa.Column('claimed_by', postgresql.UUID(as_uuid=True), nullable=True))
+    op.add_column('reports', sa.Column('claim_expires_at', sa.TIMESTAMP(), nullable=True))
+    op.create_foreign_key('reports_claimed_by_fkey', 'reports', 'administrators', ['claimed_by'], ['id'])
+    op.create_index(
+        'ix_reports_review_queue',
+        'reports',
+        ['uploaded_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'reviewing'"),
+    )
+
+
+def downgrade():
+    op.drop_index('ix_reports_review_queue', table_name='reports')
+    op.drop_constraint('reports_claimed_by_fkey', 'reports', type_='foreignkey')
+    op.drop_column('reports', 'claim_expires_at')
+    op.drop_column('reports', 'claimed_by')
@@ -0,0 +1,23 @@
+"""Add delivered_at to task delivery manifests
+
+Revision ID: 3f8a1c6d2e57
+Revises: 6b0e4d2f9c71
+Create Date: 2023-07-05 09:12:40.218345
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '3f8a1c6d2e57'
+down_revision = '6b0e4d2f9c71'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('task_delivery_manifests', sa.Column('delivered_at', sa.TIMESTAMP(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('task_delivery_manifests', 'delivered_at')
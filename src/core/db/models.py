@@ -1,4 +1,5 @@
 import enum
+import re
 import uuid
 from datetime import datetime
 
@@ -11,11 +12,14 @@ from sqlalchemy import (
     Column,
     Enum,
     Identity,
+    Index,
     Integer,
     String,
     UniqueConstraint,
     func,
+    literal_column,
     select,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import as_declarative
@@ -64,10 +68,15 @@ class Shift(Base):
     finished_at = Column(DATE, nullable=False, index=True)
     title = Column(String(60), nullable=False)
     final_message = Column(String(400), nullable=False)
-    tasks = Column(JSON, nullable=False)
     requests = relationship("Request", back_populates="shift")
     reports = relationship("Report", back_populates="shift")
     members = relationship("Member", back_populates="shift", order_by="Member.member_user_name")
+    # Счётчики для списка смен. Изменяются сервисами в той же транзакции, что и подсчитываемые данные,
+    # восстанавливаются командой run_repair_shift_counters.py
+    members_count = Column(Integer, default=0, server_default="0", nullable=False)
+    active_members_count = Column(Integer, default=0, server_default="0", nullable=False)
+    pending_requests_count = Column(Integer, default=0, server_default="0", nullable=False)
+    reviewing_reports_count = Column(Integer, default=0, server_default="0", nullable=False)
 
     def __repr__(self):
         return f"<Shift: {self.id}, status: {self.status}>"
@@ -107,6 +116,24 @@ class Task(Base):
         return f"<Task: {self.id}, title: {self.title}>"
 
 
+class ShiftTask(Base):
+    """Задание смены на конкретный день.
+
+    Расписание составляется на все дни смены, на каждый день назначается одно задание.
+    """
+
+    __tablename__ = "shift_tasks"
+
+    shift_id = Column(UUID(as_uuid=True), ForeignKey(Shift.id, ondelete="CASCADE"), nullable=False)
+    task_date = Column(DATE, nullable=False)
+    task_id = Column(UUID(as_uuid=True), ForeignKey(Task.id), nullable=False)
+
+    __table_args__ = (UniqueConstraint("shift_id", "task_date", name="_shift_task_date_uc"),)
+
+    def __repr__(self):
+        return f"<ShiftTask: {self.shift_id}, task_date: {self.task_date}, task_id: {self.task_id}>"
+
+
 class User(Base):
     """Модель для пользователей."""
 
@@ -134,10 +161,41 @@ class User(Base):
     members = relationship("Member", back_populates="user")
     telegram_blocked = Column(Boolean, default=False, nullable=False)
     is_test_user = Column(Boolean, default=False, nullable=False)
+    # Количество смен пользователя, увеличивается при одобрении заявки на участие в смене
+    shifts_count = Column(Integer, default=0, server_default="0", nullable=False)
+
+    __table_args__ = (
+        Index("ix_users_name_id", "name", "id"),
+        Index("ix_users_surname_id", "surname", "id"),
+        Index("ix_users_date_of_birth_id", "date_of_birth", "id"),
+        Index("ix_users_created_at_id", "created_at", "id"),
+        Index(
+            "ix_users_search_text_trgm",
+            text("(name || ' ' || surname || ' ' || phone_number || ' ' || city) gin_trgm_ops"),
+            postgresql_using="gin",
+        ),
+    )
 
     def __repr__(self):
         return f"<User: {self.id}, name: {self.name}, surname: {self.surname}>"
 
+    @classmethod
+    def search_text(cls):
+        """Имя, фамилия, телефон и город пользователя одной строкой (по ней построен триграммный индекс)."""
+        separator = literal_column("' '")
+        return cls.name + separator + cls.surname + separator + cls.phone_number + separator + cls.city
+
+    @classmethod
+    def in_time_zone(cls, time_zone: str):
+        """Условие отбора пользователей, чей город относится к часовому поясу.
+
+        К часовому поясу TIME_ZONE относятся также пользователи из городов, которых нет в CITY_TIME_ZONES.
+        """
+        if time_zone == settings.TIME_ZONE:
+            other_cities = [city for city, city_zone in settings.CITY_TIME_ZONES.items() if city_zone != time_zone]
+            return cls.city.notin_(other_cities)
+        return cls.city.in_([city for city, city_zone in settings.CITY_TIME_ZONES.items() if city_zone == time_zone])
+
 
 class Request(Base):
     """Модель рассмотрения заявок."""
@@ -187,10 +245,17 @@ class Member(Base):
     shift_id = Column(UUID(as_uuid=True), ForeignKey(Shift.id), nullable=False)
     shift = relationship("Shift", back_populates="members")
     numbers_lombaryers = Column(Integer, default=0, nullable=False)
+    # Количество пропущенных подряд заданий, обнуляется при отправке отчёта
+    consecutive_skips = Column(Integer, default=0, server_default="0", nullable=False)
+    # Количество отчетов участника на проверке, изменяется вместе со счётчиком смены Shift.reviewing_reports_count
+    reviewing_reports_count = Column(Integer, default=0, server_default="0", nullable=False)
     reports = relationship("Report", back_populates="member", order_by='Report.task_date')
     member_user_name = deferred((select(User.name).where(User.id == user_id)).scalar_subquery())
 
-    __table_args__ = (UniqueConstraint("user_id", "shift_id", name="_user_shift_uc"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "shift_id", name="_user_shift_uc"),
+        Index("ix_members_shift_id_consecutive_skips", "shift_id", "consecutive_skips"),
+    )
 
     def __repr__(self):
         return f"<Member: {self.id}, status: {self.status}>"
@@ -224,7 +289,7 @@ class Administrator(Base):
     status = Column(
         Enum(Status, name="administrator_status", values_callable=lambda obj: [e.value for e in obj]), nullable=False
     )
-    reports = relationship("Report", back_populates="reviewer")
+    reports = relationship("Report", back_populates="reviewer", foreign_keys="Report.updated_by")
     is_superadmin = Column(Boolean, default=False, nullable=False)
 
     def __repr__(self) -> str:
@@ -246,25 +311,48 @@ class Report(Base):
 
     __tablename__ = "reports"
 
-    shift_id = Column(UUID(as_uuid=True), ForeignKey(Shift.id), nullable=False)
+    shift_id = Column(UUID(as_uuid=True), ForeignKey(Shift.id), primary_key=True)
     shift = relationship("Shift", back_populates="reports")
     task_id = Column(UUID(as_uuid=True), ForeignKey(Task.id), nullable=False)
     task = relationship("Task", back_populates="reports")
     member_id = Column(UUID(as_uuid=True), ForeignKey(Member.id), nullable=False)
     member = relationship("Member", back_populates="reports")
     updated_by = Column(UUID(as_uuid=True), ForeignKey(Administrator.id), nullable=True)
-    reviewer = relationship("Administrator", back_populates="reports")
+    reviewer = relationship("Administrator", back_populates="reports", foreign_keys=[updated_by])
     reviewed_at = Column(TIMESTAMP, nullable=True)
     task_date = Column(DATE, nullable=False)
     status = Column(
         Enum(Status, name="report_status", values_callable=lambda obj: [e.value for e in obj]),
         nullable=False,
     )
-    report_url = Column(String(length=4096), unique=True, nullable=True)
+    report_url = Column(String(length=4096), nullable=True)
     uploaded_at = Column(TIMESTAMP, nullable=True)
     number_attempt = Column(Integer, nullable=False, server_default='0')
+    # Администратор, взявший отчет из очереди на проверку, и время, до которого отчет закреплён за ним.
+    # После этого времени отчет снова может взять любой администратор.
+    claimed_by = Column(UUID(as_uuid=True), ForeignKey(Administrator.id), nullable=True)
+    claim_expires_at = Column(TIMESTAMP, nullable=True)
+
+    # Таблица секционирована по сменам: отчёты каждой смены хранятся в отдельной секции reports_<id смены>.
+    # Первичный ключ и уникальные ограничения в БД должны включать shift_id, в ORM отчёт по-прежнему
+    # идентифицируется только по id.
+    __table_args__ = (
+        UniqueConstraint("shift_id", "task_date", "member_id", name="_member_task_uc"),
+        UniqueConstraint("report_url", "shift_id", name="user_tasks_report_url_key"),
+        Index("ix_reports_review_queue", "uploaded_at", postgresql_where=text("status = 'reviewing'")),
+        {"postgresql_partition_by": "LIST (shift_id)"},
+    )
+    __mapper_args__ = {"primary_key": ["id"]}
+
+    @staticmethod
+    def partition_name(shift_id: uuid.UUID) -> str:
+        """Имя секции таблицы отчётов для смены."""
+        return f"reports_{shift_id.hex}"
 
-    __table_args__ = (UniqueConstraint("shift_id", "task_date", "member_id", name="_member_task_uc"),)
+    @staticmethod
+    def is_partition(table_name: str) -> bool:
+        """Является ли таблица секцией таблицы отчётов (секция смены или reports_default)."""
+        return re.fullmatch(r"reports_(default|[0-9a-f]{32})", table_name) is not None
 
     def __repr__(self):
         return f"<Report: {self.id}, task_date: {self.task_date}, status: {self.status}>"
@@ -284,10 +372,13 @@ class Report(Base):
         self.uploaded_at = datetime.now()
         self.number_attempt += 1
 
-    def set_reviewer(self, administrator_id: UUID):
-        """Установить администратора, который проверил отчет и дату проверки."""
-        self.updated_by = administrator_id
-        self.reviewed_at = datetime.now()
+    def is_claimed_by_another(self, administrator_id: UUID) -> bool:
+        """Проверить, закреплён ли отчет на проверку за другим администратором."""
+        return (
+            self.claimed_by not in (None, administrator_id)
+            and self.claim_expires_at is not None
+            and self.claim_expires_at > datetime.now()
+        )
 
 
 class AdministratorInvitation(Base):
@@ -303,3 +394,120 @@ class AdministratorInvitation(Base):
 
     def __repr__(self) -> str:
         return f"<AdministratorInvitation: {self.id}, email: {self.email}, surname: {self.surname}, name: {self.name}>"
+
+
+class TaskDeliveryManifest(Base):
+    """Модель манифеста рассылки ежедневного задания.
+
+    Готовится заранее (вечером накануне): получатель, ссылка на изображение задания и варианты текста сообщения.
+    После отправки сообщения записывается время доставки, чтобы при повторном запуске рассылки
+    задание не отправлялось участнику ещё раз.
+    """
+
+    __tablename__ = "task_delivery_manifests"
+
+    shift_id = Column(UUID(as_uuid=True), ForeignKey(Shift.id), nullable=False)
+    member_id = Column(UUID(as_uuid=True), ForeignKey(Member.id), nullable=False)
+    task_id = Column(UUID(as_uuid=True), ForeignKey(Task.id), nullable=False)
+    task_date = Column(DATE, nullable=False)
+    time_zone = Column(String(50), nullable=False)
+    telegram_id = Column(BigInteger, nullable=False)
+    photo_url = Column(String(length=4096), nullable=False)
+    text = Column(String(length=1024), nullable=False)
+    missed_text = Column(String(length=1024), nullable=False)
+    delivered_at = Column(TIMESTAMP, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("member_id", "task_date", name="_manifest_member_task_date_uc"),
+        Index("ix_task_delivery_manifests_task_date_time_zone", "task_date", "time_zone"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<TaskDeliveryManifest: {self.id}, task_date: {self.task_date}, member_id: {self.member_id}>"
+
+
+class BotPersistenceData(Base):
+    """Модель данных бота (user_data, chat_data, bot_data), сохраняемых между перезапусками.
+
+    Каждый ключ словаря данных хранится отдельной строкой, поэтому изменение одного ключа
+    не требует перезаписи остальных данных.
+    """
+
+    class DataType(str, enum.Enum):
+        """Тип данных бота."""
+
+        USER = "user"
+        CHAT = "chat"
+        BOT = "bot"
+        CONVERSATION = "conversation"
+
+    __tablename__ = "bot_persistence_data"
+
+    data_type = Column(
+        Enum(DataType, name="bot_persistence_data_type", values_callable=lambda obj: [e.value for e in obj]),
+        nullable=False,
+    )
+    owner_id = Column(BigInteger, nullable=False)
+    key = Column(String(255), nullable=False)
+    value = Column(JSON, nullable=True)
+
+    __table_args__ = (UniqueConstraint("data_type", "owner_id", "key", name="_bot_persistence_key_uc"),)
+
+    def __repr__(self) -> str:
+        return f"<BotPersistenceData: {self.data_type} {self.owner_id}, key: {self.key}>"
+
+
+class BotForwardedUpdate(Base):
+    """Обновление telegram, принятое через webhook не ведущим процессом и ожидающее обработки ведущим."""
+
+    __tablename__ = "bot_forwarded_updates"
+
+    update_id = Column(BigInteger, nullable=False, unique=True)
+    data = Column(JSON, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<BotForwardedUpdate: {self.update_id}>"
+
+
+class JobRun(Base):
+    """Запуск ежедневной задачи бота по расписанию.
+
+    Для каждой задачи и запланированного времени запуска хранится одна запись, поэтому задача
+    не выполняется повторно, а пропущенный из-за перезапуска приложения запуск можно обнаружить и выполнить.
+    """
+
+    class Status(str, enum.Enum):
+        """Статус запуска задачи."""
+
+        PENDING = "pending"
+        RUNNING = "running"
+        SUCCEEDED = "succeeded"
+        FAILED = "failed"
+
+    __tablename__ = "job_runs"
+
+    job_name = Column(String(100), nullable=False)
+    scheduled_at = Column(TIMESTAMP, nullable=False)
+    status = Column(
+        Enum(Status, name="job_run_status", values_callable=lambda obj: [e.value for e in obj]),
+        nullable=False,
+    )
+    started_at = Column(TIMESTAMP, nullable=True)
+    finished_at = Column(TIMESTAMP, nullable=True)
+    rows_affected = Column(Integer, nullable=True)
+    error = Column(String, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("job_name", "scheduled_at", name="_job_run_uc"),
+        Index("ix_job_runs_scheduled_at", "scheduled_at"),
+    )
+
+    @property
+    def duration(self) -> float | None:
+        """Длительность выполнения задачи в секундах."""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at).total_seconds()
+
+    def __repr__(self) -> str:
+        return f"<JobRun: {self.job_name} {self.scheduled_at}, status: {self.status}>"
@@ -0,0 +1,87 @@
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterator
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.core.settings import settings
+
+SERVER_TIMING_QUERIES_PATTERN = re.compile(r'db-queries;desc="(\d+)"')
+
+
+@dataclass
+class QueryStats:
+    """Статистика SQL-запросов, выполненных при обработке HTTP-запроса, обновления бота или задачи.
+
+    Время указано в секундах.
+    """
+
+    count: int = 0
+    total_time: float = 0.0
+    slowest_time: float = 0.0
+    slowest_statement: str | None = None
+
+    def add(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        if duration >= self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement
+
+    def server_timing(self) -> str:
+        """Значение заголовка Server-Timing."""
+        return (
+            f"db;dur={self.total_time * 1000:.1f}, "
+            f'db-queries;desc="{self.count}", '
+            f"db-slowest;dur={self.slowest_time * 1000:.1f}"
+        )
+
+    def log(self, source: str) -> None:
+        """Записать статистику в лог. Если запросов больше SQL_QUERIES_WARNING_THRESHOLD, пишется предупреждение."""
+        level = "WARNING" if self.count > settings.SQL_QUERIES_WARNING_THRESHOLD else "DEBUG"
+        logger.bind(
+            source=source,
+            query_count=self.count,
+            db_time=self.total_time,
+            slowest_query_time=self.slowest_time,
+            slowest_statement=self.slowest_statement,
+        ).log(
+            level,
+            f"{source}: SQL-запросов {self.count}, время в БД {self.total_time * 1000:.1f} мс, "
+            f"самый медленный {self.slowest_time * 1000:.1f} мс",
+        )
+
+
+_active_stats: ContextVar[tuple[QueryStats, ...]] = ContextVar("active_query_stats", default=())
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Собирать статистику SQL-запросов, выполненных внутри блока (включая вложенные задачи asyncio)."""
+    stats = QueryStats()
+    token = _active_stats.set(_active_stats.get() + (stats,))
+    try:
+        yield stats
+    finally:
+        _active_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    duration = time.perf_counter() - conn.info["query_started_at"].pop()
+    for stats in _active_stats.get():
+        stats.add(statement, duration)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Подключить сбор статистики SQL-запросов к движку БД."""
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
@@ -1,9 +1,13 @@
 from .abstract_repository import AbstractRepository  # noqa
 from .administrator_invitation import AdministratorInvitationRepository  # noqa
 from .administrator_repository import AdministratorRepository  # noqa
+from .bot_forwarded_update_repository import BotForwardedUpdateRepository  # noqa
+from .bot_persistence_repository import BotPersistenceRepository  # noqa
+from .job_run_repository import JobRunRepository  # noqa
 from .member_repository import MemberRepository  # noqa
 from .report_repository import ReportRepository  # noqa
 from .request_repository import RequestRepository  # noqa
 from .shift_repository import ShiftRepository  # noqa
+from .task_delivery_manifest_repository import TaskDeliveryManifestRepository  # noqa
 from .task_repository import TaskRepository  # noqa
 from .user_repository import UserRepository  # noqa
@@ -1,16 +1,39 @@
 import abc
-from typing import Optional, TypeVar
+import copy
+import functools
+from typing import Any, Optional, Sequence, TypeVar
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import String, cast, func, select
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core import exceptions
+from src.core.admin_events import ADMIN_EVENTS_CHANNEL, AdminEvent, make_payload
+from src.core.db.db import get_replica_session, is_replica_available
 
 DatabaseModel = TypeVar("DatabaseModel")
 
 
+def replica_safe(method):
+    """Выполнять запросы метода репозитория на реплике БД, если она настроена.
+
+    Подходит только для методов, которые читают данные и допускают небольшую задержку репликации.
+    """
+
+    @functools.wraps(method)
+    async def _method_wrapper(self, *args, **kwargs):
+        if not is_replica_available():
+            return await method(self, *args, **kwargs)
+        async with get_replica_session() as session:
+            replica_repository = copy.copy(self)
+            replica_repository._session = session
+            return await method(replica_repository, *args, **kwargs)
+
+    return _method_wrapper
+
+
 class AbstractRepository(abc.ABC):
     """Абстрактный класс, для реализации паттерна Repository."""
 
@@ -18,6 +41,23 @@ class AbstractRepository(abc.ABC):
         self._session = session
         self._model = model
 
+    async def publish_admin_event(self, event: AdminEvent, **data: Any) -> None:
+        """Опубликовать событие для администраторов.
+
+        Событие отправляется через NOTIFY без commit: подписчики получат его после commit текущей транзакции,
+        при откате транзакции событие не отправляется.
+        """
+        await self._session.execute(select(func.pg_notify(ADMIN_EVENTS_CHANNEL, make_payload(event, **data))))
+
+    async def publish_admin_events(self, event: AdminEvent, events_data: Sequence[dict[str, Any]]) -> None:
+        """Опубликовать несколько событий для администраторов одним запросом (см. publish_admin_event)."""
+        if not events_data:
+            return
+        payloads = func.unnest(
+            cast([make_payload(event, **data) for data in events_data], ARRAY(String))
+        ).table_valued("payload")
+        await self._session.execute(select(func.pg_notify(ADMIN_EVENTS_CHANNEL, payloads.c.payload)))
+
     async def get_or_none(self, instance_id: UUID) -> Optional[DatabaseModel]:
         """Получает из базы объект модели по ID. В случае отсутствия возвращает None."""
         db_obj = await self._session.execute(select(self._model).where(self._model.id == instance_id))
@@ -1,8 +1,9 @@
 from fastapi import Depends
-from sqlalchemy import or_, select
+from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core import exceptions
+from src.core.administrator_cache import ADMINISTRATOR_CHANGES_CHANNEL
 from src.core.db.db import get_session
 from src.core.db.models import Administrator
 from src.core.db.repository import AbstractRepository
@@ -26,6 +27,14 @@ class AdministratorRepository(AbstractRepository):
             raise exceptions.AdministratorNotFoundError
         return administrator
 
+    async def publish_change(self, email: str) -> None:
+        """Уведомить процессы API об изменении статуса, роли или пароля администратора.
+
+        Уведомление отправляется через NOTIFY без commit, процессы получат его после commit текущей транзакции
+        и сбросят записи администратора в кэше авторизации.
+        """
+        await self._session.execute(select(func.pg_notify(ADMINISTRATOR_CHANGES_CHANNEL, email)))
+
     async def is_administrator_exists(
         self,
         email: str,
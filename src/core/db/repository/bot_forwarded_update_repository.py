@@ -0,0 +1,49 @@
+from typing import Any
+
+from fastapi import Depends
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db.db import get_session
+from src.core.db.models import BotForwardedUpdate
+from src.core.db.repository import AbstractRepository
+
+BOT_UPDATES_CHANNEL = "bot_forwarded_updates"
+
+
+class BotForwardedUpdateRepository(AbstractRepository):
+    """Репозиторий для работы с моделью BotForwardedUpdate."""
+
+    def __init__(self, session: AsyncSession = Depends(get_session)) -> None:
+        super().__init__(session, BotForwardedUpdate)
+
+    async def forward(self, update_id: int, data: dict[str, Any]) -> None:
+        """Сохранить обновление для ведущего процесса и уведомить его через NOTIFY.
+
+        Повторная доставка того же update_id игнорируется.
+        """
+        await self._session.execute(
+            insert(BotForwardedUpdate)
+            .values(update_id=update_id, data=data)
+            .on_conflict_do_nothing(index_elements=[BotForwardedUpdate.update_id])
+        )
+        await self._session.execute(select(func.pg_notify(BOT_UPDATES_CHANNEL, "")))
+        await self._session.commit()
+
+    async def pop_updates(self, limit: int) -> list[dict[str, Any]]:
+        """Забрать не более limit самых ранних обновлений, удалив их из таблицы."""
+        table = BotForwardedUpdate.__table__
+        oldest = (
+            select(table.c.id)
+            .order_by(table.c.update_id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        rows = await self._session.execute(
+            delete(table).where(table.c.id.in_(oldest)).returning(table.c.update_id, table.c.data)
+        )
+        updates = sorted(rows.all(), key=lambda row: row.update_id)
+        await self._session.commit()
+        return [data for _, data in updates]
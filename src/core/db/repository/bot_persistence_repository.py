@@ -0,0 +1,82 @@
+from typing import Any, Iterable
+
+from fastapi import Depends
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db.db import get_session
+from src.core.db.models import BotPersistenceData
+from src.core.db.repository import AbstractRepository
+
+
+class BotPersistenceRepository(AbstractRepository):
+    """Репозиторий для работы с моделью BotPersistenceData."""
+
+    def __init__(self, session: AsyncSession = Depends(get_session)) -> None:
+        super().__init__(session, BotPersistenceData)
+
+    async def get_data(self, data_type: BotPersistenceData.DataType, owner_id: int) -> dict[str, Any]:
+        """Получить все ключи данных владельца (пользователя, чата или бота)."""
+        rows = await self._session.execute(
+            select(BotPersistenceData.key, BotPersistenceData.value).where(
+                BotPersistenceData.data_type == data_type,
+                BotPersistenceData.owner_id == owner_id,
+            )
+        )
+        return dict(rows.all())
+
+    async def get_data_by_key_prefix(
+        self, data_type: BotPersistenceData.DataType, owner_id: int, prefix: str
+    ) -> dict[str, Any]:
+        """Получить ключи данных владельца, начинающиеся с заданного префикса."""
+        rows = await self._session.execute(
+            select(BotPersistenceData.key, BotPersistenceData.value).where(
+                BotPersistenceData.data_type == data_type,
+                BotPersistenceData.owner_id == owner_id,
+                BotPersistenceData.key.startswith(prefix, autoescape=True),
+            )
+        )
+        return dict(rows.all())
+
+    async def save_data(
+        self,
+        data_type: BotPersistenceData.DataType,
+        owner_id: int,
+        changed: dict[str, Any],
+        deleted: Iterable[str] = (),
+    ) -> None:
+        """Сохранить изменённые и удалить удалённые ключи данных владельца одной транзакцией."""
+        if changed:
+            statement = insert(BotPersistenceData).values(
+                [
+                    {"data_type": data_type, "owner_id": owner_id, "key": key, "value": value}
+                    for key, value in changed.items()
+                ]
+            )
+            await self._session.execute(
+                statement.on_conflict_do_update(
+                    constraint="_bot_persistence_key_uc",
+                    set_={"value": statement.excluded.value, "updated_at": statement.excluded.updated_at},
+                )
+            )
+        deleted = list(deleted)
+        if deleted:
+            await self._session.execute(
+                delete(BotPersistenceData).where(
+                    BotPersistenceData.data_type == data_type,
+                    BotPersistenceData.owner_id == owner_id,
+                    BotPersistenceData.key.in_(deleted),
+                )
+            )
+        await self._session.commit()
+
+    async def delete_data(self, data_type: BotPersistenceData.DataType, owner_id: int) -> None:
+        """Удалить все данные владельца."""
+        await self._session.execute(
+            delete(BotPersistenceData).where(
+                BotPersistenceData.data_type == data_type,
+                BotPersistenceData.owner_id == owner_id,
+            )
+        )
+        await self._session.commit()
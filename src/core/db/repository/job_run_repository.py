@@ -0,0 +1,122 @@
+from datetime import datetime
+from typing import Sequence
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db.db import get_session
+from src.core.db.models import JobRun
+from src.core.db.repository import AbstractRepository
+
+
+class JobRunRepository(AbstractRepository):
+    """Репозиторий для работы с моделью JobRun."""
+
+    def __init__(self, session: AsyncSession = Depends(get_session)) -> None:
+        super().__init__(session, JobRun)
+
+    @staticmethod
+    def __is_claimable(lease_expired_before: datetime):
+        """Условие отбора запусков, которые можно выполнить.
+
+        Это запуски, которые не выполнялись, завершились ошибкой или были прерваны
+        (выполняются с момента раньше lease_expired_before).
+        """
+        return or_(
+            JobRun.status.in_([JobRun.Status.PENDING, JobRun.Status.FAILED]),
+            and_(JobRun.status == JobRun.Status.RUNNING, JobRun.started_at < lease_expired_before),
+        )
+
+    async def claim(
+        self, job_name: str, scheduled_at: datetime, next_scheduled_at: datetime, lease_expired_before: datetime
+    ) -> UUID | None:
+        """Занять запуск задачи на запланированное время.
+
+        Записи о запуске и о следующем запуске (next_scheduled_at) создаются в статусе PENDING, если их ещё нет.
+        Запуск переводится в статус RUNNING, если он не выполнялся, завершился ошибкой или был прерван.
+        Если запуск уже выполнен, выполняется или занят другим процессом, возвращается None.
+        """
+        await self._session.execute(
+            insert(JobRun)
+            .values(
+                [
+                    {"job_name": job_name, "scheduled_at": run_scheduled_at, "status": JobRun.Status.PENDING}
+                    for run_scheduled_at in (scheduled_at, next_scheduled_at)
+                ]
+            )
+            .on_conflict_do_nothing(constraint="_job_run_uc")
+        )
+        claimable_run_id = (
+            select(JobRun.id)
+            .where(
+                JobRun.job_name == job_name,
+                JobRun.scheduled_at == scheduled_at,
+                self.__is_claimable(lease_expired_before),
+            )
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        job_run_id = await self._session.scalar(
+            update(JobRun)
+            .where(JobRun.id == claimable_run_id)
+            .values(status=JobRun.Status.RUNNING, started_at=datetime.now(), finished_at=None, error=None)
+            .returning(JobRun.id)
+        )
+        await self._session.commit()
+        return job_run_id
+
+    async def plan(self, scheduled_at_by_job: dict[str, datetime]) -> None:
+        """Создать записи о запусках задач в статусе PENDING, если их ещё нет."""
+        if not scheduled_at_by_job:
+            return
+        await self._session.execute(
+            insert(JobRun)
+            .values(
+                [
+                    {"job_name": job_name, "scheduled_at": scheduled_at, "status": JobRun.Status.PENDING}
+                    for job_name, scheduled_at in scheduled_at_by_job.items()
+                ]
+            )
+            .on_conflict_do_nothing(constraint="_job_run_uc")
+        )
+        await self._session.commit()
+
+    async def get_missed(
+        self, job_names: Sequence[str], since: datetime, until: datetime, lease_expired_before: datetime
+    ) -> Sequence[JobRun]:
+        """Получить запуски задач, запланированные после since и не позже until, которые можно выполнить.
+
+        Запуски упорядочены по запланированному времени.
+        """
+        job_runs = await self._session.scalars(
+            select(JobRun)
+            .where(
+                JobRun.job_name.in_(job_names),
+                JobRun.scheduled_at > since,
+                JobRun.scheduled_at <= until,
+                self.__is_claimable(lease_expired_before),
+            )
+            .order_by(JobRun.scheduled_at, JobRun.job_name)
+        )
+        return job_runs.all()
+
+    async def finish(
+        self, job_run_id: UUID, status: JobRun.Status, rows_affected: int | None = None, error: str | None = None
+    ) -> None:
+        """Записать результат запуска задачи."""
+        await self._session.execute(
+            update(JobRun)
+            .where(JobRun.id == job_run_id)
+            .values(status=status, finished_at=datetime.now(), rows_affected=rows_affected, error=error)
+        )
+        await self._session.commit()
+
+    async def get_recent(self, limit: int) -> Sequence[JobRun]:
+        """Получить последние запуски задач, начиная с самых поздних."""
+        job_runs = await self._session.scalars(
+            select(JobRun).order_by(JobRun.scheduled_at.desc(), JobRun.job_name).limit(limit)
+        )
+        return job_runs.all()
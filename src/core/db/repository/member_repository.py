@@ -1,10 +1,11 @@
 from datetime import datetime
+from typing import AsyncIterator, Sequence
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import func, or_, select
+from sqlalchemy import Row, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload, selectinload, subqueryload
+from sqlalchemy.orm import selectinload
 
 from src.core.db.db import get_session
 from src.core.db.models import Member, Report, Shift, User
@@ -36,44 +37,78 @@ class MemberRepository(AbstractRepository):
             raise ObjectNotFoundError(Member, member_id)
         return member
 
-    async def get_members_for_excluding(self, shift_id: UUID, task_amount: int) -> list[Member]:
-        members = await self._session.scalars(
-            select(Member)
+    async def exclude_lagging_members(self, shift_id: UUID, task_amount: int, time_zone: str) -> Sequence[Row]:
+        """Исключить из смены активных участников из часового пояса, пропустивших task_amount заданий подряд.
+
+        Тестовые пользователи не исключаются. Возвращает строки (member_id, telegram_id) исключённых участников,
+        заблокировавшие бота пользователи в результат не попадают.
+        """
+        members, users = Member.__table__, User.__table__
+        excluded = await self._session.execute(
+            update(members)
             .where(
-                Member.shift_id == shift_id,
-                Member.status == Member.Status.ACTIVE,
-                Report.status == Report.Status.SKIPPED,
-                Report.task_date >= func.current_date() - task_amount,
+                members.c.user_id == users.c.id,
+                members.c.shift_id == shift_id,
+                members.c.status == Member.Status.ACTIVE,
+                members.c.consecutive_skips >= task_amount,
+                users.c.is_test_user == False,  # noqa
+                User.in_time_zone(time_zone),
             )
-            .join(Report)
-            .options(subqueryload(Member.user))
-            .group_by(Member)
-            .having(func.count() >= task_amount)
+            .values(status=Member.Status.EXCLUDED)
+            .returning(members.c.id.label("member_id"), users.c.telegram_id, users.c.telegram_blocked)
         )
-        return members.all()
+        excluded_members = excluded.all()
+        if excluded_members:
+            await self._session.execute(
+                update(Shift)
+                .where(Shift.id == shift_id)
+                .values(active_members_count=Shift.active_members_count - len(excluded_members))
+            )
+        await self._session.commit()
+        return [member for member in excluded_members if not member.telegram_blocked]
 
-    async def get_members_for_reminding(self, shift_id: UUID, current_task_date: datetime.date) -> list[Member]:
-        members = await self._session.execute(
-            select(Member)
-            .options(joinedload(Member.user))
+    async def reset_consecutive_skips(self, member_id: UUID) -> None:
+        """Обнулить счётчик пропущенных подряд заданий участника.
+
+        Изменение выполняется без commit, в той же транзакции, что и изменение статуса отчета.
+        """
+        await self._session.execute(update(Member).where(Member.id == member_id).values(consecutive_skips=0))
+
+    async def increment_consecutive_skips(self, member_id: UUID) -> None:
+        """Увеличить счётчик пропущенных подряд заданий участника.
+
+        Изменение выполняется без commit, в той же транзакции, что и изменение статуса отчета.
+        """
+        await self._session.execute(
+            update(Member)
+            .where(Member.id == member_id)
+            .values(consecutive_skips=Member.consecutive_skips + 1)
+        )
+
+    async def get_members_for_reminding(
+        self, shift_id: UUID, current_task_date: datetime.date, time_zone: str, chunk_size: int
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Порциями по chunk_size возвращает участников из часового пояса, не отправивших отчёт за текущий день.
+
+        Строки (member_id, telegram_id, name, surname, telegram_blocked) читаются через серверный курсор,
+        заблокировавшие бота пользователи не выбираются.
+        """
+        members = await self._session.stream(
+            select(Member.id.label("member_id"), User.telegram_id, User.name, User.surname, User.telegram_blocked)
+            .join(User)
             .join(Report)
             .where(
                 Member.shift_id == shift_id,
                 Member.status == Member.Status.ACTIVE,
                 Report.status == Report.Status.WAITING,
                 Report.task_date == current_task_date,
+                User.telegram_blocked == False,  # noqa
+                User.in_time_zone(time_zone),
             )
+            .execution_options(yield_per=chunk_size)
         )
-        return members.scalars().all()
-
-    async def is_unreviewed_report_exists(self, member_id: UUID) -> bool:
-        """Проверка, есть ли у пользователя непроверенные задания в смене."""
-        stmt = select(Report).where(
-            Report.status == Report.Status.REVIEWING,
-            Report.member_id == member_id,
-        )
-        report_under_review = await self._session.execute(select(stmt.exists()))
-        return report_under_review.scalar()
+        async for chunk in members.partitions():
+            yield chunk
 
     async def get_number_of_lombariers_by_telegram_id(self, telegram_id: int) -> int:
         amount = await self._session.execute(
@@ -89,15 +124,3 @@ class MemberRepository(AbstractRepository):
             )
         )
         return amount.scalars().one_or_none() or 0
-
-    async def get_active_members_for_shift(self, shift_id: UUID) -> list[Member]:
-        """Возвращает активных участников смены."""
-        members = await self._session.scalars(
-            select(Member)
-            .where(
-                Member.shift_id == shift_id,
-                Member.status == Member.Status.ACTIVE,
-            )
-            .options(joinedload(Member.user))
-        )
-        return members.all()
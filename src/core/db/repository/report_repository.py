@@ -1,17 +1,28 @@
-from datetime import timedelta
-from typing import Optional, Sequence
+from datetime import date, datetime
+from typing import Optional
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import desc, exists, select
+from sqlalchemy import Row, Select, cast, desc, func, literal, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core import exceptions
 from src.core.db import DTO_models
 from src.core.db.db import get_session
-from src.core.db.models import Member, Report, Shift, Task, User
+from src.core.db.models import (
+    Member,
+    Report,
+    Shift,
+    ShiftTask,
+    Task,
+    TaskDeliveryManifest,
+    User,
+)
 from src.core.db.repository import AbstractRepository
-from src.core.utils import get_current_task_date
+from src.core.db.repository.abstract_repository import replica_safe
+from src.core.settings import settings
+from src.core.utils import get_current_task_date, get_user_time_zone
 
 
 class ReportRepository(AbstractRepository):
@@ -36,45 +47,138 @@ class ReportRepository(AbstractRepository):
         await self._session.commit()
         return reports_list
 
+    async def create_daily_reports_from_manifest(self, task_date: date, time_zone: str) -> None:
+        """Создать отчеты в статусе waiting на task_date для активных участников из манифеста рассылки."""
+        reports = (
+            select(
+                func.gen_random_uuid(),
+                TaskDeliveryManifest.shift_id,
+                TaskDeliveryManifest.task_id,
+                TaskDeliveryManifest.member_id,
+                TaskDeliveryManifest.task_date,
+                cast(literal(Report.Status.WAITING.value), Report.status.type),
+            )
+            .join(Member, Member.id == TaskDeliveryManifest.member_id)
+            .where(
+                TaskDeliveryManifest.task_date == task_date,
+                TaskDeliveryManifest.time_zone == time_zone,
+                Member.status == Member.Status.ACTIVE,
+            )
+        )
+        await self._session.execute(
+            insert(Report)
+            .from_select(["id", "shift_id", "task_id", "member_id", "task_date", "status"], reports)
+            .on_conflict_do_nothing(constraint="_member_task_uc")
+        )
+        await self._session.commit()
+
+    async def create_not_participated_reports(self, member_id: UUID, shift_id: UUID, until_date: date) -> None:
+        """Создать отчеты в статусе not_participate участнику за дни смены по until_date включительно."""
+        reports = select(
+            func.gen_random_uuid(),
+            ShiftTask.shift_id,
+            ShiftTask.task_id,
+            literal(member_id),
+            ShiftTask.task_date,
+            cast(literal(Report.Status.NOT_PARTICIPATE.value), Report.status.type),
+        ).where(ShiftTask.shift_id == shift_id, ShiftTask.task_date <= until_date)
+        await self._session.execute(
+            insert(Report)
+            .from_select(["id", "shift_id", "task_id", "member_id", "task_date", "status"], reports)
+            .on_conflict_do_nothing(constraint="_member_task_uc")
+        )
+        await self._session.commit()
+
+    @staticmethod
+    def __select_summaries() -> Select:
+        """Запрос отчетов участников с данными смены, участника, задания и url фото выполненного задания."""
+        return (
+            select(
+                Shift.id,
+                Shift.status,
+                Shift.started_at,
+                Report.id,
+                Report.status,
+                Report.created_at,
+                Report.uploaded_at,
+                Report.updated_by,
+                Report.reviewed_at,
+                User.name,
+                User.surname,
+                Report.task_id,
+                Task.title,
+                Task.url,
+                Report.report_url.label("photo_url"),
+            )
+            .select_from(Report)
+            .join(Shift, Report.shift_id == Shift.id)
+            .join(Member, Report.member_id == Member.id)
+            .join(User, Member.user_id == User.id)
+            .join(Task, Report.task_id == Task.id)
+        )
+
+    @replica_safe
     async def get_summaries_of_reports(self, shift_id: UUID, status: Report.Status) -> list[DTO_models.FullReportDto]:
         """Получить отчеты участников по id смены с url фото выполненного задания."""
-        stmt = select(
-            Shift.id,
-            Shift.status,
-            Shift.started_at,
-            Report.id,
-            Report.status,
-            Report.created_at,
-            Report.uploaded_at,
-            Report.updated_by,
-            Report.reviewed_at,
-            User.name,
-            User.surname,
-            Report.task_id,
-            Task.title,
-            Task.url,
-            Report.report_url.label("photo_url"),
-        )
+        stmt = self.__select_summaries()
         if shift_id:
             stmt = stmt.where(Report.shift_id == shift_id)
         if status:
             stmt = stmt.where(Report.status == status)
-        stmt = stmt.join(Shift).join(Member).join(User).join(Task).order_by(desc(Shift.started_at))
-        stmt = stmt.where(
-            Report.shift_id == Shift.id,
-            Report.member_id == Member.id,
-            Report.task_id == Task.id,
-            Member.user_id == User.id,
-        )
-        reports = await self._session.execute(stmt)
+        reports = await self._session.execute(stmt.order_by(desc(Shift.started_at)))
         return [DTO_models.FullReportDto(*report) for report in reports.all()]
 
+    async def claim_for_review(
+        self, administrator_id: UUID, limit: int, shift_id: Optional[UUID] = None
+    ) -> list[DTO_models.FullReportDto]:
+        """Закрепить за администратором до limit отчетов на проверке в порядке их отправки.
+
+        Берутся свободные отчеты, отчеты с истёкшим временем закрепления и отчеты, уже закреплённые за
+        администратором (время их закрепления продлевается). Строки, которые в этот момент закрепляет другой
+        администратор, пропускаются (FOR UPDATE SKIP LOCKED), поэтому администраторы не получают одни и те же отчеты.
+        """
+        now = datetime.now()
+        reports = Report.__table__
+        claimable_reports = (
+            select(reports.c.id, reports.c.shift_id)
+            .where(
+                reports.c.status == Report.Status.REVIEWING,
+                or_(
+                    reports.c.claimed_by.is_(None),
+                    reports.c.claimed_by == administrator_id,
+                    reports.c.claim_expires_at < now,
+                ),
+            )
+            .order_by(reports.c.uploaded_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if shift_id:
+            claimable_reports = claimable_reports.where(reports.c.shift_id == shift_id)
+        claimed_reports = (
+            update(reports)
+            .where(tuple_(reports.c.id, reports.c.shift_id).in_(claimable_reports))
+            .values(claimed_by=administrator_id, claim_expires_at=now + settings.REPORT_REVIEW_LEASE_TIME)
+            .returning(reports.c.id)
+            .cte("claimed_reports")
+        )
+        claimed = await self._session.execute(
+            self.__select_summaries()
+            .where(Report.id.in_(select(claimed_reports.c.id)))
+            .order_by(Report.uploaded_at)
+            .add_cte(claimed_reports)
+        )
+        claimed = [DTO_models.FullReportDto(*report) for report in claimed.all()]
+        await self._session.commit()
+        return claimed
+
     async def get_current_report(self, user_id: UUID) -> Report:
         """Получить текущий отчет по id пользователя."""
+        city = await self._session.scalar(select(User.city).where(User.id == user_id))
         reports = await self._session.execute(
             select(Report).where(
                 Report.member_id.in_(select(Member.id).where(Member.user_id == user_id)),
-                Report.task_date == get_current_task_date(),
+                Report.task_date == get_current_task_date(get_user_time_zone(city)),
             )
         )
         report = reports.scalars().first()
@@ -82,25 +186,78 @@ class ReportRepository(AbstractRepository):
             raise exceptions.CurrentTaskNotFoundError()
         return report
 
-    async def get_waiting_reports(self) -> Sequence[Report]:
-        reports = await self._session.execute(select(Report).where(Report.status == Report.Status.WAITING))
-        return reports.scalars().all()
+    async def set_reviewed(self, report: Report, status: Report.Status, administrator_id: UUID) -> Report:
+        """Перевести отчет в статус status проверенным администратором и снять закрепление отчета.
 
-    async def set_status_to_reports(self, reports_list: Sequence[Report], status: Report.Status) -> None:
-        for report in reports_list:
-            report.status = status
-        self._session.add_all(reports_list)
-        await self._session.commit()
+        Статус изменяется, только если он не изменился с момента чтения отчета: из двух одновременных проверок
+        отчет изменит только одна, вторая получит ReportAlreadyReviewedError.
+        Изменение выполняется без commit, в той же транзакции, что и изменение счётчиков отчетов на проверке.
+        """
+        reviewed = await self._session.execute(
+            update(Report)
+            .where(Report.id == report.id, Report.status == report.status)
+            .values(
+                status=status,
+                updated_by=administrator_id,
+                reviewed_at=datetime.now(),
+                claimed_by=None,
+                claim_expires_at=None,
+            )
+            .returning(Report)
+        )
+        reviewed = reviewed.scalars().first()
+        if reviewed is None:
+            raise exceptions.ReportAlreadyReviewedError
+        return reviewed
 
-    async def is_previous_report_not_submitted(self, member_id: UUID) -> bool:
-        """Проверить статус вчерашнего отчета по id участника смены."""
-        yesterday = get_current_task_date() - timedelta(days=1)
-        exists_criteria = select(
-            exists(Report).where(
-                Report.member_id == member_id,
-                Report.task_date == yesterday,
-                Report.status.in_([Report.Status.DECLINED, Report.Status.SKIPPED]),
+    async def change_reviewing_reports_count(self, member_id: UUID, shift_id: UUID, delta: int) -> Row:
+        """Изменить на delta счётчики отчетов на проверке участника и смены одним запросом.
+
+        Изменение выполняется без commit, в той же транзакции, что и изменение статуса отчета.
+        Возвращает строку (member_reviewing_reports, shift_reviewing_reports, shift_status) после изменения.
+        """
+        members, shifts = Member.__table__, Shift.__table__
+        member_counter = (
+            update(members)
+            .where(members.c.id == member_id)
+            .values(reviewing_reports_count=members.c.reviewing_reports_count + delta)
+            .returning(members.c.reviewing_reports_count)
+            .cte("member_counter")
+        )
+        counters = await self._session.execute(
+            update(shifts)
+            .where(shifts.c.id == shift_id)
+            .values(reviewing_reports_count=shifts.c.reviewing_reports_count + delta)
+            .returning(
+                select(member_counter.c.reviewing_reports_count).scalar_subquery().label("member_reviewing_reports"),
+                shifts.c.reviewing_reports_count.label("shift_reviewing_reports"),
+                shifts.c.status.label("shift_status"),
+            )
+            .add_cte(member_counter)
+        )
+        return counters.one()
+
+    async def skip_waiting_reports(self, time_zone: str, before: date) -> None:
+        """Перевести в статус skipped отчеты в статусе waiting за даты до before участников из часового пояса.
+
+        Участникам с пропущенными отчетами увеличивается счетчик пропущенных подряд заданий.
+        Отчеты на дату before не изменяются, поэтому повторный запуск рассылки не пропускает текущие отчеты.
+        """
+        reports = Report.__table__
+        skipped_reports = (
+            update(reports)
+            .where(
+                reports.c.status == Report.Status.WAITING,
+                reports.c.task_date < before,
+                reports.c.member_id.in_(select(Member.id).join(User).where(User.in_time_zone(time_zone))),
             )
+            .values(status=Report.Status.SKIPPED)
+            .returning(reports.c.member_id)
+            .cte("skipped_reports")
         )
-        report_exists = await self._session.execute(exists_criteria)
-        return report_exists.scalar()
+        await self._session.execute(
+            update(Member)
+            .where(Member.id.in_(select(skipped_reports.c.member_id)))
+            .values(consecutive_skips=Member.consecutive_skips + 1)
+        )
+        await self._session.commit()
@@ -1,15 +1,19 @@
+from collections import Counter
+from datetime import date
 from http import HTTPStatus
-from typing import Optional
+from typing import Optional, Sequence
 from uuid import UUID
 
 from fastapi import Depends, HTTPException
-from sqlalchemy import or_, select
+from sqlalchemy import Row, and_, cast, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from src.core.admin_events import AdminEvent
 from src.core.db.db import get_session
 from src.core.db.DTO_models import RequestDTO
-from src.core.db.models import Request, User
+from src.core.db.models import Member, Report, Request, Shift, ShiftTask, User
 from src.core.db.repository import AbstractRepository
 
 
@@ -59,3 +63,160 @@ class RequestRepository(AbstractRepository):
         )
         requests = await self._session.execute(statement)
         return [RequestDTO.parse_from_db(request) for request in requests.all()]
+
+    async def decline_pending_of_shift(self, shift_id: UUID) -> Sequence[Row]:
+        """Отклонить заявки смены на рассмотрении и пользователей этих заявок, ожидающих решения.
+
+        Все изменения, включая счётчик заявок смены на рассмотрении, выполняются одним запросом.
+        Возвращает telegram_id, name, surname и telegram_blocked всех пользователей, подавших заявку в смену.
+        """
+        requests, users, shifts = Request.__table__, User.__table__, Shift.__table__
+        shift_user_ids = select(requests.c.user_id).where(requests.c.shift_id == shift_id)
+        declined_requests = (
+            update(requests)
+            .where(requests.c.shift_id == shift_id, requests.c.status == Request.Status.PENDING)
+            .values(status=Request.Status.DECLINED)
+            .returning(requests.c.id)
+            .cte("declined_requests")
+        )
+        declined_users = (
+            update(users)
+            .where(users.c.id.in_(shift_user_ids), users.c.status == User.Status.PENDING)
+            .values(status=User.Status.DECLINED)
+            .returning(users.c.id)
+            .cte("declined_users")
+        )
+        shift_counters = (
+            update(shifts)
+            .where(shifts.c.id == shift_id)
+            .values(
+                pending_requests_count=shifts.c.pending_requests_count
+                - select(func.count()).select_from(declined_requests).scalar_subquery()
+            )
+            .returning(shifts.c.id)
+            .cte("shift_counters")
+        )
+        shift_users = await self._session.execute(
+            select(users.c.telegram_id, users.c.name, users.c.surname, users.c.telegram_blocked)
+            .where(users.c.id.in_(shift_user_ids))
+            .add_cte(declined_requests, declined_users, shift_counters)
+        )
+        await self._session.commit()
+        return shift_users.all()
+
+    async def approve_pending(
+        self, request_ids: Sequence[UUID], not_participated_until: dict[str, date]
+    ) -> Sequence[Row]:
+        """Одобрить заявки, которые ещё на рассмотрении. Уже рассмотренные заявки пропускаются.
+
+        Для одобренных заявок создаются участники смен, пользователи становятся verified и у них
+        пересчитывается количество смен, изменяются счётчики смен. Участникам уже начатых смен
+        создаются отчеты в статусе not_participate за дни смены по дату из not_participated_until для
+        часового пояса пользователя включительно.
+        Все изменения и события для администраторов об одобренных заявках выполняются в одной транзакции,
+        количество запросов не зависит от числа заявок.
+
+        Возвращает строки одобренных заявок с данными пользователей и смен.
+        """
+        approved = await self._session.execute(
+            update(Request)
+            .where(Request.id.in_(request_ids), Request.status == Request.Status.PENDING)
+            .values(status=Request.Status.APPROVED)
+            .returning(Request.id, Request.user_id, Request.shift_id)
+        )
+        approved = approved.all()
+        if not approved:
+            await self._session.commit()
+            return approved
+        new_members = await self._session.execute(
+            insert(Member)
+            .values([{"user_id": request.user_id, "shift_id": request.shift_id} for request in approved])
+            .on_conflict_do_nothing(constraint="_user_shift_uc")
+            .returning(Member.id, Member.shift_id)
+        )
+        new_members = new_members.all()
+        new_member_ids = [member.id for member in new_members]
+        approved_by_shift = Counter(request.shift_id for request in approved)
+        new_members_by_shift = Counter(member.shift_id for member in new_members)
+        for shift_id, approved_count in approved_by_shift.items():
+            await self._session.execute(
+                update(Shift)
+                .where(Shift.id == shift_id)
+                .values(
+                    pending_requests_count=Shift.pending_requests_count - approved_count,
+                    members_count=Shift.members_count + new_members_by_shift[shift_id],
+                    active_members_count=Shift.active_members_count + new_members_by_shift[shift_id],
+                )
+            )
+        await self._session.execute(
+            update(User)
+            .where(User.id.in_({request.user_id for request in approved}))
+            .values(
+                status=User.Status.VERIFIED,
+                shifts_count=select(func.count(Member.id)).where(Member.user_id == User.id).scalar_subquery(),
+            )
+        )
+        not_participated_reports = (
+            select(
+                func.gen_random_uuid(),
+                ShiftTask.shift_id,
+                ShiftTask.task_id,
+                Member.id,
+                ShiftTask.task_date,
+                cast(literal(Report.Status.NOT_PARTICIPATE.value), Report.status.type),
+            )
+            .join(Member, Member.shift_id == ShiftTask.shift_id)
+            .join(Shift, Shift.id == ShiftTask.shift_id)
+            .join(User, User.id == Member.user_id)
+            .where(
+                Member.id.in_(new_member_ids),
+                Shift.status == Shift.Status.STARTED,
+                or_(
+                    *(
+                        and_(User.in_time_zone(time_zone), ShiftTask.task_date <= until_date)
+                        for time_zone, until_date in not_participated_until.items()
+                    )
+                ),
+            )
+        )
+        await self._session.execute(
+            insert(Report)
+            .from_select(
+                ["id", "shift_id", "task_id", "member_id", "task_date", "status"], not_participated_reports
+            )
+            .on_conflict_do_nothing(constraint="_member_task_uc")
+        )
+        approved_requests = await self._session.execute(
+            select(
+                Request.id.label("request_id"),
+                Request.user_id,
+                User.name,
+                User.surname,
+                User.date_of_birth,
+                User.city,
+                User.phone_number,
+                User.telegram_id,
+                User.telegram_blocked,
+                Request.status.label("request_status"),
+                User.status.label("user_status"),
+                Shift.sequence_number.label("shift_sequence_number"),
+                Shift.started_at.label("shift_started_at"),
+            )
+            .join(Request.user)
+            .join(Request.shift)
+            .where(Request.id.in_([request.id for request in approved]))
+        )
+        await self.publish_admin_events(
+            AdminEvent.REQUEST_REVIEWED,
+            [
+                {
+                    "request_id": request.id,
+                    "shift_id": request.shift_id,
+                    "user_id": request.user_id,
+                    "status": Request.Status.APPROVED,
+                }
+                for request in approved
+            ],
+        )
+        await self._session.commit()
+        return approved_requests.all()
@@ -1,9 +1,10 @@
 from datetime import date, timedelta
-from typing import Optional
+from typing import AsyncIterator, Optional, Sequence
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import and_, func, or_, select
+from sqlalchemy import Row, and_, delete, func, or_, select, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload, subqueryload
 
@@ -12,8 +13,9 @@ from src.api.response_models.shift import ShiftDtoResponse
 from src.core import exceptions
 from src.core.db.db import get_session
 from src.core.db.DTO_models import ShiftAnalyticReportDto
-from src.core.db.models import Member, Report, Request, Shift, Task, User
+from src.core.db.models import Member, Report, Request, Shift, ShiftTask, Task, User
 from src.core.db.repository import AbstractRepository
+from src.core.db.repository.abstract_repository import replica_safe
 from src.core.settings import settings
 
 
@@ -69,6 +71,7 @@ class ShiftRepository(AbstractRepository):
         )
         return db_list_request.all()
 
+    @replica_safe
     async def get_shifts_with_total_users(
         self,
         status: Optional[list[Shift.Status]],
@@ -83,16 +86,71 @@ class ShiftRepository(AbstractRepository):
                 Shift.title,
                 Shift.final_message,
                 Shift.sequence_number,
-                func.count(Member.user_id).label('total_users'),
+                Shift.members_count.label('total_users'),
+                Shift.active_members_count.label('active_users'),
+                Shift.pending_requests_count.label('pending_requests'),
+                Shift.reviewing_reports_count.label('reviewing_reports'),
             )
-            .outerjoin(Shift.members)
-            .group_by(Shift.id)
             .where(status is None or Shift.status.in_(status))
             .order_by(sort or Shift.started_at.desc())
         )
         shifts = await self._session.execute(shifts)
         return shifts.all()
 
+    async def change_counters(self, shift_id: UUID, **deltas: int) -> None:
+        """Изменить счётчики смены на указанные величины, например pending_requests_count=-1.
+
+        Изменение выполняется без commit: оно сохраняется в той же транзакции, что и изменение данных,
+        которое его вызвало.
+        """
+        await self._session.execute(
+            update(Shift)
+            .where(Shift.id == shift_id)
+            .values({counter: getattr(Shift, counter) + delta for counter, delta in deltas.items()})
+        )
+
+    async def repair_counters(self) -> Sequence[Row]:
+        """Пересчитать счётчики всех смен, счётчики отчетов на проверке участников и количество смен пользователей.
+
+        Возвращает id, порядковый номер и пересчитанные счётчики смен, у которых счётчики расходились с данными.
+        """
+        member_reviewing_reports = (
+            select(func.count(Report.id))
+            .where(Report.member_id == Member.id, Report.status == Report.Status.REVIEWING)
+            .scalar_subquery()
+        )
+        await self._session.execute(
+            update(Member)
+            .where(Member.reviewing_reports_count != member_reviewing_reports)
+            .values(reviewing_reports_count=member_reviewing_reports)
+        )
+        user_shifts = select(func.count(Member.id)).where(Member.user_id == User.id).scalar_subquery()
+        await self._session.execute(
+            update(User).where(User.shifts_count != user_shifts).values(shifts_count=user_shifts)
+        )
+        counters = {
+            "members_count": select(func.count(Member.id)).where(Member.shift_id == Shift.id),
+            "active_members_count": select(func.count(Member.id)).where(
+                Member.shift_id == Shift.id, Member.status == Member.Status.ACTIVE
+            ),
+            "pending_requests_count": select(func.count(Request.id)).where(
+                Request.shift_id == Shift.id, Request.status == Request.Status.PENDING
+            ),
+            "reviewing_reports_count": select(func.count(Report.id)).where(
+                Report.shift_id == Shift.id, Report.status == Report.Status.REVIEWING
+            ),
+        }
+        counters = {counter: count.scalar_subquery() for counter, count in counters.items()}
+        counter_columns = [getattr(Shift, counter) for counter in counters]
+        repaired = await self._session.execute(
+            update(Shift)
+            .where(tuple_(*counter_columns).is_distinct_from(tuple_(*counters.values())))
+            .values(counters)
+            .returning(Shift.id, Shift.sequence_number, *counter_columns)
+        )
+        await self._session.commit()
+        return repaired.all()
+
     async def get_open_for_registration_shift_id(self) -> UUID:
         can_be_added_to_active_shift = (
             Shift.started_at + timedelta(days=settings.DAYS_FROM_START_OF_SHIFT_TO_JOIN) >= date.today()
@@ -114,61 +172,97 @@ class ShiftRepository(AbstractRepository):
         statement = select(Shift).where(Shift.status == status)
         return (await self._session.scalars(statement)).first()
 
-    async def get_shift_with_request(self, id: UUID) -> Shift:
-        """Получить смену (Shift) по её id вместе со связанными данными.
+    async def get_shifts_with_status(self, status: Shift.Status) -> list[Shift]:
+        """Возвращает все смены с заданным статусом."""
+        statement = select(Shift).where(Shift.status == status).order_by(Shift.sequence_number)
+        return (await self._session.scalars(statement)).all()
 
-        Связанные данные: Shift -> Request.
+    async def check_shift_existence(self, shift_id: UUID) -> bool:
+        shift_exists = await self._session.execute(select(select(Shift).where(Shift.id == shift_id).exists()))
+        return shift_exists.scalar()
+
+    async def get_members_for_finish_notification(
+        self,
+        shift_id: UUID,
+        chunk_size: int,
+        member_ids: Optional[Sequence[UUID]] = None,
+        without_reports_under_review: bool = False,
+    ) -> AsyncIterator[Sequence[Row]]:
+        """Порциями по chunk_size возвращает активных участников смены для уведомления об её окончании.
+
+        Строки (telegram_id, name, surname, numbers_lombaryers, telegram_blocked) читаются через серверный курсор,
+        отчёты участников не загружаются.
 
         Аргументы:
-            id (UUID) - id смены (shift)
+            shift_id (UUID) - id смены
+            chunk_size (int) - количество участников в порции
+            member_ids (Optional[Sequence[UUID]]) - выбрать только участников с указанными id
+            without_reports_under_review (bool) - выбрать только участников, у которых все задания проверены
         """
-        statement = select(Shift).where(Shift.id == id).options(selectinload(Shift.requests))
-        request = await self._session.execute(statement)
-        request = request.scalars().first()
-        if request is None:
-            raise exceptions.ObjectNotFoundError(Shift, id)
-        return request
+        statement = (
+            select(User.telegram_id, User.name, User.surname, Member.numbers_lombaryers, User.telegram_blocked)
+            .select_from(Member)
+            .join(User)
+            .where(Member.shift_id == shift_id, Member.status == Member.Status.ACTIVE)
+        )
+        if member_ids is not None:
+            statement = statement.where(Member.id.in_(member_ids))
+        if without_reports_under_review:
+            statement = statement.where(Member.reviewing_reports_count == 0)
+        members = await self._session.stream(statement.execution_options(yield_per=chunk_size))
+        async for chunk in members.partitions():
+            yield chunk
 
-    async def check_shift_existence(self, shift_id: UUID) -> bool:
-        shift_exists = await self._session.execute(select(select(Shift).where(Shift.id == shift_id).exists()))
-        return shift_exists.scalar()
+    async def get_scheduled_task_dates(self, shift_id: UUID) -> set[date]:
+        """Даты, на которые в смене уже назначены задания."""
+        task_dates = await self._session.execute(select(ShiftTask.task_date).where(ShiftTask.shift_id == shift_id))
+        return set(task_dates.scalars().all())
 
-    async def get_with_members_with_reviewed_reports(self, shift_id: UUID) -> Shift:
-        """Возвращает смену с активными участниками, у которых все задания проверены."""
-        members_id = (
-            select(Member.id)
-            .join(Report)
-            .where(
-                Member.shift_id == shift_id,
-                Member.status == Member.Status.ACTIVE,
-                Report.member_id == Member.id,
-                Report.status == Report.Status.REVIEWING,
+    async def schedule_tasks(self, shift_id: UUID, schedule: dict[date, UUID]) -> None:
+        """Назначить задания смены на даты. Уже назначенные даты не изменяются.
+
+        Аргументы:
+            shift_id (UUID) - id смены
+            schedule (dict[date, UUID]) - id задания на каждую дату
+        """
+        if schedule:
+            await self._session.execute(
+                insert(ShiftTask)
+                .values(
+                    [
+                        {"shift_id": shift_id, "task_date": task_date, "task_id": task_id}
+                        for task_date, task_id in schedule.items()
+                    ]
+                )
+                .on_conflict_do_nothing(constraint="_shift_task_date_uc")
+            )
+        await self._session.commit()
+
+    async def create_reports_partition(self, shift_id: UUID) -> None:
+        """Создать секцию таблицы отчётов для смены, если её ещё нет."""
+        await self._session.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {Report.partition_name(shift_id)} "
+                f"PARTITION OF {Report.__tablename__} FOR VALUES IN ('{shift_id}')"
             )
-            .group_by(Member.id)
-            .subquery()
         )
-        shift = await self._session.execute(
-            select(Shift)
-            .where(Shift.id == shift_id)
-            .options(subqueryload(Shift.members.and_(Member.id.notin_(members_id))).subqueryload(Member.user))
+        await self._session.commit()
+
+    async def unschedule_tasks_outside(self, shift_id: UUID, started_at: date, finished_at: date) -> None:
+        """Удалить из расписания смены задания на даты вне периода с started_at по finished_at."""
+        await self._session.execute(
+            delete(ShiftTask).where(
+                ShiftTask.shift_id == shift_id,
+                or_(ShiftTask.task_date < started_at, ShiftTask.task_date > finished_at),
+            )
         )
-        return shift.scalars().first()
+        await self._session.commit()
 
     async def get_with_members_and_unreviewed_reports(self, shift_id: UUID) -> Shift:
         """Возвращает смену с активными участниками и их непроверенными заданиями."""
-        members_id = (
-            select(Member.id)
-            .join(Report)
-            .where(
-                Member.shift_id == shift_id,
-                Member.status == Member.Status.ACTIVE,
-                Report.member_id == Member.id,
-                Report.status == Report.Status.REVIEWING,
-            )
-            .group_by(Member.id)
-            .subquery()
+        member_stmt = Shift.members.and_(
+            Member.status == Member.Status.ACTIVE, Member.reviewing_reports_count > 0
         )
-        member_stmt = Shift.members.and_(Member.id.in_(members_id))
         shift = await self._session.execute(
             select(Shift)
             .where(Shift.id == shift_id)
@@ -179,11 +273,20 @@ class ShiftRepository(AbstractRepository):
         )
         return shift.scalars().first()
 
-    async def is_unreviewed_report_exists(self, shift_id: UUID) -> bool:
-        """Проверяет, остались ли непроверенные задачи в смене."""
-        stmt = select(Report).where(Report.status == Report.Status.REVIEWING, Report.shift_id == shift_id)
-        report_under_review = await self._session.execute(select(stmt.exists()))
-        return report_under_review.scalar()
+    async def finish_if_reviewed(self, shift_id: UUID) -> None:
+        """Закрыть приготовленную к закрытию смену, если в ней не осталось отчетов на проверке.
+
+        Изменение выполняется без commit, в той же транзакции, что и проверка последнего отчета.
+        """
+        await self._session.execute(
+            update(Shift)
+            .where(
+                Shift.id == shift_id,
+                Shift.status == Shift.Status.READY_FOR_COMPLETE,
+                Shift.reviewing_reports_count == 0,
+            )
+            .values(status=Shift.Status.FINISHED)
+        )
 
     async def get_active_or_complete_shift(self) -> Optional[Shift]:
         """Возвращает активную смену или смену, приготовленную к закрытию."""
@@ -195,16 +298,26 @@ class ShiftRepository(AbstractRepository):
         )
         return (await self._session.scalars(statement)).first()
 
-    async def get_preparing_shift_with_started_at_today(self) -> Optional[Shift]:
-        """Возвращает смену, если смена имеет статус preparing и дата старта совпадает с текущим днём."""
+    async def get_shift_for_task_date(self, task_date: date) -> Optional[Shift]:
+        """Возвращает стартовавшую или готовящуюся смену, в период которой входит task_date."""
+        statement = select(Shift).where(
+            Shift.status.in_([Shift.Status.STARTED, Shift.Status.PREPARING]),
+            Shift.started_at <= task_date,
+            Shift.finished_at >= task_date,
+        )
+        return await self._session.scalar(statement)
+
+    async def get_preparing_shift_with_started_at(self, started_at: date) -> Optional[Shift]:
+        """Возвращает смену, если смена имеет статус preparing и дата старта совпадает с started_at."""
         statement = select(Shift).where(
             and_(
                 Shift.status == Shift.Status.PREPARING,
-                Shift.started_at == date.today(),
+                Shift.started_at == started_at,
             ),
         )
         return await self._session.scalar(statement)
 
+    @replica_safe
     async def get_shift_statistics_report_by_id(self, shift_id: UUID):
         """Отчёт по задачам из выбранной смены.
 
@@ -235,10 +348,3 @@ class ShiftRepository(AbstractRepository):
         )
         reports = await self._session.execute(stmt)
         return tuple(ShiftAnalyticReportDto(*report) for report in reports.all())
-
-    async def get_all_reports_of_member(self, shift_id: UUID, member_id: UUID) -> list[Report]:
-        stmt = (
-            select(Report).where(Report.shift_id == shift_id, Report.member_id == member_id).order_by(Report.task_date)
-        )
-        reports = await self._session.execute(stmt)
-        return reports.scalars().all()
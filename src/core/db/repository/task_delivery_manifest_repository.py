@@ -0,0 +1,102 @@
+from datetime import date, datetime, timedelta
+from typing import Sequence
+from uuid import UUID
+
+from fastapi import Depends
+from sqlalchemy import Row, case, delete, exists, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.db.db import get_session
+from src.core.db.models import Member, Report, TaskDeliveryManifest, User
+from src.core.db.repository import AbstractRepository
+
+
+class TaskDeliveryManifestRepository(AbstractRepository):
+    """Репозиторий для работы с моделью TaskDeliveryManifest."""
+
+    def __init__(self, session: AsyncSession = Depends(get_session)) -> None:
+        super().__init__(session, TaskDeliveryManifest)
+
+    async def get_members_without_manifest(self, shift_id: UUID, task_date: date, time_zone: str) -> Sequence[Row]:
+        """Активные участники смены из часового пояса, для которых ещё нет записи манифеста на task_date.
+
+        Возвращает строки (member_id, telegram_id, name).
+        """
+        members = await self._session.execute(
+            select(Member.id.label("member_id"), User.telegram_id, User.name)
+            .join(User)
+            .where(
+                Member.shift_id == shift_id,
+                Member.status == Member.Status.ACTIVE,
+                User.in_time_zone(time_zone),
+                ~exists().where(
+                    TaskDeliveryManifest.member_id == Member.id,
+                    TaskDeliveryManifest.task_date == task_date,
+                ),
+            )
+        )
+        return members.all()
+
+    async def create_all(self, manifests: list[dict]) -> None:
+        """Сохранить записи манифеста. Уже существующие записи (участник, дата) не перезаписываются."""
+        await self._session.execute(
+            insert(TaskDeliveryManifest)
+            .values(manifests)
+            .on_conflict_do_nothing(constraint="_manifest_member_task_date_uc")
+        )
+        await self._session.commit()
+
+    async def get_undelivered(self, task_date: date, time_zone: str, limit: int) -> Sequence[Row]:
+        """Возвращает до limit готовых к отправке и ещё не доставленных сообщений с заданием.
+
+        Строки (id, telegram_id, photo_url, text, telegram_blocked), где id - id записи манифеста.
+        Вариант текста выбирается по статусу вчерашнего отчёта, исключённые участники и заблокировавшие бота
+        пользователи не выбираются.
+        """
+        previous_report_missed = exists().where(
+            Report.member_id == TaskDeliveryManifest.member_id,
+            Report.task_date == task_date - timedelta(days=1),
+            Report.status.in_([Report.Status.DECLINED, Report.Status.SKIPPED]),
+        )
+        deliveries = await self._session.execute(
+            select(
+                TaskDeliveryManifest.id,
+                TaskDeliveryManifest.telegram_id,
+                TaskDeliveryManifest.photo_url,
+                case(
+                    (previous_report_missed, TaskDeliveryManifest.missed_text), else_=TaskDeliveryManifest.text
+                ).label("text"),
+                User.telegram_blocked,
+            )
+            .join(Member, Member.id == TaskDeliveryManifest.member_id)
+            .join(User)
+            .where(
+                TaskDeliveryManifest.task_date == task_date,
+                TaskDeliveryManifest.time_zone == time_zone,
+                TaskDeliveryManifest.delivered_at.is_(None),
+                Member.status == Member.Status.ACTIVE,
+                User.telegram_blocked == False,  # noqa
+            )
+            .limit(limit)
+        )
+        return deliveries.all()
+
+    async def mark_delivered(self, manifest_ids: Sequence[UUID]) -> None:
+        """Отметить записи манифеста как доставленные."""
+        await self._session.execute(
+            update(TaskDeliveryManifest)
+            .where(TaskDeliveryManifest.id.in_(manifest_ids))
+            .values(delivered_at=datetime.now())
+        )
+        await self._session.commit()
+
+    async def delete_before(self, task_date: date, time_zone: str) -> None:
+        """Удалить записи манифеста часового пояса за даты до task_date."""
+        await self._session.execute(
+            delete(TaskDeliveryManifest).where(
+                TaskDeliveryManifest.task_date < task_date,
+                TaskDeliveryManifest.time_zone == time_zone,
+            )
+        )
+        await self._session.commit()
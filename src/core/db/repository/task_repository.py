@@ -1,3 +1,5 @@
+from datetime import date
+from typing import Optional
 from uuid import UUID
 
 from fastapi import Depends
@@ -6,8 +8,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.core.db.db import get_session
 from src.core.db.DTO_models import TasksAnalyticReportDto
-from src.core.db.models import Report, Task, User, Member
+from src.core.db.models import Member, Report, ShiftTask, Task, User
 from src.core.db.repository import AbstractRepository
+from src.core.db.repository.abstract_repository import replica_safe
 
 
 class TaskRepository(AbstractRepository):
@@ -21,6 +24,16 @@ class TaskRepository(AbstractRepository):
         task_ids = await self._session.execute(select(Task.id).where(Task.is_archived.is_(False)))
         return task_ids.scalars().all()
 
+    async def get_task_for_date(self, shift_id: UUID, task_date: date) -> Optional[Task]:
+        """Задание, назначенное в смене на дату task_date."""
+        task = await self._session.execute(
+            select(Task)
+            .join(ShiftTask, ShiftTask.task_id == Task.id)
+            .where(ShiftTask.shift_id == shift_id, ShiftTask.task_date == task_date)
+        )
+        return task.scalars().first()
+
+    @replica_safe
     async def get_tasks_statistics_report(self) -> tuple[TasksAnalyticReportDto]:
         """Отчёт по задачам со всех смен.
 
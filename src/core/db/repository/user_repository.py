@@ -1,8 +1,10 @@
-from typing import Optional
+import re
+from typing import Any, Optional
 from uuid import UUID
 
 from fastapi import Depends
-from sqlalchemy import asc, case, desc, func, or_, select
+from sqlalchemy import JSON, Row, asc, case, desc, func, literal_column, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.request_models.user import UserDescAscSortRequest, UserFieldSortRequest
@@ -10,6 +12,9 @@ from src.core.db.db import get_session
 from src.core.db.DTO_models import ShiftByUserWithReportSummaryDto
 from src.core.db.models import Member, Report, Request, Shift, User
 from src.core.db.repository import AbstractRepository
+from src.core.db.repository.abstract_repository import replica_safe
+
+LIKE_SPECIAL_CHARACTERS = re.compile(r"[\\%_]")
 
 
 class UserRepository(AbstractRepository):
@@ -27,8 +32,17 @@ class UserRepository(AbstractRepository):
         total_approved -- количество одобренных заданий,
         total_declined -- количество отмененных заданий,
         total_skipped -- количество пропущенных заданий,
-        is_excluded -- был ли участник исключен из смены (bool).
+        is_excluded -- был ли участник исключен из смены (bool),
+        reports -- задания участника смены (task_id, task_date, status), упорядоченные по дате.
         """
+        member_reports = func.json_agg(
+            aggregate_order_by(
+                func.json_build_object(
+                    "task_id", Report.task_id, "task_date", Report.task_date, "status", Report.status
+                ),
+                Report.task_date,
+            )
+        ).filter(Report.id.isnot(None))
         stmt = (
             select(
                 Shift.id,
@@ -41,6 +55,7 @@ class UserRepository(AbstractRepository):
                 func.count(case(((Report.status == "declined"), Report.id))).label("total_declined"),
                 func.count(case(((Report.status == "waiting"), Report.id))).label("total_skipped"),
                 case(((Member.status == "excluded"), True), else_=False).label("is_excluded"),
+                func.coalesce(member_reports, literal_column("'[]'::json"), type_=JSON).label("reports"),
             )
             .join(User.members, isouter=True)
             .join(Member.shift, isouter=True)
@@ -70,40 +85,54 @@ class UserRepository(AbstractRepository):
         )
         return user_exists.scalar()
 
+    @replica_safe
     async def get_users_with_status(
         self,
         status: Optional[User.Status] = None,
         field_sort: Optional[UserFieldSortRequest] = None,
         direction_sort: Optional[UserDescAscSortRequest] = None,
-    ) -> list[User]:
-        sorting = {'desc': desc, 'asc': asc}
-        users = await self._session.execute(
-            select(
-                User.id,
-                User.name,
-                User.surname,
-                User.date_of_birth,
-                User.city,
-                User.phone_number,
-                User.status,
-                func.count(Member.shift).label('shifts_count'),
-                case(
-                    (
-                        ((func.count(Shift.status).filter(Shift.status == Shift.Status.STARTED)) == 1),
-                        True,
-                    ),
-                    else_=False,
-                ).label("is_in_active_shift"),
-            )
-            .join(User.members, isouter=True)
-            .join(Member.shift, isouter=True)
-            .group_by(User.id)
-            .where(
-                or_(status is None, User.status == status),
-                User.is_test_user == False,  # noqa
-            )
-            .order_by(sorting[direction_sort.value if direction_sort else 'asc'](field_sort or User.created_at))
+        search: Optional[str] = None,
+        after: Optional[tuple[Any, UUID]] = None,
+        limit: Optional[int] = None,
+    ) -> list[Row]:
+        """Получить страницу списка пользователей.
+
+        Страницы выбираются по ключу сортировки (keyset): after -- значение поля сортировки
+        и id последнего пользователя предыдущей страницы. Значение поля сортировки каждого
+        пользователя возвращается в поле sort_value.
+        Поиск по подстроке в имени, фамилии, телефоне и городе использует триграммный индекс.
+        """
+        sort_column = getattr(User, field_sort.value) if field_sort else User.created_at
+        descending = direction_sort is UserDescAscSortRequest.DESC
+        sorting = desc if descending else asc
+        is_in_active_shift = (
+            select(Member.id)
+            .join(Member.shift)
+            .where(Member.user_id == User.id, Shift.status == Shift.Status.STARTED)
+            .exists()
         )
+        statement = select(
+            User.id,
+            User.name,
+            User.surname,
+            User.date_of_birth,
+            User.city,
+            User.phone_number,
+            User.status,
+            User.shifts_count,
+            is_in_active_shift.label("is_in_active_shift"),
+            sort_column.label("sort_value"),
+        ).where(
+            or_(status is None, User.status == status),
+            User.is_test_user == False,  # noqa
+        )
+        if search:
+            pattern = "%{}%".format(LIKE_SPECIAL_CHARACTERS.sub(r"\\\g<0>", search))
+            statement = statement.where(User.search_text().ilike(pattern, escape="\\"))
+        if after:
+            sort_key = tuple_(sort_column, User.id)
+            statement = statement.where(sort_key < after if descending else sort_key > after)
+        users = await self._session.execute(statement.order_by(sorting(sort_column), sorting(User.id)).limit(limit))
         return users.all()
 
     async def get_users_by_shift_id(self, shift_id: UUID) -> list[User]:
@@ -122,3 +151,15 @@ class UserRepository(AbstractRepository):
     async def get_test_users(self) -> list[User]:
         users = await self._session.execute(select(User).where(User.is_test_user == True))  # noqa
         return users.scalars().all()
+
+    async def increment_shifts_count(self, user_id: UUID) -> None:
+        """Увеличить количество смен пользователя на одну.
+
+        Изменение выполняется без commit, в той же транзакции, что и создание участника смены.
+        """
+        await self._session.execute(update(User).where(User.id == user_id).values(shifts_count=User.shifts_count + 1))
+
+    async def set_telegram_blocked_by_telegram_id(self, telegram_id: int) -> None:
+        """Отметить пользователя как заблокировавшего бота."""
+        await self._session.execute(update(User).where(User.telegram_id == telegram_id).values(telegram_blocked=True))
+        await self._session.commit()
@@ -111,6 +111,10 @@ class ReportWaitingPhotoError(NotFoundError):
     detail = "К заданию нет отчета участника."
 
 
+class ReportClaimedByAnotherAdministratorError(BadRequestError):
+    detail = "Отчет проверяет другой администратор."
+
+
 class ShiftStartError(BadRequestError):
     def __init__(self, shift: Shift):
         self.detail = "Невозможно начать смену {!r}. Проверьте статус смены".format(shift)
@@ -232,6 +236,10 @@ class InvalidDateFormatError(BadRequestError):
     detail = "Некорректный формат даты. Ожидаемый формат: YYYY-MM-DD."
 
 
+class InvalidPageCursorError(BadRequestError):
+    detail = "Некорректный курсор страницы. Запросите список с первой страницы."
+
+
 class InvitationAlreadyRegisteredError(BadRequestError):
     detail = "Невозможно изменить состояние приглашения. Пользователь уже зарегистрирован."
 
@@ -264,3 +272,17 @@ class AdministratorSelfChangeRoleError(ForbiddenError):
 
 class AdministratorSelfChangeStatusError(ForbiddenError):
     detail = "Вы не можете изменить статус самому себе."
+
+
+class ReportPhotoNotFoundError(NotFoundError):
+    detail = "Фотография отчёта не найдена."
+
+
+class ReportPhotoRangeNotSatisfiableError(ApplicationError):
+    status_code: HTTPStatus = HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+    detail = "Запрошенный диапазон байтов недоступен."
+
+
+class BotUpdateQueueFullError(ApplicationError):
+    status_code: HTTPStatus = HTTPStatus.SERVICE_UNAVAILABLE
+    detail = "Очередь обновлений бота переполнена, повторите запрос позже."
@@ -0,0 +1,75 @@
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.db.db import read_from_primary, replica_engine
+from src.core.db.query_stats import track_queries
+from src.core.settings import settings
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+LAST_WRITE_COOKIE = "last_write_at"
+
+
+class ReadYourWritesMiddleware:
+    """Чтение с основной БД для клиентов, которые недавно изменяли данные.
+
+    После запроса, изменяющего данные, запросы клиента в течение DB_REPLICA_READ_YOUR_WRITES_SECONDS не читают
+    с реплики, поэтому клиент сразу видит свои изменения, даже если реплика отстаёт. Время изменения передаётся
+    клиенту в cookie LAST_WRITE_COOKIE и читается из следующих запросов, поэтому не зависит от того,
+    какой процесс API их обрабатывает.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    @staticmethod
+    def __has_recent_write(scope: Scope) -> bool:
+        try:
+            written_at = float(HTTPConnection(scope).cookies.get(LAST_WRITE_COOKIE, ""))
+        except ValueError:
+            return False
+        return time.time() - written_at < settings.DB_REPLICA_READ_YOUR_WRITES_SECONDS
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or replica_engine is None:
+            await self.app(scope, receive, send)
+            return
+        is_write = scope["method"] not in SAFE_METHODS
+        token = read_from_primary.set(is_write or self.__has_recent_write(scope))
+
+        async def send_with_last_write(message: Message) -> None:
+            if is_write and message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(
+                    "Set-Cookie",
+                    f"{LAST_WRITE_COOKIE}={time.time():.3f}; Max-Age={settings.DB_REPLICA_READ_YOUR_WRITES_SECONDS}; "
+                    "Path=/; HttpOnly; SameSite=Lax",
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_last_write)
+        finally:
+            read_from_primary.reset(token)
+
+
+class QueryStatsMiddleware:
+    """Статистика SQL-запросов HTTP-запроса: заголовок ответа Server-Timing и запись в лог."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with track_queries() as query_stats:
+
+            async def send_with_server_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    MutableHeaders(scope=message).append("Server-Timing", query_stats.server_timing())
+                await send(message)
+
+            await self.app(scope, receive, send_with_server_timing)
+        query_stats.log(f"{scope['method']} {scope['path']}")
@@ -0,0 +1,137 @@
+import json
+import os
+import re
+import shutil
+import struct
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+
+from src.core import exceptions
+from src.core.settings import settings
+
+BUNDLE_SUFFIX = ".bundle"
+BUNDLE_MAGIC = b"LBB1"
+# Формат бандла: [содержимое файлов][индекс в JSON][футер: magic + смещение индекса]
+BUNDLE_FOOTER = struct.Struct("<4sQ")
+SHIFT_DIR_PATTERN = re.compile(r"^shift_\d+$")
+COPY_BUFFER_SIZE = 1024 * 1024
+
+
+@dataclass
+class PackResult:
+    files_count: int
+    bytes_before: int
+    bytes_after: int
+
+    @property
+    def bytes_reclaimed(self) -> int:
+        return self.bytes_before - self.bytes_after
+
+
+def get_bundle_path(shift_dir: str) -> Path:
+    """Путь к бандлу с архивом фотоотчётов смены."""
+    return settings.USER_REPORTS_ARCHIVE_DIR / f"{shift_dir}{BUNDLE_SUFFIX}"
+
+
+def move_served_bundles() -> int:
+    """Перенести бандлы, созданные в раздаваемой как статика директории фотоотчётов, в директорию архивов.
+
+    Возвращает количество перенесённых бандлов.
+    """
+    settings.USER_REPORTS_ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+    moved = 0
+    for served_path in settings.USER_REPORTS_DIR.glob(f"shift_*{BUNDLE_SUFFIX}"):
+        if not SHIFT_DIR_PATTERN.match(served_path.name.removesuffix(BUNDLE_SUFFIX)):
+            continue
+        shutil.move(served_path, get_bundle_path(served_path.name.removesuffix(BUNDLE_SUFFIX)))
+        moved += 1
+    return moved
+
+
+def _disk_usage(path: Path) -> int:
+    """Фактически занимаемое на диске место с учётом размера блока."""
+    return path.stat().st_blocks * 512
+
+
+def _read_index(bundle_path: Path) -> dict[str, list[int]]:
+    with open(bundle_path, "rb") as bundle:
+        bundle.seek(-BUNDLE_FOOTER.size, os.SEEK_END)
+        magic, index_offset = BUNDLE_FOOTER.unpack(bundle.read(BUNDLE_FOOTER.size))
+        if magic != BUNDLE_MAGIC:
+            raise ValueError(f"Файл {bundle_path} не является архивом фотоотчётов")
+        index_size = bundle.seek(0, os.SEEK_END) - BUNDLE_FOOTER.size - index_offset
+        bundle.seek(index_offset)
+        return json.loads(bundle.read(index_size))
+
+
+@lru_cache(maxsize=16)
+def _get_cached_index(bundle_path: Path, mtime_ns: int) -> dict[str, list[int]]:
+    """Индекс бандла кэшируется до изменения файла (ключ включает mtime)."""
+    return _read_index(bundle_path)
+
+
+def pack_shift_dir(shift_dir: Path) -> PackResult:
+    """Упаковать директорию фотоотчётов смены в один бандл с индексом смещений.
+
+    Если бандл уже существует (повторный запуск), его содержимое переносится в новый бандл.
+    После успешной записи исходные файлы и директория удаляются.
+    """
+    bundle_path = get_bundle_path(shift_dir.name)
+    bundle_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = bundle_path.with_suffix(f"{BUNDLE_SUFFIX}.tmp")
+    files = sorted(path for path in shift_dir.rglob("*") if path.is_file())
+    index: dict[str, list[int]] = {}
+    bytes_before = sum(_disk_usage(path) for path in files)
+
+    with open(tmp_path, "wb") as bundle:
+        if bundle_path.exists():
+            bytes_before += _disk_usage(bundle_path)
+            with open(bundle_path, "rb") as old_bundle:
+                for key, (offset, size) in _read_index(bundle_path).items():
+                    old_bundle.seek(offset)
+                    index[key] = [bundle.tell(), size]
+                    bundle.write(old_bundle.read(size))
+        for path in files:
+            key = path.relative_to(shift_dir).as_posix()
+            with open(path, "rb") as source:
+                start = bundle.tell()
+                shutil.copyfileobj(source, bundle, COPY_BUFFER_SIZE)
+                index[key] = [start, bundle.tell() - start]
+        index_offset = bundle.tell()
+        bundle.write(json.dumps(index, separators=(",", ":")).encode())
+        bundle.write(BUNDLE_FOOTER.pack(BUNDLE_MAGIC, index_offset))
+        bundle.flush()
+        os.fsync(bundle.fileno())
+
+    os.replace(tmp_path, bundle_path)
+    shutil.rmtree(shift_dir)
+    return PackResult(files_count=len(files), bytes_before=bytes_before, bytes_after=_disk_usage(bundle_path))
+
+
+def locate_report_photo(file_path: str) -> tuple[Path, int, int]:
+    """Найти фотоотчёт в архиве смены по его относительному пути.
+
+    Аргументы:
+        file_path (str) - путь вида "shift_<номер>/<user_id>/<имя файла>".
+
+    Возвращает путь к бандлу, смещение и размер файла внутри бандла.
+    """
+    shift_dir, _, key = file_path.partition("/")
+    if not SHIFT_DIR_PATTERN.match(shift_dir):
+        raise exceptions.ReportPhotoNotFoundError
+    bundle_path = get_bundle_path(shift_dir)
+    try:
+        index = _get_cached_index(bundle_path, bundle_path.stat().st_mtime_ns)
+    except FileNotFoundError:
+        raise exceptions.ReportPhotoNotFoundError
+    if key not in index:
+        raise exceptions.ReportPhotoNotFoundError
+    offset, size = index[key]
+    return bundle_path, offset, size
+
+
+def read_bundle_range(bundle_path: Path, offset: int, size: int) -> bytes:
+    """Прочитать фрагмент бандла."""
+    with open(bundle_path, "rb") as bundle:
+        return os.pread(bundle.fileno(), size, offset)
@@ -7,6 +7,7 @@ from src.api.request_models.administrator import (
     AdministratorUpdateNameAndSurnameRequest,
 )
 from src.core import exceptions
+from src.core.administrator_cache import administrator_cache
 from src.core.db.models import Administrator
 from src.core.db.repository import AdministratorRepository
 from src.core.email import EmailProvider
@@ -33,7 +34,7 @@ class AdministratorService:
             name=schema.name,
             surname=schema.surname,
             email=invitation.email,
-            hashed_password=AuthenticationService.get_hashed_password(schema.password.get_secret_value()),
+            hashed_password=await AuthenticationService.hash_password(schema.password.get_secret_value()),
             status=Administrator.Status.ACTIVE,
             role=Administrator.Role.EXPERT,
         )
@@ -64,10 +65,10 @@ class AdministratorService:
 
     async def __set_new_password(self, password: str, email: str) -> Administrator:
         """Хэширует пароль, сохраняет его в БД, возвращает объект Administrator с обновленными данными."""
-        hashed_password = AuthenticationService.get_hashed_password(password)
+        hashed_password = await AuthenticationService.hash_password(password)
         administrator = await self.__administrator_repository.get_by_email(email)
         instance = Administrator(hashed_password=hashed_password)
-        return await self.__administrator_repository.update(administrator.id, instance)
+        return await self.__update_access(administrator.id, instance, email)
 
     async def change_administrator_status(
         self, administrator_id: UUID, status: Administrator.Status, changer_token: str
@@ -82,7 +83,7 @@ class AdministratorService:
 
         administrator.status = status
 
-        return await self.__administrator_repository.update(administrator.id, administrator)
+        return await self.__update_access(administrator.id, administrator, administrator.email)
 
     async def change_administrator_role(
         self, administrator_id: UUID, role: Administrator.Role, changer_token: str
@@ -97,7 +98,14 @@ class AdministratorService:
 
         administrator.role = role
 
-        return await self.__administrator_repository.update(administrator.id, administrator)
+        return await self.__update_access(administrator.id, administrator, administrator.email)
+
+    async def __update_access(self, administrator_id: UUID, instance: Administrator, email: str) -> Administrator:
+        """Сохраняет изменение статуса, роли или пароля администратора и сбрасывает его записи в кэше авторизации."""
+        await self.__administrator_repository.publish_change(email)
+        administrator = await self.__administrator_repository.update(administrator_id, instance)
+        administrator_cache.invalidate(email)
+        return administrator  # noqa: R504
 
     async def get_by_id(self, administrator_id: UUID) -> Administrator:
         """Возвращает сущность администратора по id."""
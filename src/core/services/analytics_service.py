@@ -4,13 +4,18 @@ from urllib.parse import quote_plus
 from uuid import UUID
 
 from fastapi import Depends
-from openpyxl import Workbook
 
+from src.core.cpu_executor import cpu_executor
 from src.core.db.repository.shift_repository import ShiftRepository
 from src.core.db.repository.task_repository import TaskRepository
 from src.excel_generator.builder import AnalyticReportBuilder
 from src.excel_generator.shift_builder import ShiftAnalyticReportSettings
-from src.excel_generator.task_builder import TaskAnalyticReportSettings
+from src.excel_generator.task_builder import (
+    BaseAnalyticReportSettings,
+    TaskAnalyticReportSettings,
+)
+
+ReportSheet = tuple[str, tuple, type[BaseAnalyticReportSettings]]
 
 
 class AnalyticsService:
@@ -20,9 +25,7 @@ class AnalyticsService:
         self,
         task_repository: TaskRepository = Depends(),
         shift_repository: ShiftRepository = Depends(),
-        task_report_builder: AnalyticReportBuilder = Depends(),
     ) -> None:
-        self.__task_report_builder = task_report_builder
         self.__task_repository = task_repository
         self.__shift_repository = shift_repository
 
@@ -31,16 +34,11 @@ class AnalyticsService:
         """Генерация описания к отчёту с заданиями."""
         return f"Отчёт по задачам\nдата формирования отчёта: {date.today().strftime('%d.%m.%Y')}"
 
-    async def __generate_task_report(self, workbook: Workbook) -> None:
-        """Генерация отчёта с заданиями."""
+    async def __get_task_report_sheet(self) -> ReportSheet:
+        """Данные листа отчёта с заданиями."""
         tasks_statistic = await self.__task_repository.get_tasks_statistics_report()
         description = await self.__generate_task_report_description()
-        await self.__task_report_builder.generate_report(
-            description,
-            tasks_statistic,
-            workbook=workbook,
-            analytic_task_report_full=TaskAnalyticReportSettings,
-        )
+        return description, tasks_statistic, TaskAnalyticReportSettings
 
     async def __generate_shift_report_description(self, shift_id: UUID) -> str:
         """Генерация описания к отчёту по выбранной смене."""
@@ -52,35 +50,29 @@ class AnalyticsService:
             f"дата формирования отчёта: {date.today().strftime('%d.%m.%Y')}"
         )
 
-    async def __generate_report_for_shift(self, workbook: Workbook, shift_id: UUID) -> None:
-        """Генерация отчёта по выбранной смене."""
+    async def __get_shift_report_sheet(self, shift_id: UUID) -> ReportSheet:
+        """Данные листа отчёта по выбранной смене."""
         shift_statistic = await self.__shift_repository.get_shift_statistics_report_by_id(shift_id)
         description = await self.__generate_shift_report_description(shift_id)
-        await self.__task_report_builder.generate_report(
-            description,
-            shift_statistic,
-            workbook=workbook,
-            analytic_task_report_full=ShiftAnalyticReportSettings,
-        )
+        return description, shift_statistic, ShiftAnalyticReportSettings
+
+    @staticmethod
+    async def __build_report(*sheets: ReportSheet) -> BytesIO:
+        """Построение excel файла в пуле для CPU-ёмких задач."""
+        return await cpu_executor.run(AnalyticReportBuilder.build, sheets)
 
     async def generate_full_report(self) -> BytesIO:
         """Генерация полного отчёта."""
-        workbook = self.__task_report_builder.create_workbook()
-        await self.__generate_task_report(workbook)
-        await self.__generate_task_report(workbook)
-        return await self.__task_report_builder.get_report_response(workbook)
+        task_report_sheet = await self.__get_task_report_sheet()
+        return await self.__build_report(task_report_sheet, task_report_sheet)
 
     async def generate_task_report(self) -> BytesIO:
         """Генерация отчёта с заданиями."""
-        workbook = self.__task_report_builder.create_workbook()
-        await self.__generate_task_report(workbook)
-        return await self.__task_report_builder.get_report_response(workbook)
+        return await self.__build_report(await self.__get_task_report_sheet())
 
     async def generate_report_for_shift(self, shift_id: UUID) -> BytesIO:
         """Генерация отчёта по выбранной смене."""
-        workbook = self.__task_report_builder.create_workbook()
-        await self.__generate_report_for_shift(workbook, shift_id)
-        return await self.__task_report_builder.get_report_response(workbook)
+        return await self.__build_report(await self.__get_shift_report_sheet(shift_id))
 
     async def generate_shift_report_filename(self, shift_id: UUID) -> str:
         """Генерация названия файла отчета по смене."""
@@ -7,6 +7,8 @@ from passlib.context import CryptContext
 
 from src.api.request_models.administrator import AdministratorAuthenticateRequest
 from src.core import exceptions
+from src.core.administrator_cache import AuthorizedAdministrator, administrator_cache
+from src.core.cpu_executor import cpu_executor
 from src.core.db.DTO_models import AdministratorAndTokensDTO
 from src.core.db.models import Administrator
 from src.core.db.repository import AdministratorRepository
@@ -29,21 +31,35 @@ class AuthenticationService:
         """Получить хэш пароля."""
         return PASSWORD_CONTEXT.hash(password)
 
+    @staticmethod
+    async def hash_password(password: str) -> str:
+        """Получить хэш пароля в пуле для CPU-ёмких задач, не блокируя цикл событий."""
+        return await cpu_executor.run(AuthenticationService.get_hashed_password, password)
+
+    @staticmethod
+    def verify_password(plain_password: str, hashed_password: str) -> bool:
+        """Сравнить открытый пароль с хэшем."""
+        return PASSWORD_CONTEXT.verify(plain_password, hashed_password)
+
     @staticmethod
     def get_email_from_token(token: str) -> str:
         """Возвращает email из JWT токена."""
+        return AuthenticationService.__decode_token(token)["email"]
+
+    @staticmethod
+    def __decode_token(token: str) -> dict:
+        """Возвращает проверенные данные (claims) JWT токена."""
         try:
             payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[ALGORITHM])
         except JWTError:
             raise exceptions.UnauthorizedError
-        email = payload.get("email")
-        if not email:
+        if not payload.get("email"):
             raise exceptions.UnauthorizedError
-        return email
+        return payload
 
-    def __verify_hashed_password(self, plain_password: str, hashed_password: str) -> bool:
-        """Сравнить открытый пароль с хэшем."""
-        return PASSWORD_CONTEXT.verify(plain_password, hashed_password)
+    async def __verify_hashed_password(self, plain_password: str, hashed_password: str) -> bool:
+        """Сравнить открытый пароль с хэшем в пуле для CPU-ёмких задач."""
+        return await cpu_executor.run(AuthenticationService.verify_password, plain_password, hashed_password)
 
     def __create_jwt_token(self, email: str, expires_delta: int) -> str:
         """Создать jwt-токен.
@@ -62,7 +78,7 @@ class AuthenticationService:
         if administrator.status == Administrator.Status.BLOCKED:
             raise exceptions.AdministratorBlockedError
         password = auth_data.password.get_secret_value()
-        if not self.__verify_hashed_password(password, administrator.hashed_password):
+        if not await self.__verify_hashed_password(password, administrator.hashed_password):
             raise exceptions.InvalidAuthenticationDataError
         return administrator
 
@@ -97,13 +113,34 @@ class AuthenticationService:
         if role is not None and role not in Administrator.Role.__members__.values():
             raise exceptions.AdministratorUnknownRoleError(role)
 
-        email = self.get_email_from_token(token.credentials)
-
-        administrator_exists = await self.__administrator_repository.is_administrator_exists(email, role)
+        try:
+            administrator = await self.get_authorized_administrator(token.credentials)
+        except (exceptions.AdministratorNotFoundError, exceptions.AdministratorBlockedError):
+            raise exceptions.ForbiddenError
 
-        if not administrator_exists:
+        if role is not None and administrator.role != role:
             raise exceptions.ForbiddenError
 
+    async def get_authorized_administrator(self, token: str) -> AuthorizedAdministrator:
+        """Получить id, роль и статус текущего активного администратора по токену.
+
+        Данные берутся из кэша авторизации, при их отсутствии — из БД с сохранением в кэш.
+        """
+        administrator = administrator_cache.get(token)
+        if administrator is None:
+            payload = self.__decode_token(token)
+            db_administrator = await self.__administrator_repository.get_by_email(payload["email"])
+            administrator = AuthorizedAdministrator(
+                id=db_administrator.id,
+                email=db_administrator.email,
+                role=db_administrator.role,
+                status=db_administrator.status,
+            )
+            administrator_cache.put(token, administrator, payload["exp"])
+        if administrator.status == Administrator.Status.BLOCKED:
+            raise exceptions.AdministratorBlockedError
+        return administrator
+
     async def get_current_active_administrator(self, token: str) -> Administrator:
         """Получить текущего активного администратора, используя токен."""
         email = self.get_email_from_token(token)
@@ -0,0 +1,59 @@
+from datetime import datetime
+from typing import Sequence
+from uuid import UUID
+
+from fastapi import Depends
+
+from src.core.db.models import JobRun
+from src.core.db.repository import JobRunRepository
+from src.core.settings import settings
+
+
+def to_server_time(moment: datetime) -> datetime:
+    """Привести время с часовым поясом к локальному времени сервера, в котором хранятся запуски."""
+    return moment.astimezone().replace(tzinfo=None)
+
+
+class JobRunService:
+    """Сервис учёта запусков ежедневных задач бота."""
+
+    def __init__(self, job_run_repository: JobRunRepository = Depends()) -> None:
+        self.__job_run_repository = job_run_repository
+
+    async def claim_run(self, job_name: str, scheduled_at: datetime, next_scheduled_at: datetime) -> UUID | None:
+        """Занять запуск задачи и запланировать следующий.
+
+        Возвращает None, если задача на это время уже выполнена или выполняется.
+        """
+        return await self.__job_run_repository.claim(
+            job_name,
+            to_server_time(scheduled_at),
+            to_server_time(next_scheduled_at),
+            datetime.now() - settings.JOB_RUN_LEASE_TIME,
+        )
+
+    async def plan_runs(self, scheduled_at_by_job: dict[str, datetime]) -> None:
+        """Создать записи о запланированных запусках задач, если их ещё нет."""
+        await self.__job_run_repository.plan(
+            {job_name: to_server_time(scheduled_at) for job_name, scheduled_at in scheduled_at_by_job.items()}
+        )
+
+    async def get_missed_runs(self, job_names: Sequence[str], since: datetime) -> Sequence[JobRun]:
+        """Получить пропущенные с момента since запуски задач в порядке запланированного времени.
+
+        Пропущенными считаются запуски, которые не были выполнены, завершились ошибкой или были прерваны
+        (выполняются дольше JOB_RUN_LEASE_TIME).
+        """
+        now = datetime.now()
+        return await self.__job_run_repository.get_missed(
+            job_names, to_server_time(since), now, now - settings.JOB_RUN_LEASE_TIME
+        )
+
+    async def complete_run(self, job_run_id: UUID, rows_affected: int | None) -> None:
+        await self.__job_run_repository.finish(job_run_id, JobRun.Status.SUCCEEDED, rows_affected=rows_affected)
+
+    async def fail_run(self, job_run_id: UUID, error: Exception) -> None:
+        await self.__job_run_repository.finish(job_run_id, JobRun.Status.FAILED, error=repr(error))
+
+    async def get_recent_runs(self, limit: int) -> Sequence[JobRun]:
+        return await self.__job_run_repository.get_recent(limit)
@@ -1,16 +1,18 @@
-from datetime import date, timedelta
-from typing import Sequence
+from datetime import date
+from typing import Optional
 from urllib.parse import urljoin
 
 from fastapi import Depends
 from pydantic.schema import UUID
+from sqlalchemy import Row
 from telegram.ext import Application
 
 from src.api.response_models.report import ReportResponse
 from src.bot import services
 from src.core import exceptions
+from src.core.admin_events import AdminEvent
 from src.core.db import DTO_models
-from src.core.db.models import Member, Report, Shift, Task
+from src.core.db.models import Member, Report, Shift
 from src.core.db.repository import MemberRepository, ReportRepository, ShiftRepository
 from src.core.services.task_service import TaskService
 from src.core.settings import settings
@@ -50,37 +52,36 @@ class ReportService:
         if report.status == Report.Status.SKIPPED:
             raise exceptions.ReportAlreadySkippedError
 
-    async def get_today_task_and_active_members(
-            self, shift: Shift, current_day_of_month: int) -> tuple[Task, list[Member]]:
-        """Получить ежедневное задание и список активных участников смены."""
-        members = await self.__member_repository.get_active_members_for_shift(shift.id)
-        task = await self.__task_service.get_task_by_day_of_month(shift.tasks, current_day_of_month)
-        return task, members
-
     async def approve_report(self, report_id: UUID, administrator_id: UUID, bot: Application) -> ReportResponse:
         """Задание принято: изменение статуса, начисление 1 /"ломбарьерчика/", уведомление участника."""
         report = await self.__report_repository.get(report_id)
         self.__can_change_status(report.status)
-        report.status = Report.Status.APPROVED
-        report.set_reviewer(administrator_id)
+        self.__check_not_claimed_by_another(report, administrator_id)
+        previous_status = report.status
+        report = await self.__report_repository.set_reviewed(report, Report.Status.APPROVED, administrator_id)
+        reviewing_counters = await self.__leave_review(report, previous_status)
+        await self.__publish_report_reviewed(report)
         report = await self.__report_repository.update(report_id, report)
         member = await self.__member_repository.get_with_user_and_shift(report.member_id)
         member.numbers_lombaryers += 1
         await self.__member_repository.update(member.id, member)
         await self.__telegram_bot(bot).notify_approved_task(member.user, report, member.shift)
-        await self.__notify_member_about_finished_shift(member, bot)
+        await self.__notify_member_about_finished_shift(member, reviewing_counters, bot)
         return report
 
     async def decline_report(self, report_id: UUID, administrator_id: UUID, bot: Application) -> ReportResponse:
         """Задание отклонено: изменение статуса, уведомление участника в телеграм."""
         report = await self.__report_repository.get(report_id)
         self.__can_change_status(report.status)
-        report.status = Report.Status.DECLINED
-        report.set_reviewer(administrator_id)
+        self.__check_not_claimed_by_another(report, administrator_id)
+        previous_status = report.status
+        report = await self.__report_repository.set_reviewed(report, Report.Status.DECLINED, administrator_id)
+        reviewing_counters = await self.__leave_review(report, previous_status)
+        await self.__publish_report_reviewed(report)
         report = await self.__report_repository.update(report_id, report)
         member = await self.__member_repository.get_with_user_and_shift(report.member_id)
         await self.__telegram_bot(bot).notify_declined_task(member.user, member.shift, report)
-        await self.__notify_member_about_finished_shift(member, bot)
+        await self.__notify_member_about_finished_shift(member, reviewing_counters, bot)
         return report
 
     async def skip_current_report(self, user_id: UUID) -> Report:
@@ -91,15 +92,18 @@ class ReportService:
         if report.status is not Report.Status.WAITING:
             raise exceptions.ReportCantBeSkippedError
         report.status = Report.Status.SKIPPED
+        await self.__member_repository.increment_consecutive_skips(report.member_id)
         return await self.__report_repository.update(report.id, report)
 
-    async def __notify_member_about_finished_shift(self, member: Member, bot: Application) -> None:
-        """Уведомляет пользователя об окончании смены, если у него не осталось непроверенных заданий."""
+    async def __notify_member_about_finished_shift(
+        self, member: Member, reviewing_counters: Optional[Row], bot: Application
+    ) -> None:
+        """Уведомляет пользователя об окончании смены, если проверено его последнее непроверенное задание."""
         if (
-            member.shift.status is Shift.Status.READY_FOR_COMPLETE
-            and not await self.__member_repository.is_unreviewed_report_exists(member.id)
+            reviewing_counters is not None
+            and reviewing_counters.shift_status is Shift.Status.READY_FOR_COMPLETE
+            and reviewing_counters.member_reviewing_reports == 0
         ):
-            await self.__finish_shift_with_all_reports_reviewed(member.shift)
             await self.__telegram_bot(bot).send_message(
                 member.user,
                 member.shift.final_message.format(
@@ -110,6 +114,28 @@ class ReportService:
                 ),
             )
 
+    async def __leave_review(self, report: Report, previous_status: Report.Status) -> Optional[Row]:
+        """Уменьшить счётчики отчетов на проверке участника и смены, если проверен отчет из статуса reviewing.
+
+        Вызывается после того, как статус отчета изменён этим запросом (ReportRepository.set_reviewed),
+        поэтому при одновременной проверке одного отчета счётчики уменьшаются один раз.
+        Если в приготовленной к закрытию смене не осталось отчетов на проверке, смена закрывается
+        в той же транзакции. Возвращает счётчики после изменения или None, если отчет не был на проверке.
+        """
+        if previous_status is not Report.Status.REVIEWING:
+            return None
+        reviewing_counters = await self.__report_repository.change_reviewing_reports_count(
+            report.member_id, report.shift_id, -1
+        )
+        if reviewing_counters.shift_reviewing_reports == 0:
+            await self.__shift_repository.finish_if_reviewed(report.shift_id)
+        return reviewing_counters
+
+    async def __publish_report_reviewed(self, report: Report) -> None:
+        await self.__report_repository.publish_admin_event(
+            AdminEvent.REPORT_REVIEWED, report_id=report.id, shift_id=report.shift_id, status=report.status
+        )
+
     def __can_change_status(self, status: Report.Status) -> None:
         """Проверка статуса задания перед изменением."""
         if status in (Report.Status.APPROVED, Report.Status.DECLINED):
@@ -117,11 +143,10 @@ class ReportService:
         if status is Report.Status.WAITING:
             raise exceptions.ReportWaitingPhotoError
 
-    async def __finish_shift_with_all_reports_reviewed(self, shift: Shift) -> None:
-        """Закрывает смену, если не осталось непроверенных заданий."""
-        if not await self.__shift_repository.is_unreviewed_report_exists(shift.id):
-            shift.status = Shift.Status.FINISHED
-            await self.__shift_repository.update(shift.id, shift)
+    def __check_not_claimed_by_another(self, report: Report, administrator_id: UUID) -> None:
+        """Проверка, что отчет не закреплён на проверку за другим администратором."""
+        if report.is_claimed_by_another(administrator_id):
+            raise exceptions.ReportClaimedByAnotherAdministratorError
 
     async def get_summaries_of_reports(
         self,
@@ -136,6 +161,21 @@ class ReportService:
         if not shift_exists:
             raise exceptions.ObjectNotFoundError(Shift, shift_id)
         reports = await self.__report_repository.get_summaries_of_reports(shift_id, status)
+        return self.__with_absolute_urls(reports)
+
+    async def claim_reports_for_review(
+        self, administrator_id: UUID, limit: int, shift_id: Optional[UUID] = None
+    ) -> list[DTO_models.FullReportDto]:
+        """Закрепляет за администратором следующие отчеты из очереди проверки.
+
+        Закрепление снимается при проверке отчета или по истечении REPORT_REVIEW_LEASE_TIME.
+        """
+        reports = await self.__report_repository.claim_for_review(administrator_id, limit, shift_id)
+        return self.__with_absolute_urls(reports)
+
+    @staticmethod
+    def __with_absolute_urls(reports: list[DTO_models.FullReportDto]) -> list[DTO_models.FullReportDto]:
+        """Заменяет в отчетах относительные url задания и фото на абсолютные."""
         for report in reports:
             report.task_url = urljoin(settings.APPLICATION_URL, report.task_url)
             if report.photo_url:
@@ -149,48 +189,23 @@ class ReportService:
         await self.check_report_skipped(report)
         await self.check_duplicate_report(photo_url)
         report.send_report(photo_url)
+        await self.__report_repository.change_reviewing_reports_count(report.member_id, report.shift_id, 1)
+        await self.__report_repository.publish_admin_event(
+            AdminEvent.REPORT_SUBMITTED, report_id=report.id, shift_id=report.shift_id
+        )
+        await self.__member_repository.reset_consecutive_skips(report.member_id)
         return await self.__report_repository.update(report.id, report)
 
-    async def create_daily_reports(self, members: list[Member], task: Task) -> None:
-        current_date = date.today()
-        reports = [
-            Report(
-                shift_id=member.shift_id,
-                task_id=task.id,
-                status=(
-                    Report.Status.WAITING if member.status == Member.Status.ACTIVE else Report.Status.NOT_PARTICIPATE
-                ),
-                task_date=current_date,
-                member_id=member.id,
-            )
-            for member in members
-        ]
-        await self.__report_repository.create_all(reports)
-
-    async def __get_waiting_reports(self) -> Sequence[Report]:
-        """Получаем список отчетов участников со статусом waiting."""
-        return await self.__report_repository.get_waiting_reports()
-
-    async def set_status_to_waiting_reports(self, status: Report.Status):
-        """Устанавливаем статус всем отчетам со статусом waiting."""
-        reports_list = await self.__get_waiting_reports()
-        return await self.__report_repository.set_status_to_reports(reports_list, status)
-
-    async def create_not_participated_reports(self, member_id: UUID, shift: Shift) -> None:
-        """Создаем пропущенные отчеты со статусом not_participate участнику, который пришел на смену позже."""
-        count_of_missed_days = (get_current_task_date() - shift.started_at).days
-        reports = [
-            Report(
-                shift_id=shift.id,
-                task_id=shift.tasks[str((shift.started_at + timedelta(days=day)).day)],
-                status=Report.Status.NOT_PARTICIPATE,
-                task_date=shift.started_at + timedelta(days=day),
-                member_id=member_id,
-            )
-            for day in range(0, count_of_missed_days + 1)
-        ]
-        await self.__report_repository.create_all(reports)
+    async def skip_waiting_reports(self, time_zone: str, current_task_date: date) -> None:
+        """Переводим в статус skipped отчеты прошлых дней со статусом waiting участников из часового пояса."""
+        await self.__report_repository.skip_waiting_reports(time_zone, current_task_date)
+
+    async def create_not_participated_reports(self, member_id: UUID, shift: Shift, time_zone: str) -> None:
+        """Создаем пропущенные отчеты со статусом not_participate участнику, который пришел на смену позже.
+
+        Отчеты создаются по текущий день задания в часовом поясе участника включительно.
+        """
+        await self.__report_repository.create_not_participated_reports(
+            member_id, shift.id, get_current_task_date(time_zone)
+        )
 
-    async def is_previous_report_not_submitted(self, member_id: UUID) -> bool:
-        """Проверяет статус вчерашнего отчета."""
-        return await self.__report_repository.is_previous_report_not_submitted(member_id)
@@ -0,0 +1,47 @@
+import asyncio
+import logging
+
+from fastapi import Depends
+
+from src.core.db.DTO_models import ShiftReportsArchiveDto
+from src.core.db.models import Shift
+from src.core.db.repository import ShiftRepository
+from src.core.reports_archive import move_served_bundles, pack_shift_dir
+from src.core.settings import settings
+
+
+class ReportsArchiveService:
+    """Сервис архивации фотоотчётов завершённых смен."""
+
+    def __init__(self, shift_repository: ShiftRepository = Depends()) -> None:
+        self.__shift_repository = shift_repository
+
+    async def archive_finished_shifts(self) -> list[ShiftReportsArchiveDto]:
+        """Упаковать директории фотоотчётов всех завершённых смен в бандлы.
+
+        Смены, директории которых уже упакованы (или отсутствуют), пропускаются.
+        """
+        moved = await asyncio.to_thread(move_served_bundles)
+        if moved:
+            logging.info(f"Архивы фотоотчётов перенесены из директории статики: {moved}")
+        shifts = await self.__shift_repository.get_shifts_with_status(Shift.Status.FINISHED)
+        archived = []
+        for shift in shifts:
+            shift_dir = settings.USER_REPORTS_DIR / f"shift_{shift.sequence_number}"
+            if not shift_dir.is_dir():
+                continue
+            result = await asyncio.to_thread(pack_shift_dir, shift_dir)
+            archived.append(
+                ShiftReportsArchiveDto(
+                    shift_sequence_number=shift.sequence_number,
+                    files_count=result.files_count,
+                    bytes_before=result.bytes_before,
+                    bytes_after=result.bytes_after,
+                    bytes_reclaimed=result.bytes_reclaimed,
+                )
+            )
+            logging.info(
+                f"Фотоотчёты смены №{shift.sequence_number} упакованы в архив: файлов {result.files_count}, "
+                f"освобождено {result.bytes_reclaimed} байт ({result.bytes_before} -> {result.bytes_after})"
+            )
+        return archived
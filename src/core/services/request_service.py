@@ -1,6 +1,7 @@
-from datetime import timedelta
+import asyncio
+from datetime import date, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Sequence
 
 from fastapi import Depends
 from pydantic.schema import UUID
@@ -10,13 +11,19 @@ from src.api.request_models.request import RequestDeclineRequest
 from src.api.response_models.request import RequestResponse
 from src.bot import services
 from src.core import exceptions
+from src.core.admin_events import AdminEvent
 from src.core.db.DTO_models import RequestDTO
 from src.core.db.models import Member, Request, Shift, User
 from src.core.db.repository import MemberRepository, RequestRepository, UserRepository
 from src.core.services.report_service import ReportService
 from src.core.services.shift_service import ShiftService
 from src.core.settings import settings
-from src.core.utils import get_current_task_date
+from src.core.utils import get_current_task_date, get_delivery_time_zones, get_user_time_zone
+
+
+def create_dirs(paths: Sequence[Path]) -> None:
+    for path in paths:
+        path.mkdir(parents=True, exist_ok=True)
 
 
 class RequestService:
@@ -45,6 +52,8 @@ class RequestService:
         request = await self.__request_repository.get(request_id)
         self.__exception_if_request_is_processed(request.status)
         request.status = Request.Status.APPROVED
+        await self.__shift_service.change_counters(request.shift_id, pending_requests_count=-1)
+        await self.__publish_request_reviewed(request)
         await self.__request_repository.update(request_id, request)
         user = request.user
         await self.__create_user_dir(user, request)
@@ -52,18 +61,53 @@ class RequestService:
             user.status = User.Status.VERIFIED
             await self.__user_repository.update(user.id, user)
         member = Member(user_id=request.user_id, shift_id=request.shift_id)
+        await self.__shift_service.change_counters(request.shift_id, members_count=1, active_members_count=1)
+        await self.__user_repository.increment_shifts_count(user.id)
         member = await self.__member_repository.create(member)
         shift = await self.__shift_service.get_shift(request.shift_id)
+        time_zone = get_user_time_zone(user.city)
         if shift.status is Shift.Status.STARTED:
-            await self.__report_service.create_not_participated_reports(member.id, shift)
-
-        first_task_date = shift.started_at
-        if get_current_task_date() >= shift.started_at:
-            first_task_date = get_current_task_date() + timedelta(days=1)
+            await self.__report_service.create_not_participated_reports(member.id, shift, time_zone)
 
+        first_task_date = self.__get_first_task_date(shift.started_at, time_zone)
         await self.__telegram_bot(bot).notify_approved_request(request.user, first_task_date.strftime('%d.%m.%Y'))
         return RequestResponse.parse_from(request)
 
+    async def approve_requests(self, request_ids: Sequence[UUID], bot: Application) -> list[RequestDTO]:
+        """Массовое одобрение заявок.
+
+        Заявки одобряются пачками по REQUESTS_APPROVE_BATCH_SIZE, уже рассмотренные заявки пропускаются.
+        Уведомления участникам отправляются в фоне, ответ не ждёт их отправки.
+        """
+        approved_requests = []
+        for batch_start in range(0, len(request_ids), settings.REQUESTS_APPROVE_BATCH_SIZE):
+            batch = request_ids[batch_start : batch_start + settings.REQUESTS_APPROVE_BATCH_SIZE]
+            approved_requests.extend(
+                await self.__request_repository.approve_pending(
+                    batch,
+                    {time_zone: get_current_task_date(time_zone) for time_zone in get_delivery_time_zones()},
+                )
+            )
+        await asyncio.to_thread(
+            create_dirs,
+            [
+                settings.USER_REPORTS_DIR / f"shift_{request.shift_sequence_number}" / str(request.user_id)
+                for request in approved_requests
+            ],
+        )
+        await self.__telegram_bot(bot).notify_approved_requests(
+            [
+                (
+                    request,
+                    self.__get_first_task_date(
+                        request.shift_started_at, get_user_time_zone(request.city)
+                    ).strftime('%d.%m.%Y'),
+                )
+                for request in approved_requests
+            ]
+        )
+        return [RequestDTO.parse_from_db(request) for request in approved_requests]
+
     async def decline_request(
         self, request_id: UUID, bot: Application, decline_request_data: Optional[RequestDeclineRequest]
     ) -> RequestResponse:
@@ -71,6 +115,8 @@ class RequestService:
         request = await self.__request_repository.get(request_id)
         self.__exception_if_request_is_processed(request.status)
         request.status = Request.Status.DECLINED
+        await self.__shift_service.change_counters(request.shift_id, pending_requests_count=-1)
+        await self.__publish_request_reviewed(request)
         await self.__request_repository.update(request_id, request)
         user = request.user
         if user.status is User.Status.PENDING:
@@ -79,10 +125,27 @@ class RequestService:
         await self.__telegram_bot(bot).notify_declined_request(request.user, decline_request_data)
         return RequestResponse.parse_from(request)
 
+    async def __publish_request_reviewed(self, request: Request) -> None:
+        await self.__request_repository.publish_admin_event(
+            AdminEvent.REQUEST_REVIEWED,
+            request_id=request.id,
+            shift_id=request.shift_id,
+            user_id=request.user_id,
+            status=request.status,
+        )
+
     async def get_requests_list(self, status: Optional[Request.Status]) -> list[RequestDTO]:
         """Список заявок на участие."""
         return await self.__request_repository.get_requests_list(status)
 
+    @staticmethod
+    def __get_first_task_date(shift_started_at: date, time_zone: str) -> date:
+        """Дата первого задания участника из часового пояса, заявка которого одобрена сегодня."""
+        current_task_date = get_current_task_date(time_zone)
+        if current_task_date >= shift_started_at:
+            return current_task_date + timedelta(days=1)
+        return shift_started_at
+
     @staticmethod
     def __exception_if_request_is_processed(status: Request.Status) -> None:
         """Если заявка была обработана ранее, выбрасываем исключение."""
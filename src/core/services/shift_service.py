@@ -2,10 +2,11 @@ import random
 from datetime import date, timedelta
 from itertools import cycle
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Sequence
 from uuid import UUID
 
 from fastapi import Depends
+from sqlalchemy import Row
 from telegram.ext import Application
 
 from src.api.request_models.shift import (
@@ -21,7 +22,9 @@ from src.api.response_models.shift import (
 )
 from src.bot import services
 from src.core import exceptions
-from src.core.db.models import Member, Report, Request, Shift, User
+from src.core.admin_events import AdminEvent
+from src.core.db.db import get_session
+from src.core.db.models import Member, Report, Request, Shift
 from src.core.db.repository import (
     ReportRepository,
     RequestRepository,
@@ -30,7 +33,7 @@ from src.core.db.repository import (
 )
 from src.core.services.task_service import TaskService
 from src.core.settings import settings
-from src.core.utils import add_months
+from src.core.utils import add_months, get_current_date
 
 FINAL_MESSAGE = (
     "Привет, {name} {surname}! "
@@ -171,22 +174,38 @@ class ShiftService:
     async def get_test_users_and_create_request_to_shift(self, shift_id: UUID) -> None:
         users = await self.__user_repository.get_test_users()
         for user in users:
+            await self.__shift_repository.change_counters(shift_id, pending_requests_count=1)
+            await self.__request_repository.publish_admin_event(
+                AdminEvent.REQUEST_CREATED, shift_id=shift_id, user_id=user.id
+            )
             await self.__request_repository.create(Request(user_id=user.id, shift_id=shift_id))
 
+    async def __schedule_tasks(self, shift: Shift) -> None:
+        """Назначить задания на каждый день смены.
+
+        Задания на даты вне смены удаляются из расписания, уже назначенные внутри смены не меняются,
+        на остальные даты задания назначаются по кругу в случайном порядке.
+        """
+        await self.__shift_repository.unschedule_tasks_outside(shift.id, shift.started_at, shift.finished_at)
+        scheduled_dates = await self.__shift_repository.get_scheduled_task_dates(shift.id)
+        task_ids = list(await self.__task_service.get_task_ids_list())
+        if not task_ids:
+            return
+        random.shuffle(task_ids)
+        shift_dates = (
+            shift.started_at + timedelta(days=day) for day in range((shift.finished_at - shift.started_at).days + 1)
+        )
+        unscheduled_dates = [task_date for task_date in shift_dates if task_date not in scheduled_dates]
+        await self.__shift_repository.schedule_tasks(shift.id, dict(zip(unscheduled_dates, cycle(task_ids))))
+
     async def create_new_shift(self, new_shift: ShiftCreateRequest) -> Shift:
         shift = Shift(**new_shift.dict())
         await self.__validate_shift_on_create(shift)
         shift.status = Shift.Status.PREPARING
         shift.final_message = FINAL_MESSAGE
-        task_ids_list = list(map(str, await self.__task_service.get_task_ids_list()))
-        random.shuffle(task_ids_list)
-        month_tasks = {}
-        for day, task_id in enumerate(cycle(task_ids_list), start=1):
-            month_tasks[day] = task_id
-            if day == 31:
-                break
-        shift.tasks = month_tasks
         shift = await self.__shift_repository.create(instance=shift)
+        await self.__shift_repository.create_reports_partition(shift.id)
+        await self.__schedule_tasks(shift)
         await self.__create_shift_dir(shift.id)
         await self.get_test_users_and_create_request_to_shift(shift.id)
         return shift
@@ -210,19 +229,23 @@ class ShiftService:
         shift.finished_at = update_shift_data.finished_at
         shift.title = update_shift_data.title
         shift.final_message = update_shift_data.final_message
-        return await self.__shift_repository.update(shift_id, shift)
+        shift = await self.__shift_repository.update(shift_id, shift)
+        await self.__schedule_tasks(shift)
+        return shift
 
     async def start_shift(self, shift_id: UUID) -> Shift:
         shift = await self.__shift_repository.get(shift_id)
         await shift.start()
         await self.__shift_repository.update(shift_id, shift)
+        await self.__schedule_tasks(shift)
         return shift
 
     async def finish_shift(self, bot: Application, shift_id: UUID) -> Shift:
-        shift = await self.__shift_repository.get_with_members(shift_id, Member.Status.ACTIVE)
+        """Завершить смену вручную. Сообщения об окончании смены рассылаются в фоне, ответ не ждёт их отправки."""
+        shift = await self.__shift_repository.get(shift_id)
         await shift.finish()
         await self.__shift_repository.update(shift_id, shift)
-        await self.__telegram_bot(bot).notify_that_shift_is_finished(shift)
+        bot.create_task(self.__notify_that_shift_is_finished_in_background(shift, bot))
         return shift
 
     async def get_shift_with_members(
@@ -245,7 +268,8 @@ class ShiftService:
     async def get_open_for_registration_shift_id(self) -> UUID:
         return await self.__shift_repository.get_open_for_registration_shift_id()
 
-    async def finish_shift_automatically(self, bot: Application) -> None:
+    async def finish_shift_automatically(self, bot: Application, time_zone: str) -> None:
+        """Закрыть смену, последний день которой закончился в часовом поясе time_zone."""
         shift = await self.__shift_repository.get_active_or_complete_shift()
         if not shift:
             return
@@ -253,16 +277,15 @@ class ShiftService:
             await self.__decline_reports_and_notify_users(shift.id, bot)
             shift.status = Shift.Status.FINISHED
             await self.__shift_repository.update(shift.id, shift)
-        if shift.finished_at + timedelta(days=1) == date.today():
+        if shift.finished_at + timedelta(days=1) == get_current_date(time_zone):
             await self.__notify_users_with_reviewed_reports(shift.id, bot)
-            unreviewed_report_exists = await self.__shift_repository.is_unreviewed_report_exists(shift.id)
-            shift.status = Shift.Status.READY_FOR_COMPLETE if unreviewed_report_exists else Shift.Status.FINISHED
+            shift.status = Shift.Status.READY_FOR_COMPLETE if shift.reviewing_reports_count else Shift.Status.FINISHED
             await self.__shift_repository.update(shift.id, shift)
 
     async def __notify_users_with_reviewed_reports(self, shift_id: UUID, bot: Application) -> None:
         """Уведомляет пользователей, у которых нет непроверенных отчетов, об окончании смены."""
-        shift = await self.__shift_repository.get_with_members_with_reviewed_reports(shift_id)
-        await self.__telegram_bot(bot).notify_that_shift_is_finished(shift)
+        shift = await self.__shift_repository.get(shift_id)
+        await self.__notify_that_shift_is_finished(shift, bot, without_reports_under_review=True)
 
     async def __decline_reports_and_notify_users(self, shift_id: UUID, bot: Application) -> None:
         """Отклоняет непроверенные задания, уведомляет пользователей об окончании смены."""
@@ -272,45 +295,65 @@ class ShiftService:
             for report in member.reports:
                 report.status = Report.Status.DECLINED
                 reports_for_update.append(report)
+            member.reviewing_reports_count = Member.reviewing_reports_count - len(member.reports)
+        await self.__shift_repository.change_counters(shift_id, reviewing_reports_count=-len(reports_for_update))
         await self.__report_repository.update_all(reports_for_update)
-        await self.__telegram_bot(bot).notify_that_shift_is_finished(shift)
+        await self.__notify_that_shift_is_finished(shift, bot, member_ids=[member.id for member in shift.members])
+
+    async def __notify_that_shift_is_finished(self, shift: Shift, bot: Application, **member_filters) -> None:
+        """Порциями рассылает активным участникам смены сообщение об её окончании.
+
+        Следующая порция участников читается после отправки сообщений предыдущей, поэтому в памяти
+        одновременно находится не больше MAILING_CHUNK_SIZE участников и сообщений.
+        Фильтры участников передаются в ShiftRepository.get_members_for_finish_notification.
+        """
+        bot_service = self.__telegram_bot(bot)
+        async for members in self.__shift_repository.get_members_for_finish_notification(
+            shift.id, settings.MAILING_CHUNK_SIZE, **member_filters
+        ):
+            await bot_service.notify_that_shift_is_finished(shift.final_message, members)
+
+    async def __notify_that_shift_is_finished_in_background(self, shift: Shift, bot: Application) -> None:
+        """Разослать сообщение об окончании смены в отдельной сессии БД, не связанной с HTTP-запросом."""
+        async for session in get_session():
+            bot_service = self.__telegram_bot(bot)
+            async for members in ShiftRepository(session).get_members_for_finish_notification(
+                shift.id, settings.MAILING_CHUNK_SIZE
+            ):
+                await bot_service.notify_that_shift_is_finished(shift.final_message, members)
 
     async def cancel_shift(
         self, bot: Application, shift_id: UUID, cancel_shift_data: Optional[ShiftCancelRequest] = None
     ) -> Shift:
-        shift = await self.__shift_repository.get_shift_with_request(shift_id)
+        shift = await self.__shift_repository.get(shift_id)
         final_message = "Смена отменена"
         if cancel_shift_data:
             final_message = cancel_shift_data.final_message
         await shift.cancel(final_message)
         await self.__shift_repository.update(shift_id, shift)
-        requests_to_update = []
-        for request in shift.requests:
-            if request.status == Request.Status.PENDING:
-                request.status = Request.Status.DECLINED.value
-                requests_to_update.append(request)
-        await self.__request_repository.update_all(requests_to_update)
-
-        users = await self.__user_repository.get_users_by_shift_id(shift.id)
-        users_to_update = []
-        for user in users:
-            if user.status == User.Status.PENDING:
-                user.status = User.Status.DECLINED.value
-                users_to_update.append(user)
-        await self.__user_repository.update_all(users_to_update)
+        users = await self.__request_repository.decline_pending_of_shift(shift.id)
         await self.__telegram_bot(bot).notify_that_shift_is_cancelled(users, final_message)
         return shift
 
-    async def start_prepared_shift(self) -> None:
-        """Запускает смену, если смена имеет статус preparing и дата старта совпадает с текущим днём."""
-        shift = await self.__shift_repository.get_preparing_shift_with_started_at_today()
+    async def start_prepared_shift(self, current_task_date: date) -> None:
+        """Запускает смену, если смена имеет статус preparing и дата старта совпадает с current_task_date.
+
+        current_task_date - текущая дата заданий в часовом поясе волны рассылки: первая волна нового дня
+        (самый восточный часовой пояс) запускает смену, даже если на сервере ещё предыдущий день.
+        """
+        shift = await self.__shift_repository.get_preparing_shift_with_started_at(current_task_date)
         if shift:
             shift.status = Shift.Status.STARTED.value
             await self.__shift_repository.update(shift.id, shift)
 
+    async def change_counters(self, shift_id: UUID, **deltas: int) -> None:
+        """Изменить счётчики смены в текущей транзакции (см. ShiftRepository.change_counters)."""
+        await self.__shift_repository.change_counters(shift_id, **deltas)
+
+    async def repair_counters(self) -> Sequence[Row]:
+        """Пересчитать счётчики смен, возвращает смены, счётчики которых были исправлены."""
+        return await self.__shift_repository.repair_counters()
+
     async def get_started_shift_or_none(self) -> Optional[Shift]:
         """Возвращает активную на данный момент смену или None."""
         return await self.__shift_repository.get_shift_with_status_or_none(Shift.Status.STARTED)
-
-    async def get_all_report_of_member_for_shift(self, shift_id: UUID, member_id: UUID) -> list[Report]:
-        return await self.__shift_repository.get_all_reports_of_member(shift_id, member_id)
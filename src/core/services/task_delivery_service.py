@@ -0,0 +1,99 @@
+import logging
+from datetime import date
+from typing import AsyncIterator, Sequence
+from urllib.parse import urljoin
+
+from fastapi import Depends
+from sqlalchemy import Row
+
+from src.core.db.repository import ReportRepository, ShiftRepository, TaskDeliveryManifestRepository
+from src.core.services.task_service import TaskService
+from src.core.settings import settings
+
+
+def _render_task_texts(name: str, task_title: str) -> tuple[str, str]:
+    """Варианты текста задания: обычный и для участника, не выполнившего вчерашнее задание."""
+    text = (
+        f"Привет, {name}!\n"
+        f"Сегодня твоим заданием будет {task_title}. "
+        f"Не забудь сделать фотографию, как ты выполняешь задание, и отправить на проверку."
+    )
+    missed_text = (
+        f"Привет, {name}!\n"
+        f"Вчерашнее задание не было выполнено! Сегодня можешь отправить отчет только по новому заданию. "
+        f"Сегодня твоим заданием будет {task_title}. "
+        f"Не забудь сделать фотографию, как ты выполняешь задание, и отправить на проверку."
+    )
+    return text, missed_text
+
+
+class TaskDeliveryService:
+    """Сервис рассылки ежедневных заданий через заранее подготовленный манифест.
+
+    Манифест (получатели, изображение задания и варианты текста) готовится в нерабочие часы,
+    а во время рассылки остаётся только создать отчёты и отправить готовые сообщения.
+    """
+
+    def __init__(
+        self,
+        manifest_repository: TaskDeliveryManifestRepository = Depends(),
+        report_repository: ReportRepository = Depends(),
+        shift_repository: ShiftRepository = Depends(),
+        task_service: TaskService = Depends(),
+    ) -> None:
+        self.__manifest_repository = manifest_repository
+        self.__report_repository = report_repository
+        self.__shift_repository = shift_repository
+        self.__task_service = task_service
+
+    async def build_manifest(self, task_date: date, time_zone: str) -> int:
+        """Подготовить манифест рассылки задания на task_date для участников из часового пояса.
+
+        Добавляются только участники, которых ещё нет в манифесте, поэтому повторный запуск
+        дополняет манифест участниками, появившимися после его подготовки.
+        Записи манифеста за прошедшие даты удаляются. Возвращает количество добавленных записей.
+        """
+        await self.__manifest_repository.delete_before(task_date, time_zone)
+        shift = await self.__shift_repository.get_shift_for_task_date(task_date)
+        if not shift:
+            return 0
+        members = await self.__manifest_repository.get_members_without_manifest(shift.id, task_date, time_zone)
+        if not members:
+            return 0
+        task = await self.__task_service.get_task_for_date(shift.id, task_date)
+        photo_url = urljoin(settings.APPLICATION_URL, task.url)
+        manifests = []
+        for member in members:
+            text, missed_text = _render_task_texts(member.name, task.title)
+            manifests.append(
+                dict(
+                    shift_id=shift.id,
+                    member_id=member.member_id,
+                    task_id=task.id,
+                    task_date=task_date,
+                    time_zone=time_zone,
+                    telegram_id=member.telegram_id,
+                    photo_url=photo_url,
+                    text=text,
+                    missed_text=missed_text,
+                )
+            )
+        await self.__manifest_repository.create_all(manifests)
+        logging.info(f"Манифест рассылки на {task_date} ({time_zone}): добавлено {len(manifests)} участников")
+        return len(manifests)
+
+    async def create_daily_reports(self, task_date: date, time_zone: str) -> None:
+        """Создать отчеты на task_date для активных участников из манифеста."""
+        await self.__report_repository.create_daily_reports_from_manifest(task_date, time_zone)
+
+    async def get_deliveries(self, task_date: date, time_zone: str) -> AsyncIterator[Sequence[Row]]:
+        """Получить порциями по MAILING_CHUNK_SIZE недоставленные сообщения (telegram_id, photo_url, text) с заданием.
+
+        Порция отмечается доставленной, когда обработавший её код запрашивает следующую, поэтому
+        при повторном запуске рассылки после сбоя уже отправленные задания не отправляются снова.
+        """
+        while deliveries := await self.__manifest_repository.get_undelivered(
+            task_date, time_zone, settings.MAILING_CHUNK_SIZE
+        ):
+            yield deliveries
+            await self.__manifest_repository.mark_delivered([delivery.id for delivery in deliveries])
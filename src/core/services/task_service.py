@@ -1,3 +1,4 @@
+from datetime import date
 from urllib.parse import urljoin
 
 from fastapi import Depends, UploadFile
@@ -5,7 +6,7 @@ from pydantic.schema import UUID
 
 from src.api.request_models.task import TaskCreateRequest, TaskUpdateRequest
 from src.core import exceptions
-from src.core.db.models import Shift, Task
+from src.core.db.models import Task
 from src.core.db.repository.task_repository import TaskRepository
 from src.core.settings import settings
 
@@ -24,9 +25,8 @@ class TaskService:
     async def get_task_ids_list(self) -> list[UUID]:
         return await self.__task_repository.get_task_ids_list()
 
-    async def get_task_by_day_of_month(self, tasks: Shift.tasks, day_of_month: int) -> Task:
-        task_id = tasks.get(str(day_of_month))
-        task = await self.__task_repository.get_or_none(task_id)
+    async def get_task_for_date(self, shift_id: UUID, task_date: date) -> Task:
+        task = await self.__task_repository.get_task_for_date(shift_id, task_date)
         if not task:
             raise exceptions.TodayTaskNotFoundError()
         return task
@@ -1,8 +1,12 @@
-from datetime import date
-from typing import Optional
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, Optional
 from uuid import UUID
 
 from fastapi import Depends
+from sqlalchemy import Row
 
 from src.api.request_models.user import (
     UserCreateRequest,
@@ -11,6 +15,7 @@ from src.api.request_models.user import (
 )
 from src.api.response_models.user import UserDetailResponse, UserWithStatusResponse
 from src.core import exceptions
+from src.core.admin_events import AdminEvent
 from src.core.db.models import Request, User
 from src.core.db.repository.request_repository import RequestRepository
 from src.core.db.repository.user_repository import UserRepository
@@ -25,6 +30,28 @@ def validate_date_of_birth(value: date) -> None:
         raise exceptions.NotValidValueError(f'Возраст не может быть менее {settings.MIN_AGE} лет.')
 
 
+def encode_users_page_cursor(field_sort: Optional[UserFieldSortRequest], user: Row) -> str:
+    """Курсор следующей страницы списка пользователей: поле сортировки и ключ последнего пользователя страницы."""
+    sort_value = user.sort_value.isoformat() if isinstance(user.sort_value, (date, datetime)) else user.sort_value
+    cursor = json.dumps([field_sort.value if field_sort else None, sort_value, str(user.id)])
+    return base64.urlsafe_b64encode(cursor.encode()).decode()
+
+
+def decode_users_page_cursor(field_sort: Optional[UserFieldSortRequest], cursor: str) -> tuple[Any, UUID]:
+    """Получить из курсора ключ последнего пользователя предыдущей страницы."""
+    try:
+        cursor_field_sort, sort_value, user_id = json.loads(base64.urlsafe_b64decode(cursor))
+        if cursor_field_sort != (field_sort.value if field_sort else None):
+            raise ValueError("Курсор получен при другой сортировке")
+        if field_sort is UserFieldSortRequest.DATE_OF_BIRTH:
+            sort_value = date.fromisoformat(sort_value)
+        elif field_sort is None:
+            sort_value = datetime.fromisoformat(sort_value)
+        return sort_value, UUID(user_id)
+    except (binascii.Error, TypeError, ValueError):
+        raise exceptions.InvalidPageCursorError
+
+
 async def validate_user_not_exists(
     user_repository: UserRepository, telegram_id: int = None, phone_number: str = None
 ) -> None:
@@ -60,6 +87,10 @@ class UserService:
             await self.__update_request_data(request)
         else:
             request = Request(user_id=user.id, shift_id=shift_id)
+            await self.__shift_service.change_counters(shift_id, pending_requests_count=1)
+            await self.__request_repository.publish_admin_event(
+                AdminEvent.REQUEST_CREATED, shift_id=shift_id, user_id=user.id
+            )
             await self.__request_repository.create(request)
 
     async def __update_request_data(self, request: Request) -> None:
@@ -69,6 +100,10 @@ class UserService:
             if request.is_repeated < settings.MAX_REQUESTS:
                 request.is_repeated += 1
                 request.status = Request.Status.PENDING
+                await self.__shift_service.change_counters(request.shift_id, pending_requests_count=1)
+                await self.__request_repository.publish_admin_event(
+                    AdminEvent.REQUEST_CREATED, shift_id=request.shift_id, user_id=request.user_id
+                )
                 await self.__request_repository.update(request.id, request)
             else:
                 raise exceptions.RequestForbiddenError
@@ -98,10 +133,7 @@ class UserService:
     async def get_user_by_id_with_shifts_detail(self, user_id: UUID) -> UserDetailResponse:
         """Получить участника проекта с информацией о сменах по его id."""
         user = await self.__user_repository.get(user_id)
-        list_user_shifts = await self.__user_repository.get_user_shifts_detail(user.id)
-        for shift in list_user_shifts:
-            shift.reports = await self.__shift_service.get_all_report_of_member_for_shift(shift.id, shift.member_id)
-        user.shifts = list_user_shifts
+        user.shifts = await self.__user_repository.get_user_shifts_detail(user.id)
         return user
 
     async def list_all_users(
@@ -109,12 +141,29 @@ class UserService:
         status: Optional[User.Status] = None,
         field_sort: Optional[UserFieldSortRequest] = None,
         direction_sort: Optional[UserDescAscSortRequest] = None,
-    ) -> list[UserWithStatusResponse]:
-        return await self.__user_repository.get_users_with_status(status, field_sort, direction_sort)
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> tuple[list[UserWithStatusResponse], Optional[str]]:
+        """Получить страницу списка пользователей и курсор следующей страницы (None, если страница последняя).
+
+        Если не переданы ни limit, ни cursor, возвращается весь список без курсора.
+        """
+        if limit is None and cursor is None:
+            users = await self.__user_repository.get_users_with_status(status, field_sort, direction_sort, search)
+            return users, None
+        limit = limit or settings.USERS_PAGE_SIZE
+        after = decode_users_page_cursor(field_sort, cursor) if cursor else None
+        users = await self.__user_repository.get_users_with_status(
+            status, field_sort, direction_sort, search, after, limit + 1
+        )
+        if len(users) <= limit:
+            return users, None
+        users = users[:limit]
+        return users, encode_users_page_cursor(field_sort, users[-1])
 
     async def set_telegram_blocked(self, user: User) -> None:
-        user.telegram_blocked = True
-        await self.__user_repository.update(user.id, user)
+        await self.__user_repository.set_telegram_blocked_by_telegram_id(user.telegram_id)
 
     async def unset_telegram_blocked(self, user: User) -> None:
         user.telegram_blocked = False
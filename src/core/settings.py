@@ -3,6 +3,7 @@ import uuid
 from datetime import time, timedelta
 from functools import cache
 from pathlib import Path
+from typing import Literal
 from urllib.parse import urljoin
 
 from pydantic import BaseSettings
@@ -22,7 +23,25 @@ class Settings(BaseSettings):
     # Настройки telegram-бота
     BOT_TOKEN: str  # Токен аутентификации бота
     BOT_WEBHOOK_MODE: bool = False  # запустить бота в режиме webhook(true)|polling(false)
-    BOT_PERSISTENCE_FILE: str = str(BASE_DIR / "src" / "bot" / "bot_persistence_file")
+    BOT_UPDATE_QUEUE_SIZE: int = 1000  # максимальное число необработанных обновлений в очереди
+    BOT_UPDATE_DEDUPE_WINDOW: int = 10000  # сколько последних update_id помнить для отсева повторных доставок
+    BOT_CONCURRENT_UPDATES: int = 8  # сколько обновлений разных пользователей обрабатывать одновременно
+    BOT_LEADER_LOCK_ID: int = 72_001  # ключ advisory lock, которым процесс закрепляет за собой управление ботом
+    BOT_LEADER_CHECK_INTERVAL: int = 10  # как часто (в секундах) проверять блокировку и пытаться её получить
+
+    # Настройки потока событий для администраторов (server-sent events)
+    ADMIN_EVENTS_KEEPALIVE_INTERVAL: int = 15  # через сколько секунд без событий отправлять клиенту keep-alive
+    ADMIN_EVENTS_QUEUE_SIZE: int = 1000  # сколько событий может ждать отправки клиенту, отстающий клиент отключается
+    ADMIN_EVENTS_CHECK_INTERVAL: int = 10  # как часто (в секундах) проверять соединение для получения событий
+
+    # Настройки кэша авторизации администраторов
+    ADMINISTRATOR_AUTH_CACHE_SIZE: int = 1024  # сколько токенов администраторов хранить в кэше
+    ADMINISTRATOR_AUTH_CACHE_TTL: int = 60  # сколько секунд данные администратора берутся из кэша без запроса к БД
+
+    # Настройки пула для CPU-ёмких задач (хэширование паролей, построение excel-отчётов)
+    CPU_EXECUTOR_KIND: Literal["thread", "process"] = "thread"  # пул потоков или процессов
+    CPU_EXECUTOR_MAX_WORKERS: int = 4  # число исполнителей в пуле
+    CPU_EXECUTOR_WAIT_WARNING_THRESHOLD: float = 1.0  # после скольких секунд ожидания в очереди писать предупреждение
 
     # Настройки взаимодействия с БД
     POSTGRES_DB: str  # Имя базы данных
@@ -30,6 +49,11 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str  # пароль для подключения к БД
     DB_HOST: str  # название сервиса (контейнера)
     DB_PORT: str  # порт для подключения к БД
+    DB_REPLICA_HOST: str | None = None  # реплика БД только для чтения (если не указана, читаем с основной БД)
+    DB_REPLICA_PORT: str | None = None  # порт реплики БД (по умолчанию совпадает с DB_PORT)
+    DB_REPLICA_READ_YOUR_WRITES_SECONDS: int = 5  # сколько секунд после изменения данных клиент читает с основной БД
+    DB_ECHO: bool = False  # выводить в лог все SQL-запросы
+    SQL_QUERIES_WARNING_THRESHOLD: int = 50  # больше SQL-запросов на запрос, обновление или задачу - предупреждение
 
     # Схема и домен, на котором развернуто приложение (например: http://example.net)
     APPLICATION_URL: str
@@ -37,6 +61,10 @@ class Settings(BaseSettings):
     # При работе за reverse proxy, дополнительный путь, который добавляется этим прокси.
     ROOT_PATH: str = "/api/"
 
+    # Размер страницы списка пользователей по умолчанию и максимальный
+    USERS_PAGE_SIZE: int = 50
+    USERS_PAGE_SIZE_MAX: int = 500
+
     # секретный ключ для генерации jwt-токенов
     SECRET_KEY: str = str(uuid.uuid4())
 
@@ -47,6 +75,44 @@ class Settings(BaseSettings):
     # в формате IANA Time Zone Database (aka zoneinfo, aka tzdata, aka Olson database)
     TIME_ZONE: str = "Asia/Yekaterinburg"
 
+    # Часовые пояса городов участников. Задания рассылаются волнами: каждая волна - в SEND_NEW_TASK_HOUR
+    # по местному времени своего часового пояса. Участники из городов, которых нет в списке, получают
+    # задание в часовом поясе TIME_ZONE
+    CITY_TIME_ZONES: dict[str, str] = {
+        "Калининград": "Europe/Kaliningrad",
+        "Москва": "Europe/Moscow",
+        "Санкт-Петербург": "Europe/Moscow",
+        "Нижний Новгород": "Europe/Moscow",
+        "Казань": "Europe/Moscow",
+        "Ростов-на-Дону": "Europe/Moscow",
+        "Краснодар": "Europe/Moscow",
+        "Воронеж": "Europe/Moscow",
+        "Волгоград": "Europe/Volgograd",
+        "Самара": "Europe/Samara",
+        "Ижевск": "Europe/Samara",
+        "Саратов": "Europe/Saratov",
+        "Ульяновск": "Europe/Ulyanovsk",
+        "Омск": "Asia/Omsk",
+        "Новосибирск": "Asia/Novosibirsk",
+        "Барнаул": "Asia/Barnaul",
+        "Томск": "Asia/Tomsk",
+        "Новокузнецк": "Asia/Novokuznetsk",
+        "Кемерово": "Asia/Novokuznetsk",
+        "Красноярск": "Asia/Krasnoyarsk",
+        "Иркутск": "Asia/Irkutsk",
+        "Чита": "Asia/Chita",
+        "Якутск": "Asia/Yakutsk",
+        "Хабаровск": "Asia/Vladivostok",
+        "Владивосток": "Asia/Vladivostok",
+        "Магадан": "Asia/Magadan",
+        "Южно-Сахалинск": "Asia/Sakhalin",
+        "Петропавловск-Камчатский": "Asia/Kamchatka",
+    }
+
+    # Максимальная случайная задержка (в секундах) отправки задания внутри волны рассылки.
+    # Позволяет растянуть нагрузку на telegram и БД, 0 - без задержки
+    SEND_NEW_TASK_JITTER_SECONDS: int = 0
+
     # Organization data
     ORGANIZATIONS_EMAIL: str = "lomayabaryery.noreply@yandex.ru"
     ORGANIZATIONS_GROUP: str = "https://vk.com/socialrb02"  # используется при отправке сообщений пользователям
@@ -61,9 +127,27 @@ class Settings(BaseSettings):
     # Время (час) для отправки нового задания
     SEND_NEW_TASK_HOUR: int = 8
 
+    # Время (час) для подготовки манифеста рассылки заданий на следующий день
+    BUILD_TASK_MANIFEST_HOUR: int = 22
+
     # Время (час) для напоминания о невыполненном задании
     SEND_NO_REPORT_REMINDER_HOUR: int = 19
 
+    # Время, после которого незавершённый запуск ежедневной задачи считается прерванным и может быть выполнен заново
+    JOB_RUN_LEASE_TIME = timedelta(hours=1)
+
+    # Количество участников, читаемых из базы и отправляемых за один шаг рассылки заданий и напоминаний
+    MAILING_CHUNK_SIZE: int = 500
+
+    # Количество заявок, одобряемых за один шаг массового одобрения
+    REQUESTS_APPROVE_BATCH_SIZE: int = 200
+
+    # Время, на которое отчет из очереди проверки закрепляется за администратором
+    REPORT_REVIEW_LEASE_TIME = timedelta(minutes=15)
+
+    # Максимальное количество отчетов, которое администратор может взять из очереди проверки за один запрос
+    REPORTS_CLAIM_LIMIT_MAX: int = 50
+
     # Минимальный возраст участника
     MIN_AGE: int = 3
 
@@ -85,6 +169,12 @@ class Settings(BaseSettings):
     # Директория для сохранения фотоотчётов
     USER_REPORTS_DIR: Path = BASE_DIR / "static" / "user_reports"
 
+    # Директория для архивов фотоотчётов завершённых смен (не должна раздаваться как статика)
+    USER_REPORTS_ARCHIVE_DIR: Path = BASE_DIR / "reports_archive"
+
+    # Время (час) для архивации фотоотчётов завершённых смен
+    ARCHIVE_FINISHED_SHIFTS_HOUR: int = 3
+
     # Базовый путь к изображениям фотоотчётов
     USER_REPORTS_URL: str = "/static/user_reports/"
 
@@ -140,6 +230,17 @@ class Settings(BaseSettings):
             f"@{self.DB_HOST}:{self.DB_PORT}/{self.POSTGRES_DB}"
         )
 
+    @property
+    def replica_database_url(self) -> str | None:
+        """Получить ссылку для подключения к реплике DB, если она настроена."""
+        if not self.DB_REPLICA_HOST:
+            return None
+        return (
+            "postgresql+asyncpg://"
+            f"{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+            f"@{self.DB_REPLICA_HOST}:{self.DB_REPLICA_PORT or self.DB_PORT}/{self.POSTGRES_DB}"
+        )
+
     @property
     def api_url(self) -> str:
         """Получить URL-ссылку на API."""
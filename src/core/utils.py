@@ -12,12 +12,29 @@ from loguru import logger
 from src.core.settings import settings
 
 
-def get_current_task_date() -> datetime.date:
-    """Вычислить текущий день задания с учетом времени отправления."""
-    now = datetime.now(pytz.timezone(settings.TIME_ZONE))
+def get_current_date(time_zone: str) -> date:
+    """Текущая дата в часовом поясе."""
+    return datetime.now(pytz.timezone(time_zone)).date()
+
+
+def get_current_task_date(time_zone: str = settings.TIME_ZONE) -> datetime.date:
+    """Вычислить текущий день задания с учетом времени отправления в часовом поясе участника."""
+    now = datetime.now(pytz.timezone(time_zone))
     return now.date() if now.hour >= settings.SEND_NEW_TASK_HOUR else now.date() - timedelta(days=1)
 
 
+def get_user_time_zone(city: str | None) -> str:
+    """Часовой пояс участника по его городу."""
+    return settings.CITY_TIME_ZONES.get(city, settings.TIME_ZONE)
+
+
+def get_delivery_time_zones() -> list[str]:
+    """Часовые пояса волн рассылки заданий, с востока на запад."""
+    time_zones = set(settings.CITY_TIME_ZONES.values()) | {settings.TIME_ZONE}
+    now = datetime.utcnow()
+    return sorted(time_zones, key=lambda time_zone: pytz.timezone(time_zone).utcoffset(now), reverse=True)
+
+
 def add_months(source_date: date, months: int):
     """Добавляет к дате заданное количество месяцев."""
     month = source_date.month - 1 + months
@@ -1,6 +1,7 @@
 import enum
 from dataclasses import astuple
 from io import BytesIO
+from typing import Sequence
 
 from openpyxl import Workbook
 from openpyxl.styles import Alignment, Border, Font, Side
@@ -11,9 +12,16 @@ from src.excel_generator.task_builder import BaseAnalyticReportSettings
 
 
 class AnalyticReportBuilder:
-    """Интерфейс строителя."""
+    """Интерфейс строителя.
 
-    async def generate_report(
+    Номер последней заполненной строки листа хранится в экземпляре строителя, поэтому
+    для каждого построения файла нужен свой экземпляр (см. build).
+    """
+
+    def __init__(self) -> None:
+        self.__row_count = 0
+
+    def generate_report(
         self,
         description: str,
         data: tuple[TasksAnalyticReportDto],
@@ -22,26 +30,21 @@ class AnalyticReportBuilder:
     ) -> Workbook:
         """Генерация листа с данными."""
         worksheet = self._create_sheet(workbook, sheet_name=analytic_task_report_full.sheet_name)
-        analytic_task_report_full.row_count = 0
-        self.__add_description(worksheet, description, analytic_task_report_full)
+        self.__row_count = 0
+        self.__add_description(worksheet, description)
         self.__add_header(worksheet, analytic_task_report_full)
         self.__add_data(worksheet, data, analytic_task_report_full)
         self.__add_footer(worksheet, analytic_task_report_full)
         self.__apply_styles(worksheet)
         return workbook
 
-    def __add_row(
-        self,
-        worksheet: Worksheet,
-        analytic_task_report: BaseAnalyticReportSettings,
-        data: tuple[str | int],
-    ) -> None:
-        analytic_task_report.row_count += 1
+    def __add_row(self, worksheet: Worksheet, data: tuple[str | int]) -> None:
+        self.__row_count += 1
         for index, value in enumerate(data, start=1):
-            worksheet.cell(row=analytic_task_report.row_count, column=index, value=value)
+            worksheet.cell(row=self.__row_count, column=index, value=value)
 
     @staticmethod
-    async def get_report_response(workbook: Workbook) -> BytesIO:
+    def get_report_response(workbook: Workbook) -> BytesIO:
         """Создание ответа."""
         stream = BytesIO()
         workbook.save(stream)
@@ -60,18 +63,13 @@ class AnalyticReportBuilder:
         """Создаёт лист внутри отчёта."""
         return workbook.create_sheet(sheet_name)
 
-    def __add_description(
-        self,
-        worksheet: Worksheet,
-        description: str,
-        analytic_task_report: BaseAnalyticReportSettings,
-    ) -> None:
+    def __add_description(self, worksheet: Worksheet, description: str) -> None:
         """Заполняет описание отчета."""
-        self.__add_row(worksheet, analytic_task_report, (description,))
+        self.__add_row(worksheet, (description,))
 
     def __add_header(self, worksheet: Worksheet, analytic_task_report: BaseAnalyticReportSettings) -> None:
         """Заполняет первые строки в листе."""
-        self.__add_row(worksheet, analytic_task_report, analytic_task_report.header_data)
+        self.__add_row(worksheet, analytic_task_report.header_data)
 
     def __add_data(
         self,
@@ -81,11 +79,11 @@ class AnalyticReportBuilder:
     ) -> None:
         """Заполняет строки данными из БД."""
         for task in data:
-            self.__add_row(worksheet, analytic_task_report, data=astuple(task))
+            self.__add_row(worksheet, data=astuple(task))
 
     def __add_footer(self, worksheet: Worksheet, analytic_task_report: BaseAnalyticReportSettings) -> None:
         """Заполняет последнюю строку в листе."""
-        self.__add_row(worksheet, analytic_task_report, data=analytic_task_report.footer_data)
+        self.__add_row(worksheet, data=analytic_task_report.get_footer_data(self.__row_count))
 
     def __apply_styles(self, worksheet: Worksheet):
         """Задаёт форматирование отчёта."""
@@ -119,6 +117,19 @@ class AnalyticReportBuilder:
         worksheet.column_dimensions["B"].width = self.Styles.WIDTH.value
         worksheet.row_dimensions[1].height = self.Styles.HEIGHT.value
 
+    @classmethod
+    def build(cls, sheets: Sequence[tuple[str, Sequence, type[BaseAnalyticReportSettings]]]) -> BytesIO:
+        """Построить excel файл из листов (описание, данные, настройки листа).
+
+        Построение и сохранение файла выполняются целиком синхронно, поэтому метод
+        можно передать в пул для CPU-ёмких задач.
+        """
+        builder = cls()
+        workbook = builder.create_workbook()
+        for description, data, report_settings in sheets:
+            builder.generate_report(description, data, workbook=workbook, analytic_task_report_full=report_settings)
+        return builder.get_report_response(workbook)
+
     class Styles(enum.Enum):
         FONT_BOLD = Font(name='Times New Roman', size=11, bold=True)
         FONT_STANDART = Font(name='Times New Roman', size=11, bold=False)
@@ -16,19 +16,17 @@ class ShiftAnalyticReportSettings(BaseAnalyticReportSettings):
         "Кол-во отклонённых отчётов",
         "Всего отчётов",
     )
-    row_count: int = 0
 
-    @classmethod
-    @property
-    def footer_data(cls):
+    @staticmethod
+    def get_footer_data(last_data_row: int) -> tuple[str]:
         return (
             "ИТОГО:",
             "",
-            f"=SUM(C2:C{cls.row_count})",
-            f"=SUM(D2:D{cls.row_count})",
-            f"=SUM(E2:E{cls.row_count})",
-            f"=SUM(F2:F{cls.row_count})",
-            f"=SUM(G2:G{cls.row_count})",
-            f"=SUM(H2:H{cls.row_count})",
-            f"=SUM(I2:I{cls.row_count})",
+            f"=SUM(C2:C{last_data_row})",
+            f"=SUM(D2:D{last_data_row})",
+            f"=SUM(E2:E{last_data_row})",
+            f"=SUM(F2:F{last_data_row})",
+            f"=SUM(G2:G{last_data_row})",
+            f"=SUM(H2:H{last_data_row})",
+            f"=SUM(I2:I{last_data_row})",
         )
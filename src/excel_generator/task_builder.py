@@ -5,7 +5,6 @@ from dataclasses import dataclass
 class BaseAnalyticReportSettings:
     sheet_name: str
     header_data: tuple[str]
-    row_coun: int
 
 
 class TaskAnalyticReportSettings(BaseAnalyticReportSettings):
@@ -19,15 +18,13 @@ class TaskAnalyticReportSettings(BaseAnalyticReportSettings):
         "Кол-во отклонённых отчётов",
         "Кол-во не предоставленных отчётов",
     )
-    row_count: int = 0
 
-    @classmethod
-    @property
-    def footer_data(cls):
+    @staticmethod
+    def get_footer_data(last_data_row: int) -> tuple[str]:
         return (
             "ИТОГО:",
             "",
-            f"=SUM(B2:B{cls.row_count})",
-            f"=SUM(C2:C{cls.row_count})",
-            f"=SUM(D2:D{cls.row_count})",
+            f"=SUM(B2:B{last_data_row})",
+            f"=SUM(C2:C{last_data_row})",
+            f"=SUM(D2:D{last_data_row})",
         )
@@ -0,0 +1,19 @@
+from src.core.db.query_stats import SERVER_TIMING_QUERIES_PATTERN
+
+
+class QueryBudgetExceededError(AssertionError):
+    """Эндпоинт выполнил больше SQL-запросов, чем допустимо."""
+
+
+def assert_query_budget(response, max_queries: int) -> None:
+    """Проверить, что эндпоинт выполнил не больше max_queries SQL-запросов.
+
+    Количество запросов берётся из заголовка Server-Timing ответа, поэтому проверка работает
+    с любым HTTP-клиентом. Помогает поймать N+1 запросы в CI.
+    """
+    match = SERVER_TIMING_QUERIES_PATTERN.search(response.headers.get("Server-Timing", ""))
+    if match is None:
+        raise QueryBudgetExceededError("В ответе нет статистики SQL-запросов (заголовок Server-Timing)")
+    query_count = int(match.group(1))
+    if query_count > max_queries:
+        raise QueryBudgetExceededError(f"Выполнено SQL-запросов: {query_count}, допустимо: {max_queries}")
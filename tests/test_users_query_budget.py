@@ -0,0 +1,59 @@
+import asyncio
+from typing import Iterator
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+
+from data_factory.factories import (
+    AdministratorFactory,
+    MemberFactory,
+    ShiftFactory,
+    UserFactory,
+    session,
+)
+from src.application import create_app
+from src.core.administrator_cache import administrator_cache
+from src.core.db.db import engine
+from src.core.db.models import Member, Shift, User
+from tests.query_budget import assert_query_budget
+
+# проверка токена администратора + пользователь + его смены
+USER_DETAIL_QUERY_BUDGET = 3
+
+
+@pytest.fixture(scope="module")
+def user_ids() -> Iterator[dict[int, str]]:
+    """Пользователи с одной и с тремя сменами."""
+    AdministratorFactory.create()
+    started_shift = ShiftFactory.create(status=Shift.Status.STARTED)
+    shifts = [started_shift, *ShiftFactory.create_batch(2, status=Shift.Status.FINISHED)]
+    user_ids = {}
+    for shifts_count in (1, 3):
+        user = UserFactory.create(status=User.Status.VERIFIED)
+        for shift in shifts[:shifts_count]:
+            MemberFactory.complex_create(1, user_id=user.id, shift_id=shift.id, status=Member.Status.ACTIVE)
+        user_ids[shifts_count] = str(user.id)
+    yield user_ids
+    session.execute(text("TRUNCATE TABLE requests, shifts, reports, users, members, administrators CASCADE"))
+    session.commit()
+
+
+async def get_user_detail(user_id: str):
+    async with AsyncClient(app=create_app(), base_url="http://test") as client:
+        response = await client.post(
+            "/administrators/login", json={"email": "user@example.com", "password": "string"}
+        )
+        token = response.json()["access_token"]
+        administrator_cache.clear()
+        response = await client.get(f"/users/{user_id}", headers={"Authorization": f"Bearer {token}"})
+    await engine.dispose()
+    return response
+
+
+@pytest.mark.parametrize("shifts_count", (1, 3))
+def test_user_detail_query_budget(user_ids, shifts_count):
+    response = asyncio.run(get_user_detail(user_ids[shifts_count]))
+    assert response.status_code == 200
+    assert len(response.json()["shifts"]) == shifts_count
+    assert_query_budget(response, USER_DETAIL_QUERY_BUDGET)